@@ -3,6 +3,7 @@ import platform
 from pathlib import Path
 from datetime import timedelta
 import dj_database_url
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 # ===============================
@@ -90,6 +91,59 @@ DATABASES = {
     )
 }
 
+# ===============================
+# Cache (Redis when REDIS_URL is set, per-process memory otherwise)
+# ===============================
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 2000},
+        }
+    }
+
+# Catalog template fragments (product / service cards, detail bodies, galleries). Their keys carry
+# the object's updated_at, so edits never serve stale HTML; the TTL only bounds how long old
+# versions linger
+CATALOG_FRAGMENT_TTL = int(os.getenv("CATALOG_FRAGMENT_TTL", 60 * 60 * 24))
+# Seconds a catalog version key (facet counts, category tree) lives in a per-process cache, i.e.
+# how long a worker that missed another worker's bump keeps serving old data. Never expires on Redis
+CATALOG_VERSION_TTL = int(os.getenv("CATALOG_VERSION_TTL", 60))
+
+# ===============================
+# Celery (background analytics reports; broker defaults to REDIS_URL)
+# ===============================
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
+# Tasks go to the broker; dev settings run them inline when no broker is configured
+CELERY_TASK_ALWAYS_EAGER = False
+# Task outcomes are tracked on ReportLog, not in a Celery result backend
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Periodic jobs, run by the worker's embedded beat scheduler (crontab times are UTC; 01:30 UTC
+# is after midnight in the business time zone, so yesterday has closed)
+CELERY_BEAT_SCHEDULE = {
+    # Re-scores customers whose orders / bookings changed since the last run
+    'refresh-customer-segments': {'task': 'analytics.refresh_customer_segments', 'schedule': 15 * 60},
+    'rebuild-recommendations': {'task': 'analytics.rebuild_recommendations', 'schedule': 60 * 60},
+    'build-analytics-snapshot': {'task': 'analytics.build_analytics_snapshot', 'schedule': crontab(hour=1, minute=15)},
+    'detect-revenue-anomalies': {'task': 'analytics.detect_revenue_anomalies', 'schedule': crontab(hour=1, minute=30)},
+    'refresh-restock-suggestions': {'task': 'analytics.refresh_restock_suggestions', 'schedule': crontab(hour=1, minute=45)},
+    'train-booking-risk-model': {'task': 'analytics.train_booking_risk_model',
+                                 'schedule': crontab(hour=2, minute=0, day_of_week='mon')},
+    'score-booking-risk': {'task': 'analytics.score_booking_risk', 'schedule': 60 * 60},
+}
+
 # ===============================
 # Templates
 # ===============================
@@ -104,6 +158,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'nail_ecommerce_project.apps.core.context_processors.catalog_cache',
             ],
         },
     },
@@ -213,6 +268,39 @@ LOGGING = {
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
 
+# ===============================
+# Analytics
+# ===============================
+# Dashboard rollups bucket sales by the business-local day, not UTC
+ANALYTICS_TIME_ZONE = os.getenv("ANALYTICS_TIME_ZONE", "Asia/Kolkata")
+# Max customers KMeans is fitted on; the rest are only assigned to the fitted centroids
+ANALYTICS_CLUSTER_SAMPLE_SIZE = int(os.getenv("ANALYTICS_CLUSTER_SAMPLE_SIZE", 5000))
+# Fitted models (joblib) and other analytics artifacts
+ANALYTICS_ARTIFACT_DIR = Path(os.getenv("ANALYTICS_ARTIFACT_DIR", BASE_DIR / 'artifacts' / 'analytics'))
+# Seconds a dashboard panel stays cached when its range includes today (past ranges never expire)
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 300))
+# Threads used to compute dashboard panels concurrently for the all-panels endpoint
+ANALYTICS_PANEL_WORKERS = int(os.getenv("ANALYTICS_PANEL_WORKERS", 4))
+# Demand forecast: days projected ahead, and days of history the seasonal model is fitted on
+ANALYTICS_FORECAST_HORIZON = int(os.getenv("ANALYTICS_FORECAST_HORIZON", 14))
+ANALYTICS_FORECAST_HISTORY_DAYS = int(os.getenv("ANALYTICS_FORECAST_HISTORY_DAYS", 365))
+# Max points per time-series trace sent to the browser; longer series are bucketed / downsampled
+ANALYTICS_CHART_MAX_POINTS = int(os.getenv("ANALYTICS_CHART_MAX_POINTS", 200))
+# Dashboard ranges / exports longer than this many days run as background report jobs
+ANALYTICS_ASYNC_THRESHOLD_DAYS = int(os.getenv("ANALYTICS_ASYNC_THRESHOLD_DAYS", 92))
+# "Frequently bought together": neighbours kept per product, and how old an order must be
+# before the incremental rebuild counts it (so its items are all saved)
+ANALYTICS_RECOMMENDATIONS_TOP_K = int(os.getenv("ANALYTICS_RECOMMENDATIONS_TOP_K", 4))
+ANALYTICS_RECOMMENDATIONS_SETTLE_SECONDS = int(os.getenv("ANALYTICS_RECOMMENDATIONS_SETTLE_SECONDS", 300))
+# Revenue anomalies: trailing days each closed day is compared with, and the robust z-score flagged
+ANALYTICS_ANOMALY_WINDOW_DAYS = int(os.getenv("ANALYTICS_ANOMALY_WINDOW_DAYS", 28))
+ANALYTICS_ANOMALY_THRESHOLD = float(os.getenv("ANALYTICS_ANOMALY_THRESHOLD", 3.5))
+# Restock planner: days of sales demand is averaged over, supplier lead time, and days of demand
+# a reorder should cover once it arrives
+ANALYTICS_RESTOCK_HISTORY_DAYS = int(os.getenv("ANALYTICS_RESTOCK_HISTORY_DAYS", 56))
+ANALYTICS_RESTOCK_LEAD_DAYS = int(os.getenv("ANALYTICS_RESTOCK_LEAD_DAYS", 7))
+ANALYTICS_RESTOCK_COVER_DAYS = int(os.getenv("ANALYTICS_RESTOCK_COVER_DAYS", 21))
+
 # ===============================
 # Auth URLs & Error Handlers
 # ===============================
@@ -17,6 +17,9 @@ DATABASES["default"].update({
     "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
 })
 
+# Celery: without a broker (local dev, tests) tasks run inline in the calling process
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+
 # Razorpay keys (optional in dev)
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
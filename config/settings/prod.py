@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 from dotenv import load_dotenv
 
@@ -42,6 +44,13 @@ DATABASES = {
     )
 }
 
+# ===============================
+# Celery
+# ===============================
+if not CELERY_BROKER_URL:
+    # Tasks would otherwise run inside web requests; the inline fallback is for dev.py only
+    raise ImproperlyConfigured("Missing CELERY_BROKER_URL / REDIS_URL in production environment!")
+
 # ===============================
 # Static & Media
 # ===============================
@@ -0,0 +1,149 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware, to_business_date
+from nail_ecommerce_project.apps.analytics.models import AnalyticsCheckpoint, DailyProductSales, DailyServiceSales, \
+    RevenueAnomaly
+from nail_ecommerce_project.apps.analytics.utils import get_forecast_data
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Each closed day's revenue is scored against the ANALYTICS_ANOMALY_WINDOW_DAYS before it:
+# z = (revenue - rolling median) / (1.4826 * rolling MAD). Median and MAD ignore the outliers
+# they're meant to catch, unlike mean / standard deviation. Scores are computed once per closed
+# day and stored in RevenueAnomaly; the nightly scan only looks at days closed since its checkpoint.
+
+CHECKPOINT_NAME = 'revenue_anomalies'
+# get_forecast_data series -> rollup holding its history
+SERIES = {'Orders': DailyProductSales, 'Bookings': DailyServiceSales}
+INITIAL_SCAN_DAYS = 90
+
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normally distributed data
+# Floor on the scale: a window with more than half its days equal has MAD 0, and small
+# wobbles around such a flat history shouldn't turn into huge scores
+MIN_RELATIVE_SCALE = 0.05
+MIN_SCALE = 1.0
+
+
+def robust_zscores(values, window):
+    """
+    Robust z-score of each value against the `window` values before it. Returns
+    (scores, medians), both NaN for the first `window` positions.
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    values = np.asarray(values, dtype=float)
+    scores = np.full(len(values), np.nan)
+    medians = np.full(len(values), np.nan)
+    if len(values) <= window:
+        return scores, medians
+
+    # Row k is values[k:k + window], the trailing window of values[k + window]
+    history = sliding_window_view(values[:-1], window)
+    median = np.median(history, axis=1)
+    deviation = np.abs(history - median[:, None])
+    scale = MAD_SCALE * np.median(deviation, axis=1)
+    scale = np.maximum(scale, np.maximum(np.abs(median) * MIN_RELATIVE_SCALE, MIN_SCALE))
+
+    scores[window:] = (values[window:] - median) / scale
+    medians[window:] = median
+    return scores, medians
+
+
+def _daily_series(start_day, end_day):
+    """
+    {series: zero-filled daily revenue array for start_day..end_day}, from get_forecast_data.
+    """
+    import numpy as np
+    import pandas as pd
+
+    days = pd.date_range(start_day, end_day, freq='D')
+    df = get_forecast_data(
+        make_business_aware(datetime.combine(start_day, time.min)),
+        make_business_aware(datetime.combine(end_day, time.max)),
+    )
+    series = {}
+    for name in SERIES:
+        if df.empty:
+            series[name] = np.zeros(len(days))
+            continue
+        daily = df[df['type'] == name].groupby('date')['revenue'].sum()
+        series[name] = daily.reindex(days, fill_value=0.0).to_numpy(dtype=float)
+    return days, series
+
+
+def detect_anomalies(start_day, end_day):
+    """
+    Scores every day in start_day..end_day and replaces the stored anomalies of those days.
+    Days whose window reaches back before the first day with revenue aren't scored.
+    Returns the RevenueAnomaly rows written.
+    """
+    import numpy as np
+
+    window = settings.ANALYTICS_ANOMALY_WINDOW_DAYS
+    threshold = settings.ANALYTICS_ANOMALY_THRESHOLD
+    history_start = start_day - timedelta(days=window)
+    days, series = _daily_series(history_start, end_day)
+
+    anomalies = []
+    for name, values in series.items():
+        first_sale = SERIES[name].objects.aggregate(first=Min('day'))['first']
+        if first_sale is None:
+            continue
+        scores, medians = robust_zscores(values, window)
+        first_scored = max(window, (first_sale - history_start).days + window)
+        flagged = np.flatnonzero(np.abs(np.nan_to_num(scores[first_scored:])) >= threshold) + first_scored
+        anomalies.extend(
+            RevenueAnomaly(
+                day=days[i].date(),
+                series=name,
+                revenue=Decimal(str(round(values[i], 2))),
+                expected=Decimal(str(round(medians[i], 2))),
+                score=round(float(scores[i]), 2),
+                direction='SPIKE' if scores[i] > 0 else 'DROP',
+            )
+            for i in flagged
+        )
+
+    with transaction.atomic():
+        RevenueAnomaly.objects.filter(day__range=(start_day, end_day)).delete()
+        RevenueAnomaly.objects.bulk_create(anomalies)
+
+    logger.info(f"[detect_anomalies] {start_day} → {end_day}: {len(anomalies)} anomalies")
+    return anomalies
+
+
+def scan_closed_days():
+    """
+    Scores the business days closed since the last scan (the last INITIAL_SCAN_DAYS on the
+    first run) and advances the checkpoint. Returns (start_day, end_day, anomalies), or None
+    when there's nothing new.
+    """
+    yesterday = to_business_date(timezone.now()) - timedelta(days=1)
+    checkpoint = AnalyticsCheckpoint.objects.filter(name=CHECKPOINT_NAME).first()
+    start_day = checkpoint.day + timedelta(days=1) if checkpoint else yesterday - timedelta(days=INITIAL_SCAN_DAYS - 1)
+    if start_day > yesterday:
+        logger.info(f"[scan_closed_days] Already scanned through {checkpoint.day}")
+        return None
+
+    anomalies = detect_anomalies(start_day, yesterday)
+    AnalyticsCheckpoint.objects.update_or_create(name=CHECKPOINT_NAME, defaults={'day': yesterday})
+    return start_day, yesterday, anomalies
+
+
+def get_revenue_anomalies(start_date, end_date):
+    """
+    Stored anomalies for the business days of the range, newest first.
+    """
+    return list(
+        RevenueAnomaly.objects
+        .filter(day__range=(to_business_date(start_date), to_business_date(end_date)))
+        .values('day', 'series', 'revenue', 'expected', 'score', 'direction')
+    )
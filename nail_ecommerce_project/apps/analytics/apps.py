@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nail_ecommerce_project.apps.analytics'
+
+    def ready(self):
+        from nail_ecommerce_project.apps.analytics import signals  # noqa: F401
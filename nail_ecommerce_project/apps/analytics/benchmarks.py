@@ -0,0 +1,179 @@
+"""
+Benchmarks for the analytics functions and the dashboard request path.
+
+Every target is run cold (analytics cache cleared) over date ranges of several lengths. Wall time
+is the median of the timed runs; query count and peak Python memory (tracemalloc, which also sees
+numpy/pandas buffers) come from one extra instrumented run so tracing doesn't skew the timings.
+"""
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics import utils
+from nail_ecommerce_project.apps.analytics.cache import reset_analytics_cache
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.forecasting import FIT_KEY, SERIES
+from nail_ecommerce_project.apps.analytics.synthetic import SYNTHETIC_PREFIX
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+User = get_user_model()
+
+BENCHMARK_ADMIN = f"{SYNTHETIC_PREFIX}benchmark_admin"
+
+
+def _dashboard_request(client, start_day, end_day):
+    query = {'start_date': start_day.isoformat(), 'end_date': end_day.isoformat()}
+    for url in (reverse('analytics:dashboard'), reverse('analytics:dashboard_panels')):
+        response = client.get(url, query)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+
+
+# name -> callable(start_date, end_date, client)
+TARGETS = {
+    'get_sales_data': lambda start, end, client: utils.get_sales_data(start, end),
+    'get_customer_segments': lambda start, end, client: utils.get_customer_segments(start, end),
+    'get_customer_clusters': lambda start, end, client: utils.get_customer_clusters(start, end),
+    'get_forecast_data': lambda start, end, client: utils.get_forecast_data(start, end),
+    'get_cohort_retention': lambda start, end, client: utils.get_cohort_retention(start, end),
+    'get_booking_demand': lambda start, end, client: utils.get_booking_demand(start, end),
+    'get_top_products_vs_services': lambda start, end, client: utils.get_top_products_vs_services(start, end),
+    'get_low_stock_products': lambda start, end, client: utils.get_low_stock_products(),
+    # The page shell plus the all-panels endpoint it loads: what a dashboard visit costs
+    'DashboardView': lambda start, end, client: _dashboard_request(client, start.date(), end.date()),
+}
+
+
+def data_volume():
+    """
+    Row counts the results are measured against.
+    """
+    return {
+        'customers': User.objects.filter(role='customer').count(),
+        'orders': Order.objects.count(),
+        'order_items': OrderItem.objects.count(),
+        'bookings': Booking.objects.count(),
+        'orders_by_status': dict(Order.objects.values_list('status').annotate(n=Count('id')).order_by()),
+    }
+
+
+def _benchmark_client():
+    admin, _ = User.objects.get_or_create(
+        username=BENCHMARK_ADMIN,
+        defaults={'email': f"{BENCHMARK_ADMIN}@example.com", 'full_name': "Benchmark Admin",
+                  'role': 'admin', 'is_staff': True, 'is_superuser': True},
+    )
+    admin.set_unusable_password()
+    admin.save(update_fields=['password'])
+    client = Client()
+    client.force_login(admin)
+    return client
+
+
+def _cold_cache():
+    """Cached panels and forecast fits are dropped; other cache entries stay."""
+    reset_analytics_cache()
+    cache.delete_many([FIT_KEY.format(series=series) for series in SERIES])
+
+
+def measure(target, start_date, end_date, client, repeat=3):
+    """
+    Returns timings, query count and peak traced memory of one target over one range.
+    """
+    run = TARGETS[target]
+    timings = []
+    for _ in range(repeat):
+        _cold_cache()
+        started = time.perf_counter()
+        run(start_date, end_date, client)
+        timings.append(time.perf_counter() - started)
+
+    _cold_cache()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            run(start_date, end_date, client)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds_median': round(statistics.median(timings), 4),
+        'seconds_min': round(min(timings), 4),
+        'runs': repeat,
+        'queries': len(queries),
+        'peak_memory_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def run_benchmarks(end_day, range_days=(30, 90, 365), targets=None, repeat=3, progress=None):
+    """
+    Measures every target over each range ending on `end_day`. Panels are computed in the
+    request thread so their queries are counted, and long ranges are not handed to the
+    background job queue, so the numbers cover the full computation.
+    """
+    progress = progress or (lambda message: None)
+    targets = list(targets or TARGETS)
+    results = []
+
+    with override_settings(
+        ANALYTICS_PANEL_WORKERS=1,
+        ANALYTICS_ASYNC_THRESHOLD_DAYS=max(range_days) + 1,
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+    ):
+        client = _benchmark_client() if 'DashboardView' in targets else None
+        try:
+            for days in range_days:
+                start_day = end_day - timedelta(days=days - 1)
+                start_date = make_business_aware(datetime.combine(start_day, dt_time.min))
+                end_date = make_business_aware(datetime.combine(end_day, dt_time.max))
+                for target in targets:
+                    result = {'target': target, 'range_days': days,
+                              **measure(target, start_date, end_date, client, repeat=repeat)}
+                    results.append(result)
+                    progress(f"{target} over {days} days: {result['seconds_median']:.3f}s, "
+                             f"{result['queries']} queries, {result['peak_memory_mb']} MB peak")
+        finally:
+            User.objects.filter(username=BENCHMARK_ADMIN).delete()
+            _cold_cache()
+
+    logger.info(f"[run_benchmarks] {len(results)} measurements through {end_day}")
+    return results
+
+
+def compare_results(baseline, current):
+    """
+    Pairs measurements of two benchmark reports by (data scale, target, range) and returns the
+    ones present in both with their median-time ratio (current / baseline).
+    """
+    def index(report):
+        return {
+            (run['scale'], result['target'], result['range_days']): result
+            for run in report['runs'] for result in run['results']
+        }
+
+    before, after = index(baseline), index(current)
+    return [
+        {
+            'scale': key[0], 'target': key[1], 'range_days': key[2],
+            'baseline_seconds': before[key]['seconds_median'],
+            'seconds': after[key]['seconds_median'],
+            'ratio': round(after[key]['seconds_median'] / before[key]['seconds_median'], 2)
+            if before[key]['seconds_median'] else None,
+            'queries_delta': after[key]['queries'] - before[key]['queries'],
+        }
+        for key in after if key in before
+    ]
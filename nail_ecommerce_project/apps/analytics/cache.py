@@ -0,0 +1,133 @@
+import hashlib
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+from nail_ecommerce_project.apps.core.cache import is_shared_cache
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Version scopes: 'sales' is versioned per month, the others are global. 'sales_history' moves
+# with every sales change, for panels that read all history up to the range (cohorts)
+SALES_SCOPE = 'sales'
+SALES_HISTORY_SCOPE = 'sales_history'
+INVENTORY_SCOPE = 'inventory'
+SEGMENTS_SCOPE = 'segments'
+
+PANEL_KEY = 'analytics:panel:{panel}:{start}:{end}:{digest}'
+VERSION_KEY = 'analytics:version:{scope}:{bucket}'
+# Part of every panel key; bumped by reset_analytics_cache() where keys can't be deleted by pattern
+EPOCH_KEY = VERSION_KEY.format(scope='epoch', bucket='all')
+
+
+def _version_timeout():
+    # On a per-process backend nothing may be cached for longer than ANALYTICS_CACHE_TTL
+    return None if is_shared_cache() else settings.ANALYTICS_CACHE_TTL
+
+
+_fallbacks = threading.local()
+
+
+def note_fallback():
+    """
+    Called by analytics getters that swallow an error and return an empty fallback, so
+    cached_panel() doesn't pin it in the cache.
+    """
+    _fallbacks.count = getattr(_fallbacks, 'count', 0) + 1
+
+
+def _month_buckets(start_day, end_day):
+    months = []
+    year, month = start_day.year, start_day.month
+    while (year, month) <= (end_day.year, end_day.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _version_keys(scopes, start_day, end_day):
+    keys = [EPOCH_KEY]
+    for scope in scopes:
+        if scope == SALES_SCOPE:
+            keys.extend(VERSION_KEY.format(scope=scope, bucket=m) for m in _month_buckets(start_day, end_day))
+        else:
+            keys.append(VERSION_KEY.format(scope=scope, bucket='all'))
+    return keys
+
+
+def _current_versions(keys):
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # Never-seen (or evicted) versions get a fresh token so stale entries can't be revived
+        cache.set_many(missing, timeout=_version_timeout())
+        versions.update(missing)
+    return [str(versions[key]) for key in keys]
+
+
+def panel_timeout(end_day):
+    """
+    Ranges that end before today are closed and cached without expiry, as long as the cache is
+    shared between workers (see PROCESS_LOCAL_BACKENDS).
+    """
+    if end_day < to_business_date(timezone.now()) and is_shared_cache():
+        return None
+    return settings.ANALYTICS_CACHE_TTL
+
+
+def cached_panel(panel, start_date, end_date, compute, scopes=(SALES_SCOPE,)):
+    """
+    Returns compute() for (panel, start_date, end_date), cached under a key that
+    embeds the current versions of every scope bucket the range depends on.
+    """
+    start_day, end_day = to_business_date(start_date), to_business_date(end_date)
+    versions = _current_versions(_version_keys(scopes, start_day, end_day))
+    digest = hashlib.md5('|'.join(versions).encode()).hexdigest()
+    key = PANEL_KEY.format(panel=panel, start=start_day, end=end_day, digest=digest)
+
+    result = cache.get(key)
+    if result is None:
+        logger.debug(f"[cached_panel] Cache miss for {key}")
+        failures = getattr(_fallbacks, 'count', 0)
+        result = compute()
+        if getattr(_fallbacks, 'count', 0) != failures:
+            logger.warning(f"[cached_panel] '{panel}' fell back to empty data; not caching it")
+            return result
+        cache.set(key, result, timeout=panel_timeout(end_day))
+    return result
+
+
+def bump_version(scope, day=None):
+    """
+    Invalidates cached panels depending on `scope` (for sales: only ranges touching day's month).
+    Applied after commit so readers never cache pre-commit data under the new version.
+    """
+    if day is None and scope == SALES_SCOPE:
+        return
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    if scope == SALES_SCOPE:
+        keys = [VERSION_KEY.format(scope=scope, bucket=f"{day.year:04d}-{day.month:02d}"),
+                VERSION_KEY.format(scope=SALES_HISTORY_SCOPE, bucket='all')]
+    else:
+        keys = [VERSION_KEY.format(scope=scope, bucket='all')]
+    transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), timeout=_version_timeout()))
+
+
+def reset_analytics_cache():
+    """
+    Drops every cached analytics result without touching the rest of the cache (sessions,
+    catalog fragments, or a broker sharing the Redis database).
+    """
+    if hasattr(cache, 'delete_pattern'):
+        # django-redis
+        cache.delete_pattern('analytics:*')
+    else:
+        cache.set(EPOCH_KEY, time.time_ns(), timeout=_version_timeout())
@@ -0,0 +1,208 @@
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import get_business_timezone, to_business_date
+from nail_ecommerce_project.apps.analytics.models import BookingRiskScore, ReportLog
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Booking cancellation risk: a classifier fitted offline on resolved (completed or cancelled)
+# bookings, stored with joblib. Open bookings are scored in bulk into BookingRiskScore so admin
+# lists can sort by risk with a join. pandas / scikit-learn / joblib are imported lazily.
+
+MODEL_FILENAME = 'booking_cancellations.joblib'
+MIN_TRAINING_SAMPLES = 20
+OPEN_STATUSES = (BookingStatus.CONFIRMATION_PENDING, BookingStatus.CONFIRMED_SERVICE)
+RESOLVED_STATUSES = (BookingStatus.COMPLETED_SERVICE, BookingStatus.CANCELLED_SERVICE)
+
+NUMERIC_FEATURES = ['lead_days', 'number_of_customers', 'is_home_service', 'prior_bookings',
+                    'prior_cancellation_rate']
+CATEGORICAL_FEATURES = ['service_id', 'time_slot', 'weekday']
+
+_model_cache = {'key': None, 'model': None}
+_model_lock = threading.Lock()
+
+
+def get_model_path():
+    return Path(settings.ANALYTICS_ARTIFACT_DIR) / MODEL_FILENAME
+
+
+def load_cancellation_model():
+    """
+    Returns the persisted {'pipeline', 'version', ...} artifact, or None if not trained yet.
+    Cached per process and reloaded when the file changes.
+    """
+    path = get_model_path()
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+    with _model_lock:
+        if _model_cache['key'] != key:
+            import joblib
+
+            _model_cache['model'] = joblib.load(path)
+            _model_cache['key'] = key
+        return _model_cache['model']
+
+
+def save_cancellation_model(model):
+    import joblib
+
+    path = get_model_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    joblib.dump(model, tmp_path)
+    tmp_path.replace(path)
+
+
+def get_booking_feature_frame(bookings):
+    """
+    One row per booking of the queryset: its features plus `id` and `cancelled`. Customer
+    history only counts the customer's bookings whose outcome was known when this booking
+    was made (resolved_at before its created_at), so rows never see later cancellations.
+    Bookings resolved before resolved_at was recorded count once their service date passed.
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns = ['id', 'customer_id', 'service_id', 'date', 'time_slot', 'is_home_service',
+               'number_of_customers', 'status', 'created_at', 'created_day']
+    df = pd.DataFrame.from_records(
+        list(
+            bookings
+            .annotate(created_day=TruncDate('created_at', tzinfo=get_business_timezone()))
+            .values_list(*columns)
+            .order_by()
+        ),
+        columns=columns,
+    )
+    if df.empty:
+        return df
+
+    history = pd.DataFrame.from_records(
+        list(
+            Booking.objects
+            .filter(customer_id__in=bookings.values('customer_id'))
+            .values_list('customer_id', 'date', 'status', 'resolved_at')
+            .order_by()
+        ),
+        columns=['customer_id', 'date', 'status', 'resolved_at'],
+    )
+    day_after = (pd.to_datetime(history['date']) + pd.Timedelta(days=1)).dt.tz_localize(get_business_timezone())
+    known_at = pd.to_datetime(history['resolved_at'], utc=True).fillna(day_after.dt.tz_convert('UTC'))
+
+    # Sorted (customer, second) keys: a customer's bookings known before a moment form one contiguous run
+    epoch, second = pd.Timestamp(0, tz='UTC'), pd.Timedelta(seconds=1)
+    span = 1 << 32
+    history_keys = (history['customer_id'].to_numpy(dtype=np.int64) * span
+                    + ((known_at - epoch) // second).to_numpy(dtype=np.int64))
+    order = np.argsort(history_keys, kind='stable')
+    history_keys = history_keys[order]
+    cancelled = (history['status'].to_numpy() == BookingStatus.CANCELLED_SERVICE)[order]
+    cancellations = np.concatenate([[0], np.cumsum(cancelled)])
+
+    customer_keys = df['customer_id'].to_numpy(dtype=np.int64) * span
+    service_days = pd.to_datetime(df['date'])
+    created_days = pd.to_datetime(df['created_day'])
+    created_seconds = ((pd.to_datetime(df['created_at'], utc=True) - epoch) // second).to_numpy(dtype=np.int64)
+    first = np.searchsorted(history_keys, customer_keys, side='left')
+    before = np.searchsorted(history_keys, customer_keys + created_seconds, side='left')
+    prior_bookings = before - first
+
+    df['lead_days'] = (service_days - created_days).dt.days.clip(lower=0)
+    df['weekday'] = service_days.dt.weekday
+    df['is_home_service'] = df['is_home_service'].astype(int)
+    df['prior_bookings'] = prior_bookings
+    df['prior_cancellation_rate'] = (cancellations[before] - cancellations[first]) / np.maximum(prior_bookings, 1)
+    df['cancelled'] = (df['status'] == BookingStatus.CANCELLED_SERVICE).astype(int)
+    return df
+
+
+def _build_pipeline():
+    from sklearn.compose import ColumnTransformer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    features = ColumnTransformer([
+        ('numeric', StandardScaler(), NUMERIC_FEATURES),
+        ('categorical', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES),
+    ])
+    # Cancellations are the minority class; weight them up so they aren't ignored
+    classifier = LogisticRegression(max_iter=1000, class_weight='balanced')
+    return Pipeline([('features', features), ('classifier', classifier)])
+
+
+def fit_cancellation_model(user=None):
+    """
+    Fits the classifier on every resolved booking, stores it and rescores the open bookings.
+    Returns the model artifact, or None when there isn't enough history (both outcomes needed).
+    """
+    df = get_booking_feature_frame(Booking.objects.filter(status__in=RESOLVED_STATUSES))
+    if len(df) < MIN_TRAINING_SAMPLES or df['cancelled'].nunique() < 2:
+        logger.info(f"[fit_cancellation_model] {len(df)} resolved bookings, not enough to train on")
+        return None
+
+    pipeline = _build_pipeline()
+    pipeline.fit(df[NUMERIC_FEATURES + CATEGORICAL_FEATURES], df['cancelled'])
+
+    model = {
+        'pipeline': pipeline,
+        'version': timezone.now().strftime('%Y%m%d%H%M%S%f'),
+        'fitted_at': timezone.now(),
+        'n_samples': len(df),
+        'cancellation_rate': round(float(df['cancelled'].mean()), 4),
+    }
+    save_cancellation_model(model)
+    scored = score_open_bookings(model)
+
+    ReportLog.objects.create(
+        user=user,
+        report_type='PREDICT',
+        notes=f"Cancellation model fitted on {len(df)} bookings "
+              f"({model['cancellation_rate']:.0%} cancelled), {scored} open bookings scored (model {model['version']})"
+    )
+    logger.info(f"[fit_cancellation_model] Fitted on {len(df)} bookings, scored {scored} open bookings")
+    return model
+
+
+def score_open_bookings(model=None):
+    """
+    Rescores upcoming pending / confirmed bookings with the stored model and drops the scores
+    of bookings that have since been resolved. Returns the number scored (0 with no model).
+    """
+    model = model or load_cancellation_model()
+    if model is None:
+        return 0
+
+    open_bookings = Booking.objects.filter(status__in=OPEN_STATUSES, date__gte=to_business_date(timezone.now()))
+    df = get_booking_feature_frame(open_bookings)
+    scores = []
+    if not df.empty:
+        probabilities = model['pipeline'].predict_proba(df[NUMERIC_FEATURES + CATEGORICAL_FEATURES])[:, 1]
+        scores = [
+            BookingRiskScore(booking_id=int(booking_id), probability=round(float(p), 4),
+                             model_version=model['version'])
+            for booking_id, p in zip(df['id'], probabilities)
+        ]
+
+    with transaction.atomic():
+        BookingRiskScore.objects.exclude(booking__in=open_bookings).delete()
+        BookingRiskScore.objects.bulk_create(
+            scores,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['booking'],
+            update_fields=['probability', 'model_version', 'scored_at'],
+        )
+    logger.info(f"[score_open_bookings] Scored {len(scores)} open bookings (model {model['version']})")
+    return len(scores)
@@ -0,0 +1,141 @@
+import threading
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, Min, Q, Sum
+
+from nail_ecommerce_project.apps.analytics.cache import SEGMENTS_SCOPE, bump_version
+from nail_ecommerce_project.apps.analytics.models import CustomerMetrics
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+from nail_ecommerce_project.apps.orders.models import Order
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+METRICS_BATCH_SIZE = 1000
+
+_pending = threading.local()
+
+
+def compute_customer_metrics(user_ids=None, start=None, end=None):
+    """
+    {user_id: CustomerMetrics field values} from two grouped queries. Orders are counted
+    distinctly so the items join used for their value doesn't inflate the count. Passing
+    start / end limits the totals to activity created within that range.
+    """
+    orders = Order.objects.filter(user__role='customer').exclude(status='CANCELLED')
+    bookings = Booking.objects.filter(customer__role='customer').exclude(status=BookingStatus.CANCELLED_SERVICE)
+    if user_ids is not None:
+        orders = orders.filter(user_id__in=user_ids)
+        bookings = bookings.filter(customer_id__in=user_ids)
+    if start is not None and end is not None:
+        orders = orders.filter(created_at__range=(start, end))
+        bookings = bookings.filter(created_at__range=(start, end))
+
+    order_rows = (
+        orders
+        .values('user_id')
+        .annotate(
+            order_count=Count('id', distinct=True),
+            order_value=Sum(F('items__quantity') * F('items__price_at_order'),
+                            output_field=DecimalField(max_digits=12, decimal_places=2)),
+            first_activity=Min('created_at'),
+            last_activity=Max('created_at'),
+        )
+        .order_by()
+    )
+    booking_rows = (
+        bookings
+        .with_final_price()
+        .values('customer_id')
+        .annotate(
+            booking_count=Count('id'),
+            booking_value=Sum('final_price', filter=Q(status=BookingStatus.COMPLETED_SERVICE)),
+            first_activity=Min('created_at'),
+            last_activity=Max('created_at'),
+        )
+        .order_by()
+    )
+
+    metrics = {}
+
+    def merge(user_id, row):
+        entry = metrics.setdefault(user_id, {
+            'order_count': 0, 'booking_count': 0,
+            'order_value': Decimal('0.00'), 'booking_value': Decimal('0.00'),
+            'first_activity': None, 'last_activity': None,
+        })
+        for field in ('order_count', 'booking_count', 'order_value', 'booking_value'):
+            if row.get(field) is not None:
+                entry[field] += row[field]
+        firsts = [d for d in (entry['first_activity'], row['first_activity']) if d]
+        lasts = [d for d in (entry['last_activity'], row['last_activity']) if d]
+        entry['first_activity'] = min(firsts) if firsts else None
+        entry['last_activity'] = max(lasts) if lasts else None
+
+    for row in order_rows:
+        merge(row['user_id'], row)
+    for row in booking_rows:
+        merge(row['customer_id'], row)
+
+    for entry in metrics.values():
+        # Computed decimals aren't quantized by every backend (SQLite)
+        entry['order_value'] = Decimal(entry['order_value']).quantize(Decimal('0.01'))
+        entry['booking_value'] = Decimal(entry['booking_value']).quantize(Decimal('0.01'))
+        entry['monetary'] = entry['order_value'] + entry['booking_value']
+        entry['frequency'] = entry['order_count'] + entry['booking_count']
+    return metrics
+
+
+def rebuild_customer_metrics(user_ids=None):
+    """
+    Recomputes CustomerMetrics for `user_ids` (every customer when None). Customers left
+    without activity lose their row. Returns the number of rows written.
+    """
+    metrics = compute_customer_metrics(user_ids)
+    rows = [CustomerMetrics(user_id=user_id, **values) for user_id, values in metrics.items()]
+
+    with transaction.atomic():
+        existing = CustomerMetrics.objects.all()
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+        existing.exclude(user_id__in=list(metrics)).delete()
+        CustomerMetrics.objects.bulk_create(
+            rows,
+            batch_size=METRICS_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[
+                'order_count', 'booking_count', 'frequency', 'order_value', 'booking_value',
+                'monetary', 'first_activity', 'last_activity', 'updated_at',
+            ],
+        )
+    bump_version(SEGMENTS_SCOPE)
+
+    logger.debug(f"[rebuild_customer_metrics] {len(rows)} rows for "
+                 f"{'all customers' if user_ids is None else f'{len(user_ids)} customers'}")
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Incremental refresh: model signals mark customers dirty, one flush per commit
+# ---------------------------------------------------------------------------
+
+def mark_metrics_stale(user_id):
+    if user_id is None:
+        return
+    if not hasattr(_pending, 'user_ids'):
+        _pending.user_ids = set()
+    _pending.user_ids.add(user_id)
+    transaction.on_commit(flush_customer_metrics)
+
+
+def flush_customer_metrics():
+    user_ids, _pending.user_ids = getattr(_pending, 'user_ids', set()), set()
+    if not user_ids:
+        return
+
+    try:
+        rebuild_customer_metrics(sorted(user_ids))
+    except Exception as e:
+        logger.error(f"[Analytics] Customer metrics refresh failed for users {sorted(user_ids)}: {e}")
@@ -0,0 +1,61 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def get_business_timezone():
+    return ZoneInfo(getattr(settings, 'ANALYTICS_TIME_ZONE', None) or settings.TIME_ZONE)
+
+
+def make_business_aware(value):
+    """
+    Attach the business timezone to a naive datetime (dashboard/export date filters).
+    """
+    if timezone.is_naive(value):
+        return timezone.make_aware(value, get_business_timezone())
+    return value
+
+
+def to_business_date(value):
+    """
+    Returns the business-local calendar date for a date or datetime.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if timezone.is_naive(value):
+            return value.date()
+        return timezone.localtime(value, get_business_timezone()).date()
+    return value
+
+
+def business_day_bounds(start_day, end_day=None):
+    """
+    Returns aware datetimes [start, end) covering whole business-local days.
+    """
+    tz = get_business_timezone()
+    end_day = end_day or start_day
+    start = datetime.combine(start_day, time.min, tzinfo=tz)
+    end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+
+def iter_day_chunks(start_day, end_day, chunk_days):
+    """
+    Yields (chunk_start, chunk_end) date pairs covering start_day..end_day inclusive.
+    """
+    current = start_day
+    while current <= end_day:
+        chunk_end = min(current + timedelta(days=chunk_days - 1), end_day)
+        yield current, chunk_end
+        current = chunk_end + timedelta(days=1)
+
+
+def month_bounds(start_day, end_day):
+    """
+    Widens start_day..end_day to whole calendar months: (first of start month, last of end month).
+    """
+    next_month = (end_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start_day.replace(day=1), next_month - timedelta(days=1)
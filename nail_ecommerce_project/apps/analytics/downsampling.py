@@ -0,0 +1,114 @@
+import numpy as np
+from django.conf import settings
+
+# Range length (days) up to which each resolution is used; longer ranges fall back to 'month'
+RESOLUTIONS = (
+    ('day', 92),
+    ('week', 731),
+)
+
+# 1970-01-01 was a Thursday; shifting by 3 days aligns numpy day numbers to Monday-based weeks
+_MONDAY_OFFSET = 3
+
+
+def choose_resolution(start_day, end_day):
+    """
+    'day', 'week' or 'month' depending on how many days the range spans.
+    """
+    days = (end_day - start_day).days + 1
+    for resolution, max_days in RESOLUTIONS:
+        if days <= max_days:
+            return resolution
+    return 'month'
+
+
+def max_points():
+    return getattr(settings, 'ANALYTICS_CHART_MAX_POINTS', 200)
+
+
+def fill_daily(dates, values, start_day, end_day):
+    """
+    Dense (dates, values) for every day in start_day..end_day, zero where `dates` has no entry.
+    Duplicate dates are summed.
+    """
+    days = np.arange(np.datetime64(start_day, 'D'), np.datetime64(end_day, 'D') + 1)
+    filled = np.zeros(len(days))
+    if len(dates):
+        offsets = (np.asarray(dates, dtype='datetime64[D]') - days[0]).astype(int)
+        inside = (offsets >= 0) & (offsets < len(days))
+        np.add.at(filled, offsets[inside], np.asarray(values, dtype=float)[inside])
+    return days, filled
+
+
+def bucket_starts(dates, resolution):
+    """First day of the week (Monday) or month containing each date."""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    if resolution == 'day':
+        return dates
+    if resolution == 'week':
+        numbers = dates.astype(int)
+        return (numbers - (numbers + _MONDAY_OFFSET) % 7).astype('datetime64[D]')
+    if resolution == 'month':
+        return dates.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def resample(dates, values, resolution, how='sum'):
+    """
+    Aggregates daily points into week/month buckets labelled by their first day.
+    how='mean' averages over the days present in each bucket (partial edge buckets included).
+    """
+    if resolution == 'day' or not len(dates):
+        return np.asarray(dates, dtype='datetime64[D]'), np.asarray(values, dtype=float)
+    buckets, inverse = np.unique(bucket_starts(dates, resolution), return_inverse=True)
+    totals = np.bincount(inverse, weights=np.asarray(values, dtype=float), minlength=len(buckets))
+    if how == 'mean':
+        totals = totals / np.bincount(inverse, minlength=len(buckets))
+    elif how != 'sum':
+        raise ValueError(f"Unknown aggregation: {how}")
+    return buckets, totals
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that preserve the
+    visual shape of (x, y). First and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - avg_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y - py))
+        previous = lo + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_series(dates, values, resolution, how='sum', limit=None):
+    """
+    Buckets a daily series to `resolution`, then caps it at `limit` points
+    (default ANALYTICS_CHART_MAX_POINTS) with LTTB. Returns (dates, values).
+    """
+    dates, values = resample(dates, values, resolution, how=how)
+    limit = limit or max_points()
+    if len(dates) > limit:
+        keep = lttb(dates.astype(int), values, limit)
+        dates, values = dates[keep], values[keep]
+    return dates, values
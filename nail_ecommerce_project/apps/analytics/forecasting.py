@@ -0,0 +1,186 @@
+import hashlib
+from datetime import timedelta
+from itertools import product
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import business_day_bounds, get_business_timezone, to_business_date
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import Order
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEASON_LENGTH = 7  # weekly seasonality on daily data
+FIT_KEY = 'analytics:forecast:{series}'
+
+# Smoothing parameter grid, evaluated for all combinations in one vectorized pass
+ALPHAS = np.linspace(0.05, 0.95, 10)
+BETAS = np.array([0.0, 0.01, 0.05, 0.1, 0.2])
+GAMMAS = np.array([0.0, 0.05, 0.1, 0.2, 0.3, 0.5])
+
+Z_95 = 1.96
+
+SERIES = {
+    # name -> (queryset, datetime field bucketed by business-local day)
+    'orders': (lambda: Order.objects.all(), 'created_at'),
+    'bookings': (lambda: Booking.objects.all(), 'created_at'),
+}
+
+
+# --------------------------
+# SERIES
+# --------------------------
+
+def daily_counts(series, start_day, end_day):
+    """
+    Zero-filled daily counts for start_day..end_day (inclusive) as a float array.
+    """
+    queryset, field = SERIES[series]
+    start, end = business_day_bounds(start_day, end_day)
+    rows = (
+        queryset()
+        .filter(**{f'{field}__gte': start, f'{field}__lt': end})
+        .annotate(day=TruncDate(field, tzinfo=get_business_timezone()))
+        .values('day')
+        .annotate(count=Count('id'))
+        .order_by()
+        .values_list('day', 'count')
+    )
+    values = np.zeros((end_day - start_day).days + 1)
+    for day, count in rows:
+        values[(day - start_day).days] = count
+    return values
+
+
+# --------------------------
+# MODEL
+# --------------------------
+
+def fit_holt_winters(y, season_length=SEASON_LENGTH):
+    """
+    Additive Holt-Winters fitted by grid search over (alpha, beta, gamma), minimising
+    one-step-ahead squared error. Returns the final state needed to forecast.
+    """
+    y = np.asarray(y, dtype=float)
+    n, m = len(y), season_length
+
+    if n < 2:
+        level = y[-1] if n else 0.0
+        return {'alpha': 1.0, 'beta': 0.0, 'gamma': 0.0, 'level': float(level), 'trend': 0.0,
+                'season': [0.0] * m, 'sigma': 0.0, 'n': n, 'season_length': m}
+
+    seasonal = n >= 2 * m
+    if seasonal:
+        level0 = y[:m].mean()
+        trend0 = (y[m:2 * m].mean() - level0) / m
+        season0 = y[:m] - level0
+        gammas = GAMMAS
+    else:
+        # Too short to estimate a weekly pattern: plain Holt (level + trend)
+        level0, trend0, season0 = y[0], 0.0, np.zeros(m)
+        gammas = np.array([0.0])
+
+    grid = np.array(list(product(ALPHAS, BETAS, gammas)))
+    alpha, beta, gamma = grid[:, 0], grid[:, 1], grid[:, 2]
+    g = len(grid)
+
+    level = np.full(g, level0)
+    trend = np.full(g, trend0)
+    season = np.tile(season0, (g, 1))
+    sse = np.zeros(g)
+    burn_in = m if seasonal else 1
+
+    for t in range(n):
+        slot = t % m
+        s = season[:, slot]
+        error = y[t] - (level + trend + s)
+        if t >= burn_in:
+            sse += error ** 2
+        new_level = alpha * (y[t] - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[:, slot] = gamma * (y[t] - new_level) + (1 - gamma) * s
+        level = new_level
+
+    best = int(np.argmin(sse))
+    # Rotate so season[0] applies to the first forecast day (t = n)
+    best_season = np.roll(season[best], -(n % m))
+    return {
+        'alpha': float(alpha[best]),
+        'beta': float(beta[best]),
+        'gamma': float(gamma[best]),
+        'level': float(level[best]),
+        'trend': float(trend[best]),
+        'season': best_season.tolist(),
+        'sigma': float(np.sqrt(sse[best] / max(n - burn_in, 1))),
+        'n': n,
+        'season_length': m,
+    }
+
+
+def forecast_holt_winters(fit, horizon):
+    """
+    Returns (mean, lower, upper) arrays for the next `horizon` steps (95% bands).
+    """
+    h = np.arange(1, horizon + 1)
+    m = fit['season_length']
+    season = np.asarray(fit['season'])
+    mean = fit['level'] + h * fit['trend'] + season[(h - 1) % m]
+
+    # h-step variance of the additive model: sigma² (1 + Σ_{j<h} c_j²)
+    j = np.arange(1, horizon)
+    c = fit['alpha'] * (1 + j * fit['beta']) + fit['gamma'] * (j % m == 0)
+    variance = fit['sigma'] ** 2 * np.concatenate([[1.0], 1 + np.cumsum(c ** 2)])
+    spread = Z_95 * np.sqrt(variance)
+
+    # Counts can't go negative
+    return np.clip(mean, 0, None), np.clip(mean - spread, 0, None), np.clip(mean + spread, 0, None)
+
+
+# --------------------------
+# CACHED FITS
+# --------------------------
+
+def get_series_fit(series, as_of=None):
+    """
+    Fitted model for `series` on the closed days before `as_of` (default: today).
+    Parameters are cached and refit only when that history changes (e.g. a new day lands).
+    """
+    as_of = as_of or to_business_date(timezone.now())
+    last_day = as_of - timedelta(days=1)
+    first_day = last_day - timedelta(days=getattr(settings, 'ANALYTICS_FORECAST_HISTORY_DAYS', 365) - 1)
+
+    history = daily_counts(series, first_day, last_day)
+    # Leading days before the first activity carry no signal
+    nonzero = np.flatnonzero(history)
+    history = history[nonzero[0]:] if len(nonzero) else history[:0]
+
+    fingerprint = hashlib.md5(last_day.isoformat().encode() + history.tobytes()).hexdigest()
+    key = FIT_KEY.format(series=series)
+    cached = cache.get(key)
+    if cached and cached['fingerprint'] == fingerprint:
+        return cached['fit']
+
+    fit = fit_holt_winters(history)
+    fit['last_day'] = last_day
+    cache.set(key, {'fingerprint': fingerprint, 'fit': fit}, timeout=None)
+    logger.info(f"[get_series_fit] Refit '{series}' on {fit['n']} days "
+                f"(alpha={fit['alpha']:.2f}, beta={fit['beta']:.2f}, gamma={fit['gamma']:.2f})")
+    return fit
+
+
+def forecast_series(series, horizon=None, as_of=None):
+    """
+    Returns (days, mean, lower, upper) for the `horizon` days starting at `as_of`.
+    """
+    horizon = horizon or getattr(settings, 'ANALYTICS_FORECAST_HORIZON', 14)
+    fit = get_series_fit(series, as_of=as_of)
+    mean, lower, upper = forecast_holt_winters(fit, horizon)
+    first = fit['last_day'] + timedelta(days=1)
+    days = [first + timedelta(days=i) for i in range(horizon)]
+    return days, mean, lower, upper
@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import iter_day_chunks, to_business_date
+from nail_ecommerce_project.apps.analytics.rollups import rebuild_product_sales, rebuild_service_sales
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import Order
+
+
+class Command(BaseCommand):
+    help = "Backfills the daily product and service sales rollups in chunks of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="First day to rebuild (YYYY-MM-DD). Defaults to the earliest sale.")
+        parser.add_argument('--end', help="Last day to rebuild (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument('--chunk-days', type=int, default=31, help="Days rebuilt per transaction.")
+
+    def handle(self, *args, **options):
+        try:
+            start_day = date.fromisoformat(options['start']) if options['start'] else self._earliest_day()
+            end_day = date.fromisoformat(options['end']) if options['end'] else to_business_date(timezone.now())
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        if start_day is None:
+            self.stdout.write("No orders or bookings found, nothing to backfill.")
+            return
+        if start_day > end_day:
+            raise CommandError("--start must be on or before --end")
+        if options['chunk_days'] < 1:
+            raise CommandError("--chunk-days must be at least 1")
+
+        for chunk_start, chunk_end in iter_day_chunks(start_day, end_day, options['chunk_days']):
+            product_rows = rebuild_product_sales(chunk_start, chunk_end)
+            service_rows = rebuild_service_sales(chunk_start, chunk_end)
+            self.stdout.write(
+                f"{chunk_start} → {chunk_end}: {product_rows} product rows, {service_rows} service rows"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Sales rollups rebuilt from {start_day} to {end_day}."))
+
+    @staticmethod
+    def _earliest_day():
+        first_order = Order.objects.aggregate(first=Min('created_at'))['first']
+        first_booking = Booking.objects.aggregate(first=Min('date'))['first']
+        candidates = [d for d in (to_business_date(first_order), first_booking) if d]
+        return min(candidates) if candidates else None
@@ -0,0 +1,101 @@
+import json
+import platform
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.benchmarks import TARGETS, compare_results, data_volume, run_benchmarks
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+from nail_ecommerce_project.apps.analytics.synthetic import (
+    DEFAULT_SIZES, generate_synthetic_data, purge_synthetic_data,
+)
+
+
+def _csv(value, cast=str):
+    return [cast(part) for part in value.split(',') if part.strip()]
+
+
+class Command(BaseCommand):
+    help = ("Times each analytics function and the full dashboard over several date ranges (and, with "
+            "--scales, several synthetic data sizes), recording query counts and peak memory. Results "
+            "are written as JSON; --baseline compares them with an earlier run. Drops cached analytics "
+            "while measuring, so it only runs with DEBUG on unless --force is given.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='analytics_benchmark.json', help="JSON file to write.")
+        parser.add_argument('--ranges', default='30,90,365', help="Comma-separated range lengths in days.")
+        parser.add_argument('--targets', help=f"Comma-separated subset of: {', '.join(TARGETS)}.")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed runs per measurement.")
+        parser.add_argument('--end', help="Last day of every range (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument('--scales', help=(
+            "Comma-separated fractions of the full synthetic data set (e.g. 0.01,0.1,1). For each one the "
+            "synthetic data is purged and regenerated before measuring. Without it the current data is used."
+        ))
+        parser.add_argument('--seed', type=int, default=0, help="Seed for generated data.")
+        parser.add_argument('--baseline', help="Earlier results file to compare against.")
+        parser.add_argument('--force', action='store_true', help="Run even though DEBUG is off.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("DEBUG is off: this looks like a live site. Pass --force to benchmark it anyway.")
+        try:
+            end_day = date.fromisoformat(options['end']) if options['end'] else to_business_date(timezone.now())
+            range_days = _csv(options['ranges'], int)
+            scales = _csv(options['scales'], float) if options['scales'] else [None]
+        except ValueError as e:
+            raise CommandError(f"Invalid option: {e}")
+        targets = _csv(options['targets']) if options['targets'] else list(TARGETS)
+        unknown = [target for target in targets if target not in TARGETS]
+        if unknown:
+            raise CommandError(f"Unknown targets: {', '.join(unknown)}")
+        if not range_days or min(range_days) < 1 or options['repeat'] < 1:
+            raise CommandError("--ranges and --repeat must be positive")
+        if any(scale is not None and scale <= 0 for scale in scales):
+            raise CommandError("--scales must be positive")
+
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = json.loads(Path(options['baseline']).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read baseline: {e}")
+
+        runs = []
+        for scale in scales:
+            if scale is not None:
+                purge_synthetic_data()
+                sizes = {name: max(int(size * scale), 1) for name, size in DEFAULT_SIZES.items()}
+                self.stdout.write(f"Generating scale {scale}: {sizes}")
+                generate_synthetic_data(end_day, days=max(range_days), seed=options['seed'], **sizes)
+
+            volume = data_volume()
+            self.stdout.write(f"Benchmarking against {volume['order_items']} order items, "
+                              f"{volume['bookings']} bookings, {volume['customers']} customers")
+            results = run_benchmarks(end_day, range_days=range_days, targets=targets,
+                                     repeat=options['repeat'], progress=self.stdout.write)
+            runs.append({'scale': scale, 'data': volume, 'results': results})
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'end_day': end_day.isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'runs': runs,
+        }
+        if baseline:
+            report['comparison'] = compare_results(baseline, report)
+            for row in report['comparison']:
+                self.stdout.write(
+                    f"{row['target']} over {row['range_days']} days (scale {row['scale']}): "
+                    f"{row['baseline_seconds']:.3f}s → {row['seconds']:.3f}s (x{row['ratio']}), "
+                    f"queries {row['queries_delta']:+d}"
+                )
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, default=str))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {sum(len(r['results']) for r in runs)} measurements to {output}."))
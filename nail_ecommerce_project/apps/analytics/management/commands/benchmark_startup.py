@@ -0,0 +1,91 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Libraries only the analytics dashboard needs; none of them may load at worker boot
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'scipy', 'plotly', 'joblib')
+
+# Runs in a fresh interpreter: boots Django the way a WSGI worker does and reports
+# wall time, peak RSS and which heavy modules ended up imported.
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from importlib import import_module
+import config.wsgi
+from django.conf import settings
+import_module(settings.ROOT_URLCONF)
+elapsed = time.perf_counter() - started
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+except ImportError:  # Windows
+    rss_mb = None
+print(json.dumps({
+    'import_seconds': elapsed,
+    'rss_mb': rss_mb,
+    'heavy_modules': sorted(m for m in %r if m in sys.modules),
+}))
+""" % (HEAVY_MODULES,)
+
+
+class Command(BaseCommand):
+    help = ("Measures worker boot cost (import time and peak RSS of a fresh interpreter loading the "
+            "WSGI app and URLconf) and fails if analytics-only libraries are imported at startup.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters to sample.")
+        parser.add_argument('--max-seconds', type=float, help="Fail if the median import time exceeds this.")
+        parser.add_argument('--max-rss-mb', type=float, help="Fail if peak RSS exceeds this.")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1")
+
+        samples = [self._probe() for _ in range(options['runs'])]
+        rss_values = [s['rss_mb'] for s in samples if s['rss_mb'] is not None]
+        report = {
+            'runs': len(samples),
+            'import_seconds_median': statistics.median(s['import_seconds'] for s in samples),
+            'import_seconds_max': max(s['import_seconds'] for s in samples),
+            'rss_mb_max': max(rss_values) if rss_values else None,
+            'heavy_modules': sorted({m for s in samples for m in s['heavy_modules']}),
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report))
+        else:
+            rss = f"{report['rss_mb_max']:.1f} MB" if report['rss_mb_max'] is not None else "n/a"
+            self.stdout.write(
+                f"Worker boot over {report['runs']} run(s): median {report['import_seconds_median']:.3f}s, "
+                f"max {report['import_seconds_max']:.3f}s, peak RSS {rss}"
+            )
+            self.stdout.write(f"Heavy modules loaded at boot: {', '.join(report['heavy_modules']) or 'none'}")
+
+        problems = []
+        if report['heavy_modules']:
+            problems.append(f"heavy modules imported at startup: {', '.join(report['heavy_modules'])}")
+        if options['max_seconds'] is not None and report['import_seconds_median'] > options['max_seconds']:
+            problems.append(f"median import time {report['import_seconds_median']:.3f}s > {options['max_seconds']}s")
+        if (options['max_rss_mb'] is not None and report['rss_mb_max'] is not None
+                and report['rss_mb_max'] > options['max_rss_mb']):
+            problems.append(f"peak RSS {report['rss_mb_max']:.1f} MB > {options['max_rss_mb']} MB")
+        if problems:
+            raise CommandError("Startup regression: " + "; ".join(problems))
+
+    @staticmethod
+    def _probe():
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings.dev')}
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True, timeout=120,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup probe failed:\n{result.stderr[-2000:]}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nail_ecommerce_project.apps.analytics.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = ("Exports closed sales days into the memory-mapped analytics snapshot. Appends the days since "
+            "the last build (and re-exports days changed since then), or rebuilds everything with --full.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--through', help="Last day to export (YYYY-MM-DD). Defaults to yesterday.")
+        parser.add_argument('--full', action='store_true', help="Discard the snapshot and export all history.")
+
+    def handle(self, *args, **options):
+        try:
+            through = date.fromisoformat(options['through']) if options['through'] else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        result = build_snapshot(through=through, full=options['full'])
+        if result['order_lines'] is None:
+            self.stdout.write(f"Snapshot already current through {result['through']}.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot current through {result['through']} (exported from {result['appended_from'] or 'the beginning'}: "
+            f"{result['order_lines']} order lines, {result['bookings']} bookings)."
+        ))
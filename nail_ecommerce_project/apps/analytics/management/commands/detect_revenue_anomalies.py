@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.anomalies import detect_anomalies, scan_closed_days
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+
+
+class Command(BaseCommand):
+    help = ("Flags days whose order or booking revenue deviates sharply from the trailing weeks. "
+            "Run nightly: scans only the days closed since the last run. --start/--end rescan a range "
+            "(e.g. after backfilling sales) without moving the checkpoint.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="First day to rescan (YYYY-MM-DD).")
+        parser.add_argument('--end', help="Last day to rescan (YYYY-MM-DD). Defaults to yesterday.")
+
+    def handle(self, *args, **options):
+        if not options['start']:
+            if options['end']:
+                raise CommandError("--end requires --start")
+            result = scan_closed_days()
+            if result is None:
+                self.stdout.write("No newly closed days to scan.")
+                return
+            start_day, end_day, anomalies = result
+        else:
+            yesterday = to_business_date(timezone.now()) - timedelta(days=1)
+            try:
+                start_day = date.fromisoformat(options['start'])
+                end_day = date.fromisoformat(options['end']) if options['end'] else yesterday
+            except ValueError as e:
+                raise CommandError(f"Invalid date: {e}")
+            if start_day > end_day:
+                raise CommandError("--start must be on or before --end")
+            if end_day > yesterday:
+                raise CommandError("Only closed days can be scanned; --end must be before today")
+            anomalies = detect_anomalies(start_day, end_day)
+
+        for anomaly in anomalies:
+            self.stdout.write(f"{anomaly.day} {anomaly.series}: {anomaly.direction.lower()} "
+                              f"₹{anomaly.revenue} vs ₹{anomaly.expected} expected (z={anomaly.score})")
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {start_day} to {end_day}: {len(anomalies)} anomalies."
+        ))
@@ -0,0 +1,59 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+from nail_ecommerce_project.apps.analytics.synthetic import (
+    DEFAULT_SIZES, generate_synthetic_data, purge_synthetic_data,
+)
+
+
+class Command(BaseCommand):
+    help = ("Generates realistic synthetic customers, orders and bookings with bulk inserts for load "
+            "testing the analytics dashboard, then refreshes rollups and customer metrics. "
+            "Synthetic rows are tagged and can be removed again with --purge.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=DEFAULT_SIZES['customers'])
+        parser.add_argument('--order-items', type=int, default=DEFAULT_SIZES['order_items'])
+        parser.add_argument('--bookings', type=int, default=DEFAULT_SIZES['bookings'])
+        parser.add_argument('--days', type=int, default=365, help="Length of the generated history.")
+        parser.add_argument('--end', help="Last day of the history (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert.")
+        parser.add_argument('--seed', type=int, help="Random seed, for reproducible data sets.")
+        parser.add_argument('--purge', action='store_true', help="Delete all synthetic data instead.")
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            removed = purge_synthetic_data()
+            self.stdout.write(self.style.SUCCESS(f"Removed {removed} synthetic customers and their activity."))
+            return
+
+        try:
+            end_day = date.fromisoformat(options['end']) if options['end'] else to_business_date(timezone.now())
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+        if options['customers'] < 1:
+            raise CommandError("--customers must be at least 1")
+        for option in ('order_items', 'bookings'):
+            if options[option] < 0:
+                raise CommandError(f"--{option.replace('_', '-')} cannot be negative")
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError("--days and --batch-size must be at least 1")
+
+        counts = generate_synthetic_data(
+            end_day,
+            customers=options['customers'],
+            order_items=options['order_items'],
+            bookings=options['bookings'],
+            days=options['days'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            progress=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {counts['customers']} customers, {counts['orders']} orders "
+            f"({counts['order_items']} items) and {counts['bookings']} bookings "
+            f"from {counts['start_day']} to {counts['end_day']}."
+        ))
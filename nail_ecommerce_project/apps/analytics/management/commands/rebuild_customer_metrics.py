@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from nail_ecommerce_project.apps.analytics.customer_metrics import rebuild_customer_metrics
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-customer RFM metrics table from orders and bookings, in chunks of customers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Customers recomputed per transaction.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        customer_ids = list(User.objects.filter(role='customer').order_by('id').values_list('id', flat=True))
+        written = 0
+        for offset in range(0, len(customer_ids), chunk_size):
+            written += rebuild_customer_metrics(customer_ids[offset:offset + chunk_size])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Customer metrics rebuilt: {written} active of {len(customer_ids)} customers."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from nail_ecommerce_project.apps.analytics.recommendations import rebuild_recommendations
+
+
+class Command(BaseCommand):
+    help = ("Folds orders created since the last run into the co-purchase matrix and refreshes the "
+            "\"frequently bought together\" recommendations of the products they contain. "
+            "Use --full to recount every order.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Discard the matrix and recount all orders.")
+        parser.add_argument('--top-k', type=int, help="Recommendations kept per product.")
+
+    def handle(self, *args, **options):
+        if options['top_k'] is not None and options['top_k'] < 1:
+            raise CommandError("--top-k must be at least 1")
+
+        result = rebuild_recommendations(full=options['full'], top_k=options['top_k'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Recommendations refreshed: {result['orders']} new orders, {result['products']} products, "
+            f"{result['recommendations']} recommendations (through order #{result['watermark']})."
+        ))
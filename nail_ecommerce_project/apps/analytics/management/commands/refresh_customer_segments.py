@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from nail_ecommerce_project.apps.analytics.segmentation import fit_segment_model, refresh_segment_model
+
+
+class Command(BaseCommand):
+    help = ("Refreshes the stored customer segmentation: partial-fits customers with new activity, "
+            "or refits every customer with --full.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Refit the scaler and centroids from scratch.")
+
+    def handle(self, *args, **options):
+        model = fit_segment_model() if options['full'] else refresh_segment_model()
+        if model is None:
+            self.stdout.write("No customer activity yet, no segmentation model stored.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Customer segmentation model {model['version']} is up to date."))
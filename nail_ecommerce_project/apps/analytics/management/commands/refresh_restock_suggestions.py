@@ -0,0 +1,25 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nail_ecommerce_project.apps.analytics.restock import refresh_restock_suggestions
+
+
+class Command(BaseCommand):
+    help = ("Recomputes daily demand, days of cover and reorder levels for every product variant "
+            "from recent order history. Run nightly.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--end', help="Last day of history to use (YYYY-MM-DD). Defaults to yesterday.")
+
+    def handle(self, *args, **options):
+        try:
+            end_day = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        result = refresh_restock_suggestions(end_day=end_day)
+        self.stdout.write(self.style.SUCCESS(
+            f"Restock suggestions refreshed for {result['variants']} variants "
+            f"({result['history_days']} days to {result['end_day']}): {result['reorder']} to reorder."
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from nail_ecommerce_project.apps.analytics.cancellations import fit_cancellation_model, score_open_bookings
+
+
+class Command(BaseCommand):
+    help = ("Fits the booking cancellation classifier on completed and cancelled bookings, stores it "
+            "and rescores every open booking. --score-only rescores with the stored model.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--score-only', action='store_true', help="Rescore open bookings without refitting.")
+
+    def handle(self, *args, **options):
+        if options['score_only']:
+            scored = score_open_bookings()
+            self.stdout.write(self.style.SUCCESS(f"Scored {scored} open bookings."))
+            return
+
+        model = fit_cancellation_model()
+        if model is None:
+            self.stdout.write("Not enough completed and cancelled bookings yet, no model stored.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Cancellation model {model['version']} fitted on {model['n_samples']} bookings "
+            f"({model['cancellation_rate']:.0%} cancelled)."
+        ))
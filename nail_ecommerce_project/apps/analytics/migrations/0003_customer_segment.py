@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_daily_sales_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cluster', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('total_value', models.FloatField(default=0)),
+                ('frequency', models.PositiveIntegerField(default=0)),
+                ('avg_order_value', models.FloatField(default=0)),
+                ('last_activity', models.DateTimeField(blank=True, null=True)),
+                ('model_version', models.CharField(blank=True, max_length=32)),
+                ('is_stale', models.BooleanField(db_index=True, default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='segment', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-total_value'],
+            },
+        ),
+    ]
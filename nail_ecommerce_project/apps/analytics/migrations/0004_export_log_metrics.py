@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_customer_segment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticsexportlog',
+            name='duration_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='analyticsexportlog',
+            name='row_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
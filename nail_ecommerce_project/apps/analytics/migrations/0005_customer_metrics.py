@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_export_log_metrics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('frequency', models.PositiveIntegerField(default=0)),
+                ('order_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('booking_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('monetary', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('first_activity', models.DateTimeField(blank=True, null=True)),
+                ('last_activity', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-monetary'],
+                'indexes': [models.Index(fields=['-monetary'], name='customer_metrics_spend_idx')],
+            },
+        ),
+    ]
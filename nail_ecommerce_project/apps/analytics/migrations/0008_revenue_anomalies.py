@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_product_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('day', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RevenueAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('series', models.CharField(choices=[('Orders', 'Orders'), ('Bookings', 'Bookings')], max_length=10)),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('expected', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('score', models.FloatField()),
+                ('direction', models.CharField(choices=[('SPIKE', 'Spike'), ('DROP', 'Drop')], max_length=5)),
+                ('detected_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-day', 'series'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'series'), name='revenue_anomaly_day_series_uniq')],
+            },
+        ),
+    ]
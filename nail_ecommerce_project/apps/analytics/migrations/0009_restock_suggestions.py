@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_revenue_anomalies'),
+        ('products', '0005_remove_productvariant_reserved_quantity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RestockSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('daily_demand', models.FloatField(default=0)),
+                ('reorder_point', models.PositiveIntegerField(default=0)),
+                ('target_stock', models.PositiveIntegerField(default=0)),
+                ('history_days', models.PositiveSmallIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('variant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='restock', to='products.productvariant')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_restock_suggestions'),
+        ('bookings', '0004_booking_home_visit_fee'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingRiskScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('probability', models.FloatField(db_index=True)),
+                ('model_version', models.CharField(max_length=32)),
+                ('scored_at', models.DateTimeField(auto_now=True)),
+                ('booking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='risk', to='bookings.booking')),
+            ],
+            options={
+                'ordering': ['-probability'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0010_booking_risk_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('changed_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
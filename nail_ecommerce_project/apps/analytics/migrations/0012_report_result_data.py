@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0011_snapshot_dirty_days'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='reportlog',
+            name='result_file',
+        ),
+        migrations.AddField(
+            model_name='reportlog',
+            name='result_data',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
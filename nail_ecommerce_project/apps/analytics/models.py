@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models import Case, F, FloatField, When
+from django.db.models.functions import Cast
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from logs.logger import get_logger
 logger = get_logger(__name__)
@@ -14,10 +17,35 @@ class ReportLog(models.Model):
         ('PREDICT', 'Booking Prediction'),
     ]
 
+    # Plain log entries are recorded as SUCCESS; background report jobs move through all states
+    STATUS_PENDING = 'PENDING'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_SUCCESS = 'SUCCESS'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCESS, 'Success'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     report_type = models.CharField(max_length=20, choices=REPORT_TYPES)
     created_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_SUCCESS, db_index=True)
+    parameters = models.JSONField(default=dict, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    # The finished report itself, kept in the database so the web process can serve what a
+    # worker on another host produced
+    result_data = models.BinaryField(null=True, blank=True, editable=False)
+    error_message = models.TextField(blank=True, null=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCESS, self.STATUS_FAILED)
 
     def __str__(self):
         return f"{self.get_report_type_display()} by {self.user} at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
@@ -29,6 +57,247 @@ class AnalyticsExportLog(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     success = models.BooleanField(default=True)
     error_message = models.TextField(blank=True, null=True)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.admin_user} | {self.export_type} | {self.timestamp}"
+
+
+class DailyProductSales(models.Model):
+    """
+    Per-day, per-product order rollup. `day` is the business-local order date.
+    """
+    day = models.DateField()
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='daily_sales')
+    status = models.CharField(max_length=20)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'product', 'status')
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day} | {self.product_id} | {self.status} | ₹{self.revenue}"
+
+
+class DailyServiceSales(models.Model):
+    """
+    Per-day, per-service booking rollup. `day` is the booking's service date.
+    """
+    day = models.DateField()
+    service = models.ForeignKey('services.Service', on_delete=models.CASCADE, related_name='daily_sales')
+    status = models.CharField(max_length=25)
+    bookings = models.PositiveIntegerField(default=0)
+    customers = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('day', 'service', 'status')
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day} | {self.service_id} | {self.status} | ₹{self.revenue}"
+
+
+class CustomerSegment(models.Model):
+    """
+    Stored customer segment assignment, scored against the persisted segmentation model.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='segment')
+    cluster = models.PositiveSmallIntegerField(null=True, blank=True)
+    total_value = models.FloatField(default=0)
+    frequency = models.PositiveIntegerField(default=0)
+    avg_order_value = models.FloatField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    model_version = models.CharField(max_length=32, blank=True)
+    is_stale = models.BooleanField(default=False, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_value']
+
+    def __str__(self):
+        return f"{self.user} → segment {self.cluster}"
+
+
+class CustomerMetrics(models.Model):
+    """
+    Lifetime recency / frequency / monetary metrics per customer, kept current on order and
+    booking changes (see analytics.customer_metrics). Cancelled orders and bookings don't count;
+    order value is what was charged (quantity × price_at_order), booking value the final price
+    of completed services.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='metrics')
+    order_count = models.PositiveIntegerField(default=0)
+    booking_count = models.PositiveIntegerField(default=0)
+    frequency = models.PositiveIntegerField(default=0)
+    order_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    booking_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    monetary = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    first_activity = models.DateTimeField(null=True, blank=True)
+    last_activity = models.DateTimeField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-monetary']
+        indexes = [models.Index(fields=['-monetary'], name='customer_metrics_spend_idx')]
+
+    @property
+    def recency_days(self):
+        if self.last_activity is None:
+            return None
+        return (timezone.now() - self.last_activity).days
+
+    def __str__(self):
+        return f"{self.user} | {self.frequency} visits | ₹{self.monetary}"
+
+
+class ProductRecommendation(models.Model):
+    """
+    "Frequently bought together": the top co-purchased products for each product, ranked by
+    the number of orders containing both (see analytics.recommendations).
+    """
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='+')
+    score = models.PositiveIntegerField(default=0)
+    rank = models.PositiveSmallIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['product', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'rank'], name='product_recommendation_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product} → #{self.rank} {self.recommended} ({self.score} orders)"
+
+
+class AnalyticsCheckpoint(models.Model):
+    """
+    Watermark of a periodic analytics job: the last closed business day it has processed.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    day = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} through {self.day}"
+
+
+class SnapshotDirtyDay(models.Model):
+    """
+    A sales day whose rollups changed, and when. Snapshot generations built before changed_at
+    are stale for that day (see analytics.snapshot), whichever process built them.
+    """
+    day = models.DateField(unique=True)
+    changed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.day} changed at {self.changed_at}"
+
+
+class RevenueAnomaly(models.Model):
+    """
+    A closed day whose order or booking revenue deviated sharply from the trailing window
+    (robust z-score against the rolling median / MAD, see analytics.anomalies).
+    """
+    SERIES_CHOICES = [
+        ('Orders', 'Orders'),
+        ('Bookings', 'Bookings'),
+    ]
+    DIRECTION_CHOICES = [
+        ('SPIKE', 'Spike'),
+        ('DROP', 'Drop'),
+    ]
+
+    day = models.DateField()
+    series = models.CharField(max_length=10, choices=SERIES_CHOICES)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2)
+    expected = models.DecimalField(max_digits=12, decimal_places=2)
+    score = models.FloatField()
+    direction = models.CharField(max_length=5, choices=DIRECTION_CHOICES)
+    detected_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day', 'series']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'series'], name='revenue_anomaly_day_series_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.series} {self.direction.lower()} on {self.day}: ₹{self.revenue} vs ₹{self.expected}"
+
+
+class BookingRiskScore(models.Model):
+    """
+    Predicted probability that an open booking gets cancelled, from the stored classifier
+    (see analytics.cancellations). Rescored periodically, never at request time.
+    """
+    booking = models.OneToOneField('bookings.Booking', on_delete=models.CASCADE, related_name='risk')
+    probability = models.FloatField(db_index=True)
+    model_version = models.CharField(max_length=32)
+    scored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-probability']
+
+    @property
+    def percent(self):
+        return round(self.probability * 100)
+
+    def __str__(self):
+        return f"Booking #{self.booking_id}: {self.percent}% cancellation risk"
+
+
+class RestockSuggestionQuerySet(models.QuerySet):
+    def with_cover(self):
+        """
+        Annotates `cover`, the database-side equivalent of RestockSuggestion.days_of_cover
+        (NULL for variants that haven't sold in the history window).
+        """
+        return self.annotate(cover=Case(
+            When(daily_demand__gt=0,
+                 then=Cast('variant__stock_quantity', FloatField()) / F('daily_demand')),
+            default=None,
+            output_field=FloatField(),
+        ))
+
+    def needing_reorder(self):
+        return self.filter(daily_demand__gt=0, variant__stock_quantity__lte=F('reorder_point'))
+
+
+class RestockSuggestion(models.Model):
+    """
+    Nightly demand estimate per variant (see analytics.restock). Demand and the stock levels
+    derived from it are stored; days of cover and the reorder quantity are read against the
+    variant's current stock so a restock shows up before the next refresh.
+    """
+    variant = models.OneToOneField('products.ProductVariant', on_delete=models.CASCADE, related_name='restock')
+    daily_demand = models.FloatField(default=0)
+    # Reorder once stock falls to reorder_point; order enough to get back up to target_stock
+    reorder_point = models.PositiveIntegerField(default=0)
+    target_stock = models.PositiveIntegerField(default=0)
+    history_days = models.PositiveSmallIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    objects = RestockSuggestionQuerySet.as_manager()
+
+    @property
+    def days_of_cover(self):
+        if self.daily_demand <= 0:
+            return None
+        return round(self.variant.stock_quantity / self.daily_demand, 1)
+
+    @property
+    def reorder_quantity(self):
+        stock = self.variant.stock_quantity
+        if self.daily_demand <= 0 or stock > self.reorder_point:
+            return 0
+        return max(self.target_stock - stock, 0)
 
     def __str__(self):
-        return f"{self.admin_user} | {self.export_type} | {self.timestamp}"
\ No newline at end of file
+        return f"{self.variant} | {self.daily_demand:.2f}/day | reorder at {self.reorder_point}"
@@ -0,0 +1,358 @@
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections
+
+from nail_ecommerce_project.apps.analytics.anomalies import get_revenue_anomalies
+from nail_ecommerce_project.apps.analytics.cache import (
+    INVENTORY_SCOPE, SALES_HISTORY_SCOPE, SALES_SCOPE, SEGMENTS_SCOPE, cached_panel,
+)
+from nail_ecommerce_project.apps.analytics.dates import month_bounds, to_business_date
+from nail_ecommerce_project.apps.analytics.restock import get_restock_suggestions
+from nail_ecommerce_project.apps.analytics.utils import get_sales_data, get_customer_segments, get_customer_clusters, \
+    get_time_series_forecast, get_top_products_vs_services, get_low_stock_products, get_forecast_data, \
+    get_cohort_retention, get_booking_demand
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Plotly is imported inside the builders so importing the panel registry (URLconf) stays cheap.
+# build(start_date, end_date) -> JSON-serialisable payload (Plotly figures or compact chart specs);
+# timeout is the seconds the browser (and the server-side fan-out) waits for this panel
+Panel = namedtuple('Panel', ['title', 'build', 'timeout'])
+
+
+# --------------------------
+# DATA (cached per range)
+# --------------------------
+
+def _sales(start_date, end_date):
+    return cached_panel('sales', start_date, end_date, lambda: get_sales_data(start_date, end_date))
+
+
+def _clusters(start_date, end_date):
+    return cached_panel('clusters', start_date, end_date, lambda: get_customer_clusters(start_date, end_date),
+                        scopes=(SALES_SCOPE, SEGMENTS_SCOPE))
+
+
+# --------------------------
+# PANEL BUILDERS
+# --------------------------
+
+def build_summary(start_date, end_date):
+    return {'summary': _sales(start_date, end_date)['summary']}
+
+
+def build_product_chart(start_date, end_date):
+    import plotly.graph_objs as go
+
+    data = _sales(start_date, end_date)
+    chart = go.Figure(data=[
+        go.Bar(x=data['product_chart']['labels'], y=data['product_chart']['revenue'],
+               marker_color='rgba(236, 72, 153, 0.8)')
+    ])
+    chart.update_layout(title='Product Revenue', margin=dict(t=30))
+    return {'figures': {'product-chart': chart}}
+
+
+def build_booking_chart(start_date, end_date):
+    import plotly.graph_objs as go
+
+    data = _sales(start_date, end_date)
+    chart = go.Figure(data=[
+        go.Pie(labels=data['booking_chart']['labels'], values=data['booking_chart']['revenue'], hole=0.4)
+    ])
+    chart.update_layout(title='Booking Revenue')
+    return {'figures': {'booking-chart': chart}}
+
+
+def build_clusters(start_date, end_date):
+    import plotly.graph_objs as go
+
+    customer_data = _clusters(start_date, end_date)
+    if not customer_data['names']:
+        return {'figures': {}}
+
+    customer_pie = go.Figure(data=[
+        go.Pie(labels=customer_data['names'], values=customer_data['revenue'], hole=0.4)
+    ])
+    customer_pie.update_layout(title='Top Customer Revenue Share')
+
+    visit_bar = go.Figure(data=[
+        go.Bar(x=customer_data['names'], y=customer_data['visits'], marker_color='rgba(139, 92, 246, 0.8)')
+    ])
+    visit_bar.update_layout(title='Customer Visit Frequency', margin=dict(t=30))
+    return {'figures': {'customer-pie': customer_pie, 'visit-bar': visit_bar}}
+
+
+def build_segments(start_date, end_date):
+    segments = cached_panel('segments', start_date, end_date, lambda: get_customer_segments(start_date, end_date),
+                            scopes=(SALES_SCOPE, SEGMENTS_SCOPE))
+    return {'rows': [
+        {
+            'name': seg['name'],
+            'email': seg['email'],
+            'order_count': seg['order_count'],
+            'booking_count': seg['booking_count'],
+            'total_spent': seg['total_spent'],
+            'last_activity': seg['last_activity'],
+        }
+        for seg in segments
+    ]}
+
+
+def build_cohorts(start_date, end_date):
+    import plotly.graph_objs as go
+
+    # Cached per whole month: ranges within the same months share one entry. Cohorts are built
+    # from all history up to the end month, so any sales change invalidates them
+    first_day, last_day = month_bounds(to_business_date(start_date), to_business_date(end_date))
+    data = cached_panel('cohorts', first_day, last_day, lambda: get_cohort_retention(start_date, end_date),
+                        scopes=(SALES_HISTORY_SCOPE,))
+    cohorts = data['cohorts']
+    if not cohorts:
+        return {'figures': {}}
+
+    width = max(len(c['retention']) for c in cohorts)
+    z = [c['retention'] + [None] * (width - len(c['retention'])) for c in cohorts]
+    heatmap = go.Figure(data=[go.Heatmap(
+        z=z,
+        x=[f"Month {offset}" for offset in range(width)],
+        y=[f"{c['month']} ({c['size']})" for c in cohorts],
+        text=[[f"{value}%" if value is not None else "" for value in row] for row in z],
+        texttemplate='%{text}',
+        colorscale='RdPu', zmin=0, zmax=100,
+        hovertemplate='%{y}<br>%{x}: %{z}% active<extra></extra>',
+    )])
+    heatmap.update_layout(title='Monthly Retention by First-Purchase Cohort',
+                          yaxis=dict(autorange='reversed', type='category'), margin=dict(t=40))
+    return {'figures': {'cohort-heatmap': heatmap}}
+
+
+def build_booking_demand(start_date, end_date):
+    import plotly.graph_objs as go
+
+    # Cached per whole month, like the cohorts
+    first_day, last_day = month_bounds(to_business_date(start_date), to_business_date(end_date))
+    data = cached_panel('booking_demand', first_day, last_day, lambda: get_booking_demand(start_date, end_date))
+    if not data['total']:
+        return {'figures': {}, 'rows': []}
+
+    # One heatmap per view; the dropdown switches which one is visible
+    views = [('All bookings (% of staff slots booked)', data['total'], data['utilization'])]
+    views += [(f"Service: {s['name']}", s['matrix'], None) for s in data['services']]
+    views += [(f"Staff: {m['name']}", m['matrix'], None) for m in data['staff']]
+
+    heatmap = go.Figure()
+    for index, (label, matrix, utilization) in enumerate(views):
+        text = [[f"{value}%" for value in row] for row in utilization] if utilization else matrix
+        heatmap.add_trace(go.Heatmap(
+            z=matrix, x=data['slots'], y=data['weekdays'], text=text, texttemplate='%{text}',
+            colorscale='RdPu', visible=index == 0, name=label,
+            hovertemplate='%{y} %{x}: %{z} bookings<extra></extra>',
+        ))
+    heatmap.update_layout(
+        title='Bookings by Weekday and Slot',
+        yaxis=dict(autorange='reversed', type='category'),
+        xaxis=dict(type='category'),
+        margin=dict(t=60),
+        updatemenus=[dict(
+            x=1, xanchor='right', y=1.15, yanchor='top',
+            buttons=[
+                dict(label=label, method='update', args=[{'visible': [i == index for i in range(len(views))]}])
+                for index, (label, _, _) in enumerate(views)
+            ],
+        )],
+    )
+    rows = [{key: member[key] for key in ('name', 'bookings', 'available', 'utilization')} for member in data['staff']]
+    return {'figures': {'booking-demand-heatmap': heatmap}, 'rows': rows}
+
+
+def _iso_days(dates):
+    return [str(day) for day in dates.astype('datetime64[D]')]
+
+
+def _rounded(values):
+    return [round(float(value), 2) for value in values]
+
+
+def _compact_counts_chart(df, title, color, resolution):
+    """
+    Compact chart spec (title + traces of x/y lists) instead of a full Plotly figure.
+    Actual counts are averaged per day over each bucket so they stay comparable
+    to the daily forecast drawn after them.
+    """
+    from nail_ecommerce_project.apps.analytics.downsampling import downsample_series
+
+    actual = df[df['kind'] == 'actual']
+    forecast = df[df['kind'] == 'forecast']
+    traces = []
+    if not actual.empty:
+        dates, counts = downsample_series(actual['date'].to_numpy(dtype='datetime64[D]'),
+                                          actual['count'].to_numpy(dtype=float), resolution, how='mean')
+        traces.append({'type': 'line', 'name': title.split()[-1], 'color': color,
+                       'x': _iso_days(dates), 'y': _rounded(counts)})
+    if not forecast.empty:
+        dates = forecast['date'].to_numpy(dtype='datetime64[D]')
+        traces.append({'type': 'band', 'name': '95% interval', 'x': _iso_days(dates),
+                       'lower': _rounded(forecast['lower']), 'upper': _rounded(forecast['upper'])})
+        traces.append({'type': 'forecast', 'name': 'Forecast', 'color': color,
+                       'x': _iso_days(dates), 'y': _rounded(forecast['count'])})
+    if resolution != 'day':
+        title = f"{title} ({resolution}ly average)"
+    return {'title': title, 'traces': traces}
+
+
+def _compact_revenue_chart(df, start_day, end_day, resolution):
+    from nail_ecommerce_project.apps.analytics.downsampling import downsample_series, fill_daily
+
+    traces = []
+    for kind, color in (('Orders', 'rgba(236, 72, 153, 0.9)'), ('Bookings', 'rgba(139, 92, 246, 0.9)')):
+        rows = df[df['type'] == kind]
+        if rows.empty:
+            continue
+        dates, revenue = fill_daily(rows['date'].to_numpy(dtype='datetime64[D]'),
+                                    rows['revenue'].to_numpy(dtype=float), start_day, end_day)
+        dates, revenue = downsample_series(dates, revenue, resolution, how='sum')
+        traces.append({'type': 'line', 'name': kind, 'color': color,
+                       'x': _iso_days(dates), 'y': _rounded(revenue)})
+    title = 'Revenue Over Time' if resolution == 'day' else f"Revenue Over Time ({resolution}ly)"
+    return {'title': title, 'traces': traces}
+
+
+def build_forecast(start_date, end_date):
+    from nail_ecommerce_project.apps.analytics.downsampling import choose_resolution
+
+    start_day, end_day = to_business_date(start_date), to_business_date(end_date)
+    resolution = choose_resolution(start_day, end_day)
+
+    order_df, booking_df = cached_panel('time_series', start_date, end_date,
+                                        lambda: get_time_series_forecast(start_date, end_date))
+    charts = {
+        'forecast-order': _compact_counts_chart(order_df, 'Daily Product Orders', 'rgba(236, 72, 153, 0.9)',
+                                                resolution),
+        'forecast-booking': _compact_counts_chart(booking_df, 'Daily Service Bookings', 'rgba(139, 92, 246, 0.9)',
+                                                  resolution),
+    }
+
+    df = cached_panel('forecast', start_date, end_date, lambda: get_forecast_data(start_date, end_date))
+    if not df.empty:
+        charts['forecast-chart'] = _compact_revenue_chart(df, start_day, end_day, resolution)
+    return {'resolution': resolution, 'charts': charts}
+
+
+def build_anomalies(start_date, end_date):
+    # Stored once per closed day by the nightly scan; a small indexed read, not worth caching
+    return {'rows': get_revenue_anomalies(start_date, end_date)}
+
+
+def build_comparison(start_date, end_date):
+    import plotly.graph_objs as go
+
+    comparison_data = cached_panel('comparison', start_date, end_date,
+                                   lambda: get_top_products_vs_services(start_date, end_date))
+    chart = go.Figure()
+    chart.add_trace(go.Bar(
+        x=comparison_data['product']['labels'],
+        y=comparison_data['product']['revenue'],
+        name='Products',
+        marker_color='rgba(236, 72, 153, 0.9)'
+    ))
+    chart.add_trace(go.Bar(
+        x=comparison_data['service']['labels'],
+        y=comparison_data['service']['revenue'],
+        name='Services',
+        marker_color='rgba(34, 197, 94, 0.8)'
+    ))
+    chart.update_layout(barmode='group', title='Top 5 Products vs Services Revenue')
+    return {'figures': {'product-service-comparison': chart}}
+
+
+def build_low_stock(start_date, end_date):
+    rows = cached_panel('low_stock', start_date, end_date, get_low_stock_products, scopes=(INVENTORY_SCOPE,))
+    return {'rows': rows}
+
+
+def build_restock(start_date, end_date):
+    # Demand is refreshed nightly, stock on every variant save: both bump the inventory scope
+    rows = cached_panel('restock', start_date, end_date, get_restock_suggestions, scopes=(INVENTORY_SCOPE,))
+    return {'rows': rows}
+
+
+PANELS = {
+    'summary': Panel('Sales Summary', build_summary, 10),
+    'product_chart': Panel('Product Revenue', build_product_chart, 10),
+    'booking_chart': Panel('Booking Revenue', build_booking_chart, 10),
+    'clusters': Panel('Customer Behavior Insights', build_clusters, 30),
+    'segments': Panel('Customer Segmentation', build_segments, 20),
+    'cohorts': Panel('Cohort Retention', build_cohorts, 20),
+    'booking_demand': Panel('Booking Demand & Staff Utilization', build_booking_demand, 20),
+    'forecast': Panel('Sales Forecasting', build_forecast, 20),
+    'anomalies': Panel('Revenue Anomalies', build_anomalies, 10),
+    'comparison': Panel('Top Products vs Services', build_comparison, 10),
+    'low_stock': Panel('Low Stock', build_low_stock, 10),
+    'restock': Panel('Restock Planner', build_restock, 10),
+}
+
+
+# --------------------------
+# COMPUTATION
+# --------------------------
+
+def compute_panel(name, start_date, end_date):
+    """
+    Returns {'panel', 'data', 'error', 'duration_ms'} for one panel; failures are
+    contained so a broken panel never takes the others down with it.
+    """
+    started = time.perf_counter()
+    try:
+        data, error = PANELS[name].build(start_date, end_date), None
+    except Exception as e:
+        logger.exception(f"[compute_panel] Panel '{name}' failed: {e}")
+        data, error = None, 'Failed to load this panel.'
+    return {
+        'panel': name,
+        'data': data,
+        'error': error,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _compute_in_thread(name, start_date, end_date):
+    try:
+        return compute_panel(name, start_date, end_date)
+    finally:
+        # Worker threads get their own DB connections; don't leak them
+        connections.close_all()
+
+
+def compute_panels(start_date, end_date, names=None):
+    """
+    Computes several panels concurrently (ANALYTICS_PANEL_WORKERS threads).
+    Panels that miss their timeout are reported as errors instead of blocking the response.
+    """
+    names = list(names or PANELS)
+    workers = getattr(settings, 'ANALYTICS_PANEL_WORKERS', 4)
+
+    # Worker connections can't see uncommitted writes of an open transaction
+    if workers <= 1 or len(names) <= 1 or connection.in_atomic_block:
+        return {name: compute_panel(name, start_date, end_date) for name in names}
+
+    close_old_connections()
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(names)), thread_name_prefix='analytics-panel')
+    started = time.monotonic()
+    futures = {name: executor.submit(_compute_in_thread, name, start_date, end_date) for name in names}
+
+    # Each panel gets its own deadline, measured from submission
+    finished = {}
+    for name in sorted(names, key=lambda n: PANELS[n].timeout):
+        remaining = max(0, started + PANELS[name].timeout - time.monotonic())
+        try:
+            finished[name] = futures[name].result(timeout=remaining)
+        except FutureTimeout:
+            logger.warning(f"[compute_panels] Panel '{name}' timed out")
+            finished[name] = {'panel': name, 'data': None, 'error': 'Timed out.', 'duration_ms': None}
+    executor.shutdown(wait=False, cancel_futures=True)
+    return {name: finished[name] for name in names}
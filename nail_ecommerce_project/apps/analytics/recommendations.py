@@ -0,0 +1,176 @@
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.models import ProductRecommendation
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+from nail_ecommerce_project.apps.products.models import Product
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# "Frequently bought together": a product x product matrix counting the orders that contain both,
+# kept as a scipy.sparse .npz next to a watermark (the last order folded in). Each run adds only
+# the orders created since; the top-K neighbours of every product those orders touched are then
+# rewritten to ProductRecommendation, which the product page reads with one indexed query.
+# NumPy / SciPy are imported inside the functions so product views stay cheap to import.
+
+RECOMMENDATIONS_VERSION = 1
+ORDER_CHUNK_SIZE = 20000
+
+
+def recommendations_dir():
+    return Path(settings.ANALYTICS_ARTIFACT_DIR) / 'recommendations'
+
+
+def _matrix_path():
+    return recommendations_dir() / 'co_purchases.npz'
+
+
+def _meta_path():
+    return recommendations_dir() / 'meta.json'
+
+
+def read_meta():
+    try:
+        meta = json.loads(_meta_path().read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if meta.get('version') != RECOMMENDATIONS_VERSION or not _matrix_path().exists():
+        return None
+    return meta
+
+
+def _load_matrix(size):
+    from scipy import sparse
+
+    matrix = sparse.load_npz(_matrix_path()).tocsr()
+    if matrix.shape[0] < size:
+        matrix.resize((size, size))
+    return matrix
+
+
+def _save(matrix, watermark):
+    from scipy import sparse
+
+    recommendations_dir().mkdir(parents=True, exist_ok=True)
+    # np.savez appends .npz to names without it
+    tmp_matrix = _matrix_path().with_name('co_purchases.tmp.npz')
+    sparse.save_npz(tmp_matrix, matrix)
+    os.replace(tmp_matrix, _matrix_path())
+
+    tmp_meta = _meta_path().with_suffix('.tmp')
+    tmp_meta.write_text(json.dumps({
+        'version': RECOMMENDATIONS_VERSION,
+        'watermark': watermark,
+        'products': matrix.shape[0],
+        'updated_at': timezone.now().isoformat(),
+    }))
+    os.replace(tmp_meta, _meta_path())
+
+
+def _co_purchase_counts(order_ids, size):
+    """
+    Co-occurrence counts (products x products, zero diagonal) for the given orders.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    pairs = list(
+        OrderItem.objects
+        .filter(order_id__in=order_ids, product_variant__product_id__lt=size)
+        .values_list('order_id', 'product_variant__product_id')
+        .distinct()
+        .order_by()
+    )
+    if not pairs:
+        return sparse.csr_matrix((size, size), dtype=np.int32)
+
+    orders, products = np.array(pairs, dtype=np.int64).T
+    _, rows = np.unique(orders, return_inverse=True)
+    # Orders x products incidence matrix; B.T @ B counts the orders containing each pair
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, products)), shape=(rows.max() + 1, size)
+    )
+    counts = (incidence.T @ incidence).tocsr()
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return counts
+
+
+def _top_neighbours(matrix, product_id, top_k):
+    import numpy as np
+
+    start, end = matrix.indptr[product_id], matrix.indptr[product_id + 1]
+    neighbours, scores = matrix.indices[start:end], matrix.data[start:end]
+    # Highest count first, lower product id breaks ties
+    order = np.lexsort((neighbours, -scores))[:top_k]
+    return [(int(neighbours[i]), int(scores[i])) for i in order]
+
+
+def _write_recommendations(matrix, product_ids, top_k):
+    # Rows of deleted products linger in the matrix; never recommend them
+    existing = set(Product.objects.values_list('id', flat=True))
+    rows = []
+    for product_id in (p for p in product_ids if p in existing):
+        neighbours = [(n, score) for n, score in _top_neighbours(matrix, product_id, top_k * 2) if n in existing]
+        rows.extend(
+            ProductRecommendation(product_id=product_id, recommended_id=recommended_id, score=score, rank=rank)
+            for rank, (recommended_id, score) in enumerate(neighbours[:top_k], start=1)
+        )
+
+    with transaction.atomic():
+        ProductRecommendation.objects.filter(product_id__in=product_ids).delete()
+        ProductRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild_recommendations(full=False, top_k=None):
+    """
+    Folds orders created since the last run into the co-purchase matrix and refreshes the
+    recommendations of the products they contain (`full` recounts every order). Orders already
+    cancelled are skipped (later cancellations stay counted until a full rebuild); orders younger
+    than ANALYTICS_RECOMMENDATIONS_SETTLE_SECONDS wait for the next run so their items are complete.
+    Returns {'orders', 'products', 'recommendations', 'watermark'}.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    top_k = top_k or settings.ANALYTICS_RECOMMENDATIONS_TOP_K
+    size = (Product.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+    meta = None if full else read_meta()
+    watermark = meta['watermark'] if meta else 0
+    matrix = _load_matrix(size) if meta else sparse.csr_matrix((size, size), dtype=np.int32)
+    size = matrix.shape[0]
+
+    settle = timedelta(seconds=settings.ANALYTICS_RECOMMENDATIONS_SETTLE_SECONDS)
+    order_ids = list(
+        Order.objects
+        .filter(id__gt=watermark, created_at__lte=timezone.now() - settle)
+        .exclude(status='CANCELLED')
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+
+    touched = set()
+    for offset in range(0, len(order_ids), ORDER_CHUNK_SIZE):
+        counts = _co_purchase_counts(order_ids[offset:offset + ORDER_CHUNK_SIZE], size)
+        touched.update(np.flatnonzero(np.diff(counts.indptr)).tolist())
+        matrix = matrix + counts
+
+    if order_ids:
+        watermark = order_ids[-1]
+    if full:
+        ProductRecommendation.objects.all().delete()
+    written = _write_recommendations(matrix, sorted(touched), top_k) if touched else 0
+    _save(matrix.tocsr(), watermark)
+
+    logger.info(f"[rebuild_recommendations] {len(order_ids)} new orders, {len(touched)} products refreshed, "
+                f"{written} recommendations (watermark {watermark})")
+    return {'orders': len(order_ids), 'products': len(touched), 'recommendations': written, 'watermark': watermark}
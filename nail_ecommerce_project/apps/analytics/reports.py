@@ -0,0 +1,137 @@
+import io
+import json
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.exports import write_sales_summary_csv
+from nail_ecommerce_project.apps.analytics.models import ReportLog
+from nail_ecommerce_project.apps.analytics.panels import PANELS, compute_panel
+from nail_ecommerce_project.apps.analytics.tasks import run_report_task
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+def runs_in_background(start_day, end_day):
+    """
+    Ranges longer than ANALYTICS_ASYNC_THRESHOLD_DAYS are computed by a background job.
+    """
+    threshold = getattr(settings, 'ANALYTICS_ASYNC_THRESHOLD_DAYS', 92)
+    return (end_day - start_day).days + 1 > threshold
+
+
+def _range_bounds(report):
+    start_day = date.fromisoformat(report.parameters['start_day'])
+    end_day = date.fromisoformat(report.parameters['end_day'])
+    return (
+        make_business_aware(datetime.combine(start_day, dt_time.min)),
+        make_business_aware(datetime.combine(end_day, dt_time.max)),
+    )
+
+
+# --------------------------
+# BUILDERS (report -> text written to f)
+# --------------------------
+
+def build_dashboard_report(report, f):
+    import plotly
+
+    start_date, end_date = _range_bounds(report)
+    # No per-panel timeouts here: long ranges are exactly what the job is for
+    panels = {name: compute_panel(name, start_date, end_date) for name in PANELS}
+    json.dump({'panels': panels}, f, cls=plotly.utils.PlotlyJSONEncoder)
+    failed = [name for name, result in panels.items() if result['error']]
+    return f"{len(panels) - len(failed)} of {len(panels)} panels computed" + (f"; failed: {failed}" if failed else "")
+
+
+def build_sales_csv(report, f):
+    start_date, end_date = _range_bounds(report)
+    rows = write_sales_summary_csv(f, start_date, end_date)
+    return f"{rows} rows"
+
+
+# kind -> (builder, file extension, content type)
+REPORT_KINDS = {
+    'dashboard': (build_dashboard_report, 'json', 'application/json'),
+    'sales_csv': (build_sales_csv, 'csv', 'text/csv'),
+}
+
+
+# --------------------------
+# JOBS
+# --------------------------
+
+def find_recent_report(kind, start_day, end_day):
+    """
+    A job for the same report submitted within ANALYTICS_CACHE_TTL that is still running or
+    succeeded, so reloading the page doesn't queue the same work again.
+    """
+    since = timezone.now() - timedelta(seconds=settings.ANALYTICS_CACHE_TTL)
+    return (
+        ReportLog.objects
+        .filter(created_at__gte=since, parameters__kind=kind,
+                parameters__start_day=start_day.isoformat(), parameters__end_day=end_day.isoformat())
+        .exclude(status=ReportLog.STATUS_FAILED)
+        .order_by('-created_at')
+        .first()
+    )
+
+
+def submit_report(user, report_type, kind, start_day, end_day):
+    """
+    Records a PENDING ReportLog and queues it once the surrounding transaction commits.
+    Returns the recent equivalent job instead when there is one.
+    """
+    recent = find_recent_report(kind, start_day, end_day)
+    if recent:
+        logger.info(f"[submit_report] Reusing report {recent.pk} ({kind}, {start_day} → {end_day})")
+        return recent
+
+    report = ReportLog.objects.create(
+        user=user,
+        report_type=report_type,
+        status=ReportLog.STATUS_PENDING,
+        parameters={'kind': kind, 'start_day': start_day.isoformat(), 'end_day': end_day.isoformat()},
+        notes=f"Background {kind} report for {start_day} to {end_day}",
+    )
+    transaction.on_commit(lambda: run_report_task.delay(report.pk))
+    logger.info(f"[submit_report] Queued report {report.pk} ({kind}, {start_day} → {end_day})")
+    return report
+
+
+def run_report(report_id):
+    """
+    Executes a queued report and stores its result and outcome on the ReportLog.
+    """
+    claimed = ReportLog.objects.filter(pk=report_id, status=ReportLog.STATUS_PENDING).update(
+        status=ReportLog.STATUS_RUNNING, started_at=timezone.now()
+    )
+    if not claimed:
+        logger.warning(f"[run_report] Report {report_id} is not pending, skipping")
+        return None
+
+    report = ReportLog.objects.get(pk=report_id)
+    kind = report.parameters.get('kind')
+    started = time.perf_counter()
+    try:
+        builder, _, _ = REPORT_KINDS[kind]
+        buffer = io.StringIO(newline='')
+        summary = builder(report, buffer)
+
+        report.status = ReportLog.STATUS_SUCCESS
+        report.result_data = buffer.getvalue().encode('utf-8')
+        report.notes = f"{report.notes} ({summary})"
+    except Exception as e:
+        logger.exception(f"[run_report] Report {report_id} ({kind}) failed: {e}")
+        report.status = ReportLog.STATUS_FAILED
+        report.error_message = str(e)
+
+    report.finished_at = timezone.now()
+    report.duration_ms = int((time.perf_counter() - started) * 1000)
+    report.save(update_fields=['status', 'result_data', 'notes', 'error_message', 'finished_at', 'duration_ms'])
+    logger.info(f"[run_report] Report {report_id} finished with {report.status} in {report.duration_ms} ms")
+    return report
@@ -0,0 +1,156 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.cache import INVENTORY_SCOPE, bump_version
+from nail_ecommerce_project.apps.analytics.dates import get_business_timezone, make_business_aware, \
+    to_business_date
+from nail_ecommerce_project.apps.analytics.models import RestockSuggestion
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+from nail_ecommerce_project.apps.products.models import ProductVariant
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Restock planner: units sold per variant per day over the last ANALYTICS_RESTOCK_HISTORY_DAYS
+# closed days, pulled in one grouped query and laid out as a variants x days matrix. Its row
+# mean is the daily demand and its row spread sizes the safety stock:
+#   reorder point = demand x lead time + safety stock
+#   target stock  = demand x (lead time + cover days) + safety stock
+# Stock at or below the reorder point should be topped back up to the target.
+
+# Safety stock covers ~95% of lead-time demand for normally distributed daily sales
+SAFETY_Z = 1.65
+SUGGESTION_BATCH_SIZE = 1000
+
+
+def _daily_units(variant_ids, start_day, end_day):
+    """
+    Units sold per variant (rows, in variant_ids order) per business day start_day..end_day.
+    Cancelled orders don't count.
+    """
+    import numpy as np
+
+    days = (end_day - start_day).days + 1
+    matrix = np.zeros((len(variant_ids), days))
+    rows = list(
+        OrderItem.objects
+        .filter(order__created_at__range=(
+            make_business_aware(datetime.combine(start_day, time.min)),
+            make_business_aware(datetime.combine(end_day, time.max)),
+        ))
+        .exclude(order__status='CANCELLED')
+        .annotate(day=TruncDate('order__created_at', tzinfo=get_business_timezone()))
+        .values('product_variant_id', 'day')
+        .annotate(units=Sum('quantity'))
+        .order_by()
+        .values_list('product_variant_id', 'day', 'units')
+    )
+    if not rows:
+        return matrix
+
+    variants, sale_days, units = zip(*rows)
+    row_index = np.searchsorted(variant_ids, np.array(variants))
+    column_index = np.array([day.toordinal() for day in sale_days]) - start_day.toordinal()
+    np.add.at(matrix, (row_index, column_index), np.array(units, dtype=float))
+    return matrix
+
+
+def plan_restock(units, stock, lead_days, cover_days):
+    """
+    Vectorized over variants: units is the variants x days sales matrix, stock the current
+    stock per variant. Returns (daily_demand, reorder_point, target_stock, reorder_quantity).
+    """
+    import numpy as np
+
+    demand = units.mean(axis=1)
+    safety_stock = SAFETY_Z * units.std(axis=1) * np.sqrt(lead_days)
+    reorder_point = np.ceil(demand * lead_days + safety_stock)
+    target_stock = np.ceil(demand * (lead_days + cover_days) + safety_stock)
+
+    due = (demand > 0) & (stock <= reorder_point)
+    reorder_quantity = np.where(due, np.maximum(target_stock - stock, 0), 0)
+    return demand, reorder_point, target_stock, reorder_quantity
+
+
+def refresh_restock_suggestions(end_day=None):
+    """
+    Recomputes the RestockSuggestion of every variant from the history ending on end_day
+    (default: yesterday). A shop younger than the history window is averaged over the days
+    it has traded. Returns {'variants', 'reorder', 'history_days', 'end_day'}.
+    """
+    import numpy as np
+
+    end_day = end_day or to_business_date(timezone.now()) - timedelta(days=1)
+    lead_days = settings.ANALYTICS_RESTOCK_LEAD_DAYS
+    cover_days = settings.ANALYTICS_RESTOCK_COVER_DAYS
+
+    start_day = end_day - timedelta(days=settings.ANALYTICS_RESTOCK_HISTORY_DAYS - 1)
+    first_order = Order.objects.exclude(status='CANCELLED').aggregate(first=Min('created_at'))['first']
+    if first_order is not None:
+        start_day = min(max(start_day, to_business_date(first_order)), end_day)
+    history_days = (end_day - start_day).days + 1
+
+    variants = list(ProductVariant.objects.order_by('id').values_list('id', 'stock_quantity'))
+    if not variants:
+        return {'variants': 0, 'reorder': 0, 'history_days': history_days, 'end_day': end_day}
+    variant_ids, stock = (np.array(column) for column in zip(*variants))
+
+    units = _daily_units(variant_ids, start_day, end_day)
+    demand, reorder_point, target_stock, reorder_quantity = plan_restock(units, stock, lead_days, cover_days)
+
+    suggestions = [
+        RestockSuggestion(
+            variant_id=int(variant_id),
+            daily_demand=round(float(demand[i]), 4),
+            reorder_point=int(reorder_point[i]),
+            target_stock=int(target_stock[i]),
+            history_days=history_days,
+        )
+        for i, variant_id in enumerate(variant_ids)
+    ]
+    RestockSuggestion.objects.bulk_create(
+        suggestions,
+        batch_size=SUGGESTION_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['variant'],
+        update_fields=['daily_demand', 'reorder_point', 'target_stock', 'history_days', 'computed_at'],
+    )
+    bump_version(INVENTORY_SCOPE)
+
+    reorder = int(np.count_nonzero(reorder_quantity))
+    logger.info(f"[refresh_restock_suggestions] {len(suggestions)} variants over {history_days} days "
+                f"to {end_day}: {reorder} to reorder")
+    return {'variants': len(suggestions), 'reorder': reorder, 'history_days': history_days, 'end_day': end_day}
+
+
+def restock_queue():
+    """
+    Suggestions of variants at or below their reorder point, the soonest to sell out first.
+    """
+    return (
+        RestockSuggestion.objects
+        .needing_reorder()
+        .with_cover()
+        .select_related('variant__product')
+        .order_by('cover', 'variant__product__name')
+    )
+
+
+def get_restock_suggestions(limit=20):
+    rows = []
+    for suggestion in restock_queue()[:limit]:
+        variant = suggestion.variant
+        rows.append({
+            'product__name': variant.product.name,
+            'size': variant.size,
+            'color': variant.color,
+            'stock_quantity': variant.stock_quantity,
+            'daily_demand': round(suggestion.daily_demand, 2),
+            'days_of_cover': suggestion.days_of_cover,
+            'reorder_quantity': suggestion.reorder_quantity,
+        })
+    return rows
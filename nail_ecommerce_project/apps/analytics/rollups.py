@@ -0,0 +1,158 @@
+import threading
+from datetime import date
+from decimal import Decimal
+
+from django.db import DatabaseError, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+
+from nail_ecommerce_project.apps.analytics.dates import business_day_bounds, get_business_timezone
+from nail_ecommerce_project.apps.analytics.models import DailyProductSales, DailyServiceSales
+from nail_ecommerce_project.apps.analytics.snapshot import mark_days_dirty
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import OrderItem
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+LINE_REVENUE = ExpressionWrapper(
+    F('quantity') * F('price_at_order'), output_field=DecimalField(max_digits=12, decimal_places=2)
+)
+
+_pending = threading.local()
+
+
+def rebuild_product_sales(start_day, end_day):
+    """
+    Recomputes DailyProductSales rows for every business-local day in start_day..end_day.
+    """
+    start, end = business_day_bounds(start_day, end_day)
+    rows = (
+        OrderItem.objects
+        .filter(order__created_at__gte=start, order__created_at__lt=end)
+        .annotate(day=TruncDate('order__created_at', tzinfo=get_business_timezone()))
+        .values('day', 'product_variant__product_id', 'order__status')
+        .annotate(
+            units=Sum('quantity'),
+            revenue=Sum(LINE_REVENUE),
+            order_count=Count('order_id', distinct=True),
+        )
+        .order_by()
+    )
+
+    rollups = [
+        DailyProductSales(
+            day=row['day'],
+            product_id=row['product_variant__product_id'],
+            status=row['order__status'],
+            units=row['units'] or 0,
+            revenue=row['revenue'] or Decimal('0.00'),
+            order_count=row['order_count'],
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        DailyProductSales.objects.filter(day__range=(start_day, end_day)).delete()
+        DailyProductSales.objects.bulk_create(rollups)
+
+    logger.debug(f"[rebuild_product_sales] {start_day} → {end_day}: {len(rollups)} rows")
+    return len(rollups)
+
+
+def rebuild_service_sales(start_day, end_day):
+    """
+    Recomputes DailyServiceSales rows for every service date in start_day..end_day.
+    """
+    rows = (
+        Booking.objects
+        .filter(date__range=(start_day, end_day))
+        .with_final_price()
+        .values('date', 'service_id', 'status')
+        .annotate(
+            bookings=Count('id'),
+            customers=Sum('number_of_customers'),
+            revenue=Sum('final_price'),
+        )
+        .order_by()
+    )
+
+    rollups = [
+        DailyServiceSales(
+            day=row['date'],
+            service_id=row['service_id'],
+            status=row['status'],
+            bookings=row['bookings'],
+            customers=row['customers'] or 0,
+            revenue=row['revenue'] or Decimal('0.00'),
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        DailyServiceSales.objects.filter(day__range=(start_day, end_day)).delete()
+        DailyServiceSales.objects.bulk_create(rollups)
+
+    logger.debug(f"[rebuild_service_sales] {start_day} → {end_day}: {len(rollups)} rows")
+    return len(rollups)
+
+
+# ---------------------------------------------------------------------------
+# Incremental refresh: model signals mark days dirty, one flush per commit
+# ---------------------------------------------------------------------------
+
+def _pending_days():
+    if not hasattr(_pending, 'days'):
+        _pending.days = {'product': set(), 'service': set()}
+    return _pending.days
+
+
+def mark_product_day_dirty(day):
+    _schedule('product', day)
+
+
+def mark_service_day_dirty(day):
+    _schedule('service', day)
+
+
+def _schedule(kind, day):
+    if day is None:
+        return
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    _pending_days()[kind].add(day)
+    if not _flush_queued():
+        _pending.flush_queued = True
+        transaction.on_commit(flush_dirty_days)
+
+
+def _flush_queued():
+    """
+    Whether this transaction already has a flush queued: one flush covers every day marked
+    before the commit. The flag alone isn't trusted, since a rollback drops the queued
+    callback without running it.
+    """
+    if not getattr(_pending, 'flush_queued', False):
+        return False
+    return any(callback[1] is flush_dirty_days for callback in transaction.get_connection().run_on_commit)
+
+
+def flush_dirty_days():
+    _pending.flush_queued = False
+    pending = _pending_days()
+    product_days, pending['product'] = pending['product'], set()
+    service_days, pending['service'] = pending['service'], set()
+
+    try:
+        for day in sorted(product_days):
+            rebuild_product_sales(day, day)
+        for day in sorted(service_days):
+            rebuild_service_sales(day, day)
+    except Exception as e:
+        logger.error(f"[Analytics] Rollup refresh failed for {product_days | service_days}: {e}")
+
+    # Snapshotted copies of these days are stale now; readers use the rollups until the next build
+    try:
+        mark_days_dirty(product_days | service_days)
+    except DatabaseError as e:
+        logger.error(f"[Analytics] Could not mark snapshot days dirty: {e}")
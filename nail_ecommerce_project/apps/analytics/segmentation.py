@@ -0,0 +1,230 @@
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.cache import SEGMENTS_SCOPE, bump_version
+from nail_ecommerce_project.apps.analytics.models import CustomerSegment, ReportLog
+from nail_ecommerce_project.apps.analytics.utils import CLUSTER_FEATURES, get_customer_feature_frame
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# joblib / NumPy / scikit-learn are imported lazily: signals import this module at
+# startup for mark_customer_stale(), which must not drag the ML stack into every worker.
+
+MODEL_FILENAME = 'customer_segments.joblib'
+N_CLUSTERS = 3
+
+_model_cache = {'key': None, 'model': None}
+_model_lock = threading.Lock()
+_pending = threading.local()
+
+
+def get_model_path():
+    return Path(settings.ANALYTICS_ARTIFACT_DIR) / MODEL_FILENAME
+
+
+def load_segment_model():
+    """
+    Returns the persisted {'scaler', 'kmeans', 'version', ...} artifact, or None if not fitted yet.
+    The artifact is cached per process and reloaded when the file changes.
+    """
+    path = get_model_path()
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+    with _model_lock:
+        if _model_cache['key'] != key:
+            import joblib
+
+            _model_cache['model'] = joblib.load(path)
+            _model_cache['key'] = key
+        return _model_cache['model']
+
+
+def save_segment_model(model):
+    import joblib
+
+    path = get_model_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    joblib.dump(model, tmp_path)
+    tmp_path.replace(path)
+
+
+def predict_segments(model, features):
+    """
+    Assigns feature rows (n × len(CLUSTER_FEATURES)) to the nearest stored centroid.
+    """
+    import numpy as np
+
+    scaled = model['scaler'].transform(np.asarray(features, dtype=float))
+    return model['kmeans'].predict(scaled)
+
+
+def fit_segment_model(user=None):
+    """
+    Full refit on every customer's lifetime features; replaces all stored assignments.
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.preprocessing import StandardScaler
+
+    df = get_customer_feature_frame()
+    if df.empty:
+        logger.info("[fit_segment_model] No customer activity, nothing to fit")
+        return None
+
+    features = df[CLUSTER_FEATURES].to_numpy(dtype=float)
+    scaler = StandardScaler().fit(features)
+    kmeans = MiniBatchKMeans(
+        n_clusters=min(N_CLUSTERS, len(features)), random_state=42, n_init=10, batch_size=1024
+    )
+    kmeans.fit(scaler.transform(features))
+
+    model = {
+        'scaler': scaler,
+        'kmeans': kmeans,
+        'version': timezone.now().strftime('%Y%m%d%H%M%S%f'),
+        'fitted_at': timezone.now(),
+        'n_samples': len(features),
+    }
+    save_segment_model(model)
+
+    df['cluster'] = predict_segments(model, features)
+    _store_assignments(df, model['version'])
+    CustomerSegment.objects.exclude(model_version=model['version']).delete()
+
+    ReportLog.objects.create(
+        user=user,
+        report_type='SEGMENT',
+        notes=f"Full segmentation fit on {len(df)} customers (model {model['version']})"
+    )
+    logger.info(f"[fit_segment_model] Fitted {kmeans.n_clusters} segments on {len(df)} customers")
+    return model
+
+
+def refresh_segment_model(user=None):
+    """
+    Incremental refresh: partial-fits the stored centroids on customers whose
+    activity changed since the last run, then re-scores only those customers.
+    """
+    model = load_segment_model()
+    if model is None:
+        return fit_segment_model(user=user)
+
+    stale_ids = list(CustomerSegment.objects.filter(is_stale=True).values_list('user_id', flat=True))
+    if not stale_ids:
+        logger.info("[refresh_segment_model] No stale customers")
+        return model
+
+    df = get_customer_feature_frame(user_ids=stale_ids)
+    if not df.empty:
+        features = df[CLUSTER_FEATURES].to_numpy(dtype=float)
+        model['kmeans'].partial_fit(model['scaler'].transform(features))
+        model['version'] = timezone.now().strftime('%Y%m%d%H%M%S%f')
+        save_segment_model(model)
+
+        df['cluster'] = predict_segments(model, features)
+        _store_assignments(df, model['version'])
+
+    # Customers whose activity disappeared (e.g. deleted orders) drop out of the segmentation
+    active_ids = set(df['user_id'].tolist())
+    CustomerSegment.objects.filter(user_id__in=[uid for uid in stale_ids if uid not in active_ids]).delete()
+
+    ReportLog.objects.create(
+        user=user,
+        report_type='SEGMENT',
+        notes=f"Incremental segmentation refresh for {len(stale_ids)} customers (model {model['version']})"
+    )
+    logger.info(f"[refresh_segment_model] Re-scored {len(df)} of {len(stale_ids)} stale customers")
+    return model
+
+
+def score_customer(user_id):
+    """
+    O(1) scoring of a single customer against the stored centroids (no refit).
+    Returns the CustomerSegment, or None when no model is fitted or the customer has no activity.
+    """
+    model = load_segment_model()
+    if model is None:
+        return None
+
+    df = get_customer_feature_frame(user_ids=[user_id])
+    if df.empty:
+        return None
+
+    df['cluster'] = predict_segments(model, df[CLUSTER_FEATURES].to_numpy(dtype=float))
+    _store_assignments(df, model['version'])
+    return CustomerSegment.objects.get(user_id=user_id)
+
+
+def mark_customer_stale(user_id):
+    """
+    Called on order/booking changes. After commit the customers are handed to a background
+    task (update_customer_segments), so no ML code runs in the checkout or booking request.
+    """
+    if user_id is None:
+        return
+    if not hasattr(_pending, 'user_ids'):
+        _pending.user_ids = set()
+    _pending.user_ids.add(user_id)
+    transaction.on_commit(flush_stale_customers)
+
+
+def flush_stale_customers():
+    from nail_ecommerce_project.apps.analytics.tasks import update_customer_segments_task
+
+    user_ids, _pending.user_ids = getattr(_pending, 'user_ids', set()), set()
+    if not user_ids:
+        return
+    try:
+        update_customer_segments_task.delay(sorted(user_ids))
+    except Exception as e:
+        logger.error(f"[Analytics] Could not queue segment update for users {sorted(user_ids)}: {e}")
+
+
+def update_customer_segments(user_ids):
+    """
+    Existing assignments are flagged for the next refresh; new customers are scored
+    straight away against the stored centroids.
+    """
+    user_ids = set(user_ids)
+    try:
+        known_ids = set(CustomerSegment.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+        CustomerSegment.objects.filter(user_id__in=known_ids).update(is_stale=True)
+        for user_id in user_ids - known_ids:
+            score_customer(user_id)
+    except Exception as e:
+        logger.error(f"[Analytics] Failed to update segments for users {sorted(user_ids)}: {e}")
+
+
+def _store_assignments(df, version):
+    segments = [
+        CustomerSegment(
+            user_id=int(row.user_id),
+            cluster=int(row.cluster),
+            total_value=float(row.total_value),
+            frequency=int(row.frequency),
+            avg_order_value=float(row.avg_order_value),
+            last_activity=row.last_activity,
+            model_version=version,
+            is_stale=False,
+        )
+        for row in df.itertuples(index=False)
+    ]
+    CustomerSegment.objects.bulk_create(
+        segments,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=[
+            'cluster', 'total_value', 'frequency', 'avg_order_value',
+            'last_activity', 'model_version', 'is_stale', 'updated_at',
+        ],
+    )
+    bump_version(SEGMENTS_SCOPE)
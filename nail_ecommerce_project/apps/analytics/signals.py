@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from nail_ecommerce_project.apps.analytics.cache import INVENTORY_SCOPE, SALES_SCOPE, bump_version
+from nail_ecommerce_project.apps.analytics.customer_metrics import mark_metrics_stale
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+from nail_ecommerce_project.apps.analytics.rollups import mark_product_day_dirty, mark_service_day_dirty
+from nail_ecommerce_project.apps.analytics.segmentation import mark_customer_stale
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+from nail_ecommerce_project.apps.products.models import ProductVariant
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _order_info(item):
+    if OrderItem.order.is_cached(item):
+        return item.order.created_at, item.order.user_id
+    # Missing order: it is being deleted and its own post_delete does the refresh
+    return Order.objects.filter(pk=item.order_id).values_list('created_at', 'user_id').first() or (None, None)
+
+
+@receiver([post_save, post_delete], sender=Order)
+def refresh_order_analytics(sender, instance, **kwargs):
+    order_day = to_business_date(instance.created_at)
+    mark_product_day_dirty(order_day)
+    # Metrics first: the segment refresh scores customers from them on the same commit
+    mark_metrics_stale(instance.user_id)
+    mark_customer_stale(instance.user_id)
+    bump_version(SALES_SCOPE, order_day)
+
+
+@receiver([post_save, post_delete], sender=OrderItem)
+def refresh_order_item_analytics(sender, instance, **kwargs):
+    created_at, user_id = _order_info(instance)
+    order_day = to_business_date(created_at)
+    mark_product_day_dirty(order_day)
+    mark_metrics_stale(user_id)
+    mark_customer_stale(user_id)
+    bump_version(SALES_SCOPE, order_day)
+
+
+@receiver(post_init, sender=Booking)
+def remember_booking_date(sender, instance, **kwargs):
+    # __dict__ lookup so deferred loads (.only()) don't trigger a query
+    instance._analytics_original_date = instance.__dict__.get('date')
+
+
+@receiver([post_save, post_delete], sender=Booking)
+def refresh_booking_analytics(sender, instance, **kwargs):
+    original_date = getattr(instance, '_analytics_original_date', None)
+    if original_date and original_date != instance.date:
+        mark_service_day_dirty(original_date)
+        bump_version(SALES_SCOPE, original_date)
+    mark_service_day_dirty(instance.date)
+    instance._analytics_original_date = instance.date
+    mark_metrics_stale(instance.customer_id)
+    mark_customer_stale(instance.customer_id)
+    # Rollups bucket bookings by service date, segment tables by created_at
+    bump_version(SALES_SCOPE, instance.date)
+    bump_version(SALES_SCOPE, to_business_date(instance.created_at))
+
+
+@receiver([post_save, post_delete], sender=ProductVariant)
+def refresh_inventory_analytics(sender, instance, **kwargs):
+    bump_version(INVENTORY_SCOPE)
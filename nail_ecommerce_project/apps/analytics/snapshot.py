@@ -0,0 +1,422 @@
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import business_day_bounds, get_business_timezone, to_business_date
+from nail_ecommerce_project.apps.analytics.models import DailyProductSales, DailyServiceSales, SnapshotDirtyDay
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import OrderItem
+from nail_ecommerce_project.apps.products.models import Product
+from nail_ecommerce_project.apps.services.models import Service
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Columnar copy of closed sales days: one .npy file per column, loaded with mmap_mode='r'.
+# Days after the snapshot's watermark (and days dirtied by later writes) are read from
+# the daily rollups instead, so results always match the rollup-backed queries. Product and
+# service names are looked up when reading, so renames show up straight away.
+#
+# The files live on the local disk of whichever process built them, so dirty days are
+# recorded in the database (SnapshotDirtyDay) where every process sees them, and a process
+# without a local generation reads everything from the rollups.
+# NumPy is imported inside the functions: the rollups import this module at startup.
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_CHUNK_SIZE = 5000
+# Generations kept on disk: the new one plus the previous, which readers that loaded the old
+# meta just before the swap may still be opening
+SNAPSHOT_KEEP_GENERATIONS = 2
+
+# table -> column -> dtype. Amounts are integer paise; product/service/status are dictionary codes.
+TABLES = {
+    'order_lines': {
+        'day': 'datetime64[D]',  # business-local order date
+        'order_id': 'int64',
+        'user_id': 'int64',
+        'product': 'int32',
+        'status': 'uint8',
+        'quantity': 'int32',
+        'amount_paise': 'int64',
+    },
+    'bookings': {
+        'day': 'datetime64[D]',  # service date
+        'booking_id': 'int64',
+        'customer_id': 'int64',
+        'service': 'int32',
+        'status': 'uint8',
+        'customers': 'int32',
+        'amount_paise': 'int64',
+    },
+}
+
+_loaded = {}  # (generation, table) -> {column: memmap}
+_loaded_lock = threading.Lock()  # panels read tables from several threads at once
+
+
+def snapshot_dir():
+    return Path(settings.ANALYTICS_ARTIFACT_DIR) / 'snapshot'
+
+
+def _meta_path():
+    return snapshot_dir() / 'meta.json'
+
+
+def read_meta():
+    """
+    Meta of the local snapshot, or None when this process has no usable generation.
+    """
+    try:
+        meta = json.loads(_meta_path().read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if meta.get('version') != SNAPSHOT_VERSION or not (snapshot_dir() / meta['generation']).is_dir():
+        return None
+    return meta
+
+
+def _to_paise(amount):
+    return int((Decimal(amount or 0) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def _from_paise(paise):
+    return (Decimal(int(paise)) / 100).quantize(Decimal('0.01'))
+
+
+# --------------------------
+# DIRTY DAYS
+# --------------------------
+
+def mark_days_dirty(days):
+    """
+    Records days whose sales changed; snapshot generations built before the change fall back
+    to the rollups from the earliest such day until a build re-exports it.
+    """
+    days = {day for day in days if day}
+    if not days:
+        return
+    now = timezone.now()
+    SnapshotDirtyDay.objects.bulk_create(
+        [SnapshotDirtyDay(day=day, changed_at=now) for day in days],
+        update_conflicts=True,
+        unique_fields=['day'],
+        update_fields=['changed_at'],
+    )
+    logger.debug(f"[Snapshot] Marked {len(days)} day(s) dirty")
+
+
+def _dirty_days(meta):
+    """Snapshotted days changed since the generation in `meta` was built, earliest first."""
+    return (
+        SnapshotDirtyDay.objects
+        .filter(changed_at__gte=datetime.fromisoformat(meta['built_at']), day__lte=meta['through'])
+        .order_by('day')
+        .values_list('day', flat=True)
+    )
+
+
+def covered_through(meta=None):
+    """
+    Last day the snapshot can answer for, or None when there is no usable snapshot.
+    """
+    meta = meta or read_meta()
+    if meta is None:
+        return None
+    through = date.fromisoformat(meta['through'])
+    first_dirty = _dirty_days(meta).first()
+    if first_dirty:
+        through = min(through, first_dirty - timedelta(days=1))
+    return through
+
+
+# --------------------------
+# BUILD
+# --------------------------
+
+def _fetch_order_lines(start_day, end_day, statuses):
+    import numpy as np
+
+    lines = OrderItem.objects.all()
+    if start_day:
+        start, end = business_day_bounds(start_day, end_day)
+        lines = lines.filter(order__created_at__gte=start, order__created_at__lt=end)
+    else:
+        lines = lines.filter(order__created_at__lt=business_day_bounds(end_day, end_day)[1])
+    rows = (
+        lines
+        .annotate(day=TruncDate('order__created_at', tzinfo=get_business_timezone()))
+        .order_by('day', 'id')
+        .values_list('day', 'order_id', 'order__user_id', 'product_variant__product_id', 'order__status',
+                     'quantity', 'price_at_order')
+    )
+    columns = {name: [] for name in TABLES['order_lines']}
+    for day, order_id, user_id, product_id, status, quantity, price in rows.iterator(chunk_size=SNAPSHOT_CHUNK_SIZE):
+        columns['day'].append(day)
+        columns['order_id'].append(order_id)
+        columns['user_id'].append(user_id or 0)
+        columns['product'].append(product_id)
+        columns['status'].append(_status_code(statuses, status))
+        columns['quantity'].append(quantity)
+        columns['amount_paise'].append(_to_paise(price) * quantity)
+    return {name: np.array(values, dtype=TABLES['order_lines'][name]) for name, values in columns.items()}
+
+
+def _fetch_bookings(start_day, end_day, statuses):
+    import numpy as np
+
+    bookings = Booking.objects.filter(date__lte=end_day)
+    if start_day:
+        bookings = bookings.filter(date__gte=start_day)
+    rows = (
+        bookings
+        .with_final_price()
+        .order_by('date', 'id')
+        .values_list('date', 'id', 'customer_id', 'service_id', 'status', 'number_of_customers', 'final_price')
+    )
+    columns = {name: [] for name in TABLES['bookings']}
+    for day, booking_id, customer_id, service_id, status, customers, final_price in rows.iterator(
+            chunk_size=SNAPSHOT_CHUNK_SIZE):
+        columns['day'].append(day)
+        columns['booking_id'].append(booking_id)
+        columns['customer_id'].append(customer_id)
+        columns['service'].append(service_id)
+        columns['status'].append(_status_code(statuses, status))
+        columns['customers'].append(customers or 0)
+        columns['amount_paise'].append(_to_paise(final_price))
+    return {name: np.array(values, dtype=TABLES['bookings'][name]) for name, values in columns.items()}
+
+
+def _status_code(statuses, status):
+    if status not in statuses:
+        statuses.append(status)
+    return statuses.index(status)
+
+
+def build_snapshot(through=None, full=False):
+    """
+    Exports closed days up to `through` (default: yesterday) into a new snapshot generation.
+    Incremental by default: only days after the previous watermark, plus any days dirtied
+    since, are read from the database. Returns a summary dict.
+    """
+    import numpy as np
+
+    # Days changed from here on count as dirty for the new generation, even if the export sees them
+    built_at = timezone.now()
+    through = through or to_business_date(built_at) - timedelta(days=1)
+    meta = None if full else read_meta()
+    dirty = list(_dirty_days(meta)) if meta else []
+
+    if meta is None:
+        start_day, statuses = None, []
+    else:
+        # A snapshot never shrinks: re-exported dirty days must not drop later ones
+        through = max(through, date.fromisoformat(meta['through']))
+        start_day = date.fromisoformat(meta['through']) + timedelta(days=1)
+        if dirty:
+            start_day = min(start_day, dirty[0])
+        statuses = list(meta['statuses'])
+        if start_day > through:
+            logger.info(f"[Snapshot] Already current through {meta['through']}")
+            return {'through': meta['through'], 'appended_from': None, 'order_lines': None, 'bookings': None}
+
+    started = time.perf_counter()
+    fresh = {
+        'order_lines': _fetch_order_lines(start_day, through, statuses),
+        'bookings': _fetch_bookings(start_day, through, statuses),
+    }
+
+    tables = {}
+    for table, new_columns in fresh.items():
+        if meta is None:
+            tables[table] = new_columns
+            continue
+        old = load_table(table, meta)
+        # Drop re-exported days, then append them (and the new days) again
+        keep = old['day'] < np.datetime64(start_day, 'D')
+        tables[table] = {name: np.concatenate([old[name][keep], new_columns[name]]) for name in TABLES[table]}
+
+    generation = f"g{time.time_ns()}"
+    target = snapshot_dir() / generation
+    target.mkdir(parents=True)
+    for table, columns in tables.items():
+        (target / table).mkdir()
+        for name, values in columns.items():
+            np.save(target / table / f'{name}.npy', values)
+
+    new_meta = {
+        'version': SNAPSHOT_VERSION,
+        'generation': generation,
+        'built_at': built_at.isoformat(),
+        'through': through.isoformat(),
+        'statuses': statuses,
+        'rows': {table: int(len(columns['day'])) for table, columns in tables.items()},
+    }
+    tmp = _meta_path().with_suffix('.tmp')
+    tmp.write_text(json.dumps(new_meta))
+    os.replace(tmp, _meta_path())
+
+    # Generation names carry their build time, so name order is build order
+    generations = sorted(path.name for path in snapshot_dir().glob('g*'))
+    for name in generations[:-SNAPSHOT_KEEP_GENERATIONS]:
+        shutil.rmtree(snapshot_dir() / name, ignore_errors=True)
+
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    logger.info(f"[Snapshot] Built {generation} through {through} from {start_day or 'the beginning'}: "
+                f"{new_meta['rows']} rows in {duration_ms} ms")
+    return {
+        'through': new_meta['through'],
+        'appended_from': start_day.isoformat() if start_day else None,
+        'order_lines': len(fresh['order_lines']['day']),
+        'bookings': len(fresh['bookings']['day']),
+    }
+
+
+# --------------------------
+# READ
+# --------------------------
+
+def load_table(table, meta=None):
+    """
+    {column: read-only memmap} for the current generation of `table`.
+    """
+    import numpy as np
+
+    meta = meta or read_meta()
+    key = (meta['generation'], table)
+    with _loaded_lock:
+        if key not in _loaded:
+            for stale in [k for k in _loaded if k[1] == table]:
+                del _loaded[stale]
+            folder = snapshot_dir() / meta['generation'] / table
+            _loaded[key] = {name: np.load(folder / f'{name}.npy', mmap_mode='r') for name in TABLES[table]}
+        return _loaded[key]
+
+
+def _split_range(start_day, end_day):
+    """
+    (meta, snapshot_end) — days start_day..snapshot_end come from the snapshot, the rest
+    from the rollups. snapshot_end is None when the snapshot can't serve any of the range.
+    """
+    meta = read_meta()
+    through = covered_through(meta)
+    if through is None or through < start_day:
+        return meta, None
+    return meta, min(end_day, through)
+
+
+def _snapshot_mask(columns, meta, start_day, end_day, statuses):
+    import numpy as np
+
+    day = columns['day']
+    mask = (day >= np.datetime64(start_day, 'D')) & (day <= np.datetime64(end_day, 'D'))
+    if statuses is not None:
+        codes = [meta['statuses'].index(s) for s in statuses if s in meta['statuses']]
+        mask &= np.isin(columns['status'], codes)
+    return mask
+
+
+def _grouped_sums(keys, values):
+    import numpy as np
+
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = [np.bincount(inverse, weights=v, minlength=len(unique)) for v in values]
+    return unique, sums
+
+
+def _sales_by_name(table, key_column, count_column, names_qs, rollup_qs, name_field, count_field,
+                   start_day, end_day, statuses):
+    import numpy as np
+
+    meta, snapshot_end = _split_range(start_day, end_day)
+    totals = {}  # name -> [count, paise]
+
+    if snapshot_end is not None:
+        columns = load_table(table, meta)
+        mask = _snapshot_mask(columns, meta, start_day, snapshot_end, statuses)
+        # Without a count column every row counts once (one row per booking)
+        counts = columns[count_column][mask] if count_column else np.ones(int(mask.sum()))
+        keys, (count_sums, paise_sums) = _grouped_sums(
+            columns[key_column][mask], [counts, columns['amount_paise'][mask]]
+        )
+        names = dict(names_qs.filter(pk__in=keys.tolist()))
+        for key, count, paise in zip(keys.tolist(), count_sums, paise_sums):
+            name = names.get(key)
+            if name is None:  # deleted since the build; its rollups are gone too
+                continue
+            total = totals.setdefault(name, [0, 0])
+            total[0] += int(round(count))
+            total[1] += int(round(paise))
+        rollup_start = snapshot_end + timedelta(days=1)
+    else:
+        rollup_start = start_day
+
+    if rollup_start <= end_day:
+        rows = rollup_qs.filter(day__range=(rollup_start, end_day))
+        if statuses is not None:
+            rows = rows.filter(status__in=statuses)
+        for row in rows.values(name_field).annotate(count=Sum(count_field), revenue=Sum('revenue')).order_by():
+            total = totals.setdefault(row[name_field], [0, 0])
+            total[0] += row['count'] or 0
+            total[1] += _to_paise(row['revenue'])
+
+    return sorted(
+        ((name, count, _from_paise(paise)) for name, (count, paise) in totals.items()),
+        key=lambda item: item[2], reverse=True,
+    )
+
+
+def product_sales(start_day, end_day, statuses=None):
+    """
+    [{'product__name', 'units', 'revenue'}] for start_day..end_day, highest revenue first.
+    """
+    rows = _sales_by_name('order_lines', 'product', 'quantity', Product.objects.values_list('id', 'name'),
+                          DailyProductSales.objects.all(), 'product__name', 'units', start_day, end_day, statuses)
+    return [{'product__name': name, 'units': units, 'revenue': revenue} for name, units, revenue in rows]
+
+
+def service_sales(start_day, end_day, statuses=None):
+    """
+    [{'service__title', 'bookings', 'revenue'}] for start_day..end_day, highest revenue first.
+    """
+    rows = _sales_by_name('bookings', 'service', None, Service.objects.values_list('id', 'title'),
+                          DailyServiceSales.objects.all(), 'service__title', 'bookings', start_day, end_day, statuses)
+    return [{'service__title': title, 'bookings': count, 'revenue': revenue} for title, count, revenue in rows]
+
+
+def daily_revenue(table, start_day, end_day):
+    """
+    [(day, revenue)] for days with sales in start_day..end_day, any status.
+    """
+    meta, snapshot_end = _split_range(start_day, end_day)
+    totals = {}
+
+    if snapshot_end is not None:
+        columns = load_table(table, meta)
+        mask = _snapshot_mask(columns, meta, start_day, snapshot_end, None)
+        days, (paise_sums,) = _grouped_sums(columns['day'][mask], [columns['amount_paise'][mask]])
+        for day, paise in zip(days.tolist(), paise_sums):
+            totals[day] = int(round(paise))
+        rollup_start = snapshot_end + timedelta(days=1)
+    else:
+        rollup_start = start_day
+
+    if rollup_start <= end_day:
+        model = DailyProductSales if table == 'order_lines' else DailyServiceSales
+        rows = (
+            model.objects.filter(day__range=(rollup_start, end_day))
+            .values('day').annotate(revenue=Sum('revenue')).order_by()
+        )
+        for row in rows:
+            totals[row['day']] = totals.get(row['day'], 0) + _to_paise(row['revenue'])
+
+    return [(day, _from_paise(paise)) for day, paise in sorted(totals.items())]
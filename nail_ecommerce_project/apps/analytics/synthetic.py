@@ -0,0 +1,357 @@
+"""
+Synthetic orders and bookings for load-testing the analytics dashboard.
+
+Everything generated here is tagged (usernames start with SYNTHETIC_PREFIX, catalogue slugs with
+SYNTHETIC_SLUG_PREFIX) so it can be purged again without touching real data. Rows are written with
+bulk_create, which bypasses model signals, so the derived tables (rollups, customer metrics, cache
+versions, snapshot dirty days) are rebuilt explicitly afterwards.
+"""
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DatabaseError, transaction
+from django.db.models import Max, Min
+
+from nail_ecommerce_project.apps.analytics.cache import SALES_SCOPE, bump_version
+from nail_ecommerce_project.apps.analytics.customer_metrics import rebuild_customer_metrics
+from nail_ecommerce_project.apps.analytics.dates import iter_day_chunks, make_business_aware, to_business_date
+from nail_ecommerce_project.apps.analytics.rollups import rebuild_product_sales, rebuild_service_sales
+from nail_ecommerce_project.apps.analytics.snapshot import mark_days_dirty
+from nail_ecommerce_project.apps.bookings.models import TIME_SLOT_CHOICES, Booking, BookingStatus
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+from nail_ecommerce_project.apps.products.models import Product, ProductVariant
+from nail_ecommerce_project.apps.services.models import Service
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+User = get_user_model()
+
+SYNTHETIC_PREFIX = 'synthetic_'
+SYNTHETIC_SLUG_PREFIX = 'synthetic-'
+
+# Full-scale data set; benchmarks generate fractions of it
+DEFAULT_SIZES = {'customers': 50_000, 'order_items': 1_000_000, 'bookings': 200_000}
+
+CATALOG_PRODUCTS = 40
+VARIANTS_PER_PRODUCT = 3
+SERVICE_TITLES = [
+    'Manicure', 'Pedicure', 'Gel Extensions', 'Acrylic Refill', 'Nail Art',
+    'Spa Pedicure', 'French Tips', 'Polish Change',
+]
+
+ORDER_STATUSES = ['DELIVERED', 'SHIPPED', 'PROCESSING', 'ORDERED', 'PENDING', 'CANCELLED']
+ORDER_STATUS_WEIGHTS = [0.70, 0.08, 0.05, 0.04, 0.05, 0.08]
+BOOKING_STATUSES = [
+    BookingStatus.COMPLETED_SERVICE, BookingStatus.CONFIRMED_SERVICE,
+    BookingStatus.CONFIRMATION_PENDING, BookingStatus.CANCELLED_SERVICE,
+]
+BOOKING_STATUS_WEIGHTS = [0.68, 0.12, 0.08, 0.12]
+# Shoppers order in the evening, salon slots peak around midday and after work
+ORDER_HOUR_WEIGHTS = [1, 1, 1, 1, 1, 1, 2, 3, 4, 5, 6, 6, 7, 7, 6, 6, 6, 7, 8, 9, 9, 8, 5, 2]
+SLOT_WEIGHTS = [2, 4, 6, 8, 9, 7, 6, 6, 7, 9, 9, 7, 4]
+# Monday .. Sunday
+WEEKDAY_WEIGHTS = [0.85, 0.85, 0.9, 0.95, 1.1, 1.35, 1.25]
+
+
+def _normalised(weights):
+    import numpy as np
+
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    Lets bulk_create keep the historical values set on auto_now_add fields.
+    """
+    saved = [(field, field.auto_now_add) for field in fields]
+    try:
+        for field in fields:
+            field.auto_now_add = False
+        yield
+    finally:
+        for field, value in saved:
+            field.auto_now_add = value
+
+
+def _batches(total, batch_size):
+    for offset in range(0, total, batch_size):
+        yield offset, min(batch_size, total - offset)
+
+
+# --------------------------
+# CATALOGUE
+# --------------------------
+
+def ensure_synthetic_catalog():
+    """
+    Returns (variants, services) of the tagged synthetic catalogue, creating it on first use.
+    """
+    variants = list(
+        ProductVariant.objects.filter(product__slug__startswith=SYNTHETIC_SLUG_PREFIX).order_by('id')
+    )
+    if not variants:
+        for index in range(CATALOG_PRODUCTS):
+            product = Product.objects.create(
+                name=f"Synthetic Product {index + 1}", slug=f"{SYNTHETIC_SLUG_PREFIX}product-{index + 1}",
+            )
+            for size_index in range(VARIANTS_PER_PRODUCT):
+                variants.append(ProductVariant.objects.create(
+                    product=product, size=f"{5 * (size_index + 1)}ml", color=f"Shade {index % 12 + 1}",
+                    price=Decimal(149 + 50 * (index % 10) + 60 * size_index), stock_quantity=500,
+                ))
+
+    services = list(Service.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).order_by('id'))
+    if not services:
+        for index, title in enumerate(SERVICE_TITLES):
+            services.append(Service.objects.create(
+                title=f"Synthetic {title}", slug=f"{SYNTHETIC_SLUG_PREFIX}{index + 1}",
+                price=Decimal(400 + 150 * index), duration_minutes=30 + 15 * (index % 4),
+            ))
+    return variants, services
+
+
+# --------------------------
+# GENERATION
+# --------------------------
+
+class SyntheticDataGenerator:
+    """
+    Writes customers, orders with items and bookings spread over the `days` ending on `end_day`.
+
+    Popularity is skewed the way real shops are: a minority of customers and products account
+    for most sales, weekends are busier and volume grows over the period.
+    """
+    def __init__(self, end_day, days=365, batch_size=5000, seed=None, progress=None):
+        import numpy as np
+
+        self.rng = np.random.default_rng(seed)
+        self.end_day = end_day
+        self.start_day = end_day - timedelta(days=days - 1)
+        self.batch_size = batch_size
+        self.progress = progress or (lambda message: None)
+
+        self.days = [self.start_day + timedelta(days=offset) for offset in range(days)]
+        growth = np.linspace(0.6, 1.4, days)
+        weekday = np.array([WEEKDAY_WEIGHTS[day.weekday()] for day in self.days])
+        self.day_weights = _normalised(growth * weekday)
+        self.midnights = [make_business_aware(datetime.combine(day, time.min)) for day in self.days]
+
+    def _zipf_weights(self, count, exponent=1.1):
+        import numpy as np
+
+        weights = 1.0 / np.arange(1, count + 1) ** exponent
+        return _normalised(self.rng.permutation(weights))
+
+    def _random_datetimes(self, day_indexes):
+        hours = self.rng.choice(24, size=len(day_indexes), p=_normalised(ORDER_HOUR_WEIGHTS))
+        seconds = self.rng.integers(0, 3600, size=len(day_indexes))
+        return [
+            self.midnights[day] + timedelta(hours=int(hour), seconds=int(second))
+            for day, hour, second in zip(day_indexes, hours, seconds)
+        ]
+
+    def create_customers(self, count):
+        start = User.objects.filter(username__startswith=SYNTHETIC_PREFIX).count()
+        password = make_password(None)
+        # Accounts predate the generated activity so no order comes before its customer joined
+        joined_days_before = self.rng.integers(1, 366, size=count)
+        with explicit_timestamps(User._meta.get_field('date_joined')):
+            for offset, size in _batches(count, self.batch_size):
+                users = [
+                    User(
+                        username=f"{SYNTHETIC_PREFIX}{start + offset + i}",
+                        email=f"{SYNTHETIC_PREFIX}{start + offset + i}@example.com",
+                        full_name=f"Synthetic Customer {start + offset + i}",
+                        role='customer', password=password,
+                        date_joined=self.midnights[0] - timedelta(days=int(joined_days_before[offset + i])),
+                    )
+                    for i in range(size)
+                ]
+                User.objects.bulk_create(users)
+                self.progress(f"Customers: {offset + size}/{count}")
+        # Not every backend returns primary keys from bulk_create, so read them back
+        return list(
+            User.objects.filter(username__startswith=SYNTHETIC_PREFIX)
+            .order_by('-id').values_list('id', flat=True)[:count]
+        )
+
+    def create_orders(self, customer_ids, variants, item_target):
+        """
+        Creates orders until `item_target` order items exist; orders carry 1-6 lines.
+        """
+        customer_weights = self._zipf_weights(len(customer_ids), exponent=0.8)
+        variant_weights = self._zipf_weights(len(variants))
+        prices = [variant.price for variant in variants]
+        status_p = _normalised(ORDER_STATUS_WEIGHTS)
+        order_fields = (Order._meta.get_field('created_at'),)
+
+        written = 0
+        orders_written = 0
+        with explicit_timestamps(*order_fields):
+            while written < item_target:
+                line_counts = self.rng.geometric(0.45, size=self.batch_size).clip(max=6)
+                cumulative = line_counts.cumsum()
+                line_counts = line_counts[:int((cumulative < item_target - written).sum()) + 1]
+                line_counts[-1] -= max(int(line_counts.sum()) - (item_target - written), 0)
+
+                size = len(line_counts)
+                users = self.rng.choice(customer_ids, size=size, p=customer_weights)
+                created = self._random_datetimes(self.rng.choice(len(self.days), size=size, p=self.day_weights))
+                statuses = self.rng.choice(ORDER_STATUSES, size=size, p=status_p)
+
+                with transaction.atomic():
+                    orders = Order.objects.bulk_create([
+                        Order(
+                            user_id=int(users[i]), full_name="Synthetic Customer", phone="9000000000",
+                            address_line1="1 Test Street", city="Pune", postal_code="411001",
+                            state="Maharashtra", status=str(statuses[i]), created_at=created[i],
+                        )
+                        for i in range(size)
+                    ])
+                    if orders[0].pk is None:
+                        orders = list(Order.objects.order_by('-id')[:size])[::-1]
+
+                    picks = self.rng.choice(len(variants), size=int(line_counts.sum()), p=variant_weights)
+                    quantities = self.rng.geometric(0.6, size=len(picks)).clip(max=5)
+                    # A share of lines sold at a promotional price
+                    discounted = self.rng.random(len(picks)) < 0.2
+                    items = []
+                    position = 0
+                    for order, lines in zip(orders, line_counts):
+                        for _ in range(int(lines)):
+                            price = prices[picks[position]]
+                            if discounted[position]:
+                                price = (price * Decimal('0.85')).quantize(Decimal('0.01'))
+                            items.append(OrderItem(
+                                order=order, product_variant=variants[picks[position]],
+                                quantity=int(quantities[position]), price_at_order=price,
+                            ))
+                            position += 1
+                    OrderItem.objects.bulk_create(items, batch_size=self.batch_size)
+
+                written += len(items)
+                orders_written += size
+                self.progress(f"Order items: {written}/{item_target} ({orders_written} orders)")
+        return orders_written, written
+
+    def create_bookings(self, customer_ids, services, count):
+        """
+        Creates up to `count` bookings; draws colliding with the (date, slot, service, customer)
+        unique constraint are skipped.
+        """
+        customer_weights = self._zipf_weights(len(customer_ids), exponent=0.8)
+        service_weights = self._zipf_weights(len(services), exponent=0.7)
+        slots = [slot for slot, _ in TIME_SLOT_CHOICES]
+        slot_p = _normalised(SLOT_WEIGHTS)
+        status_p = _normalised(BOOKING_STATUS_WEIGHTS)
+
+        before = Booking.objects.filter(customer__username__startswith=SYNTHETIC_PREFIX).count()
+        with explicit_timestamps(Booking._meta.get_field('created_at')):
+            for offset, size in _batches(count, self.batch_size):
+                day_indexes = self.rng.choice(len(self.days), size=size, p=self.day_weights)
+                # Booked a few days ahead of the appointment
+                created = self._random_datetimes(day_indexes)
+                lead_days = self.rng.integers(0, 8, size=size)
+                users = self.rng.choice(customer_ids, size=size, p=customer_weights)
+                picked_services = self.rng.choice(len(services), size=size, p=service_weights)
+                picked_slots = self.rng.choice(slots, size=size, p=slot_p)
+                statuses = self.rng.choice([str(s) for s in BOOKING_STATUSES], size=size, p=status_p)
+                group_sizes = self.rng.choice([1, 2, 3, 4, 5], size=size, p=[0.78, 0.14, 0.05, 0.02, 0.01])
+                home = self.rng.random(size) < 0.15
+
+                Booking.objects.bulk_create([
+                    Booking(
+                        customer_id=int(users[i]), service=services[picked_services[i]],
+                        date=self.days[day_indexes[i]], time_slot=str(picked_slots[i]),
+                        status=str(statuses[i]), number_of_customers=int(group_sizes[i]),
+                        is_home_service=bool(home[i]),
+                        home_delivery_address="1 Test Street, Pune" if home[i] else None,
+                        created_at=created[i] - timedelta(days=int(lead_days[i])),
+                    )
+                    for i in range(size)
+                ], ignore_conflicts=True)
+                self.progress(f"Bookings: {offset + size}/{count}")
+        return Booking.objects.filter(customer__username__startswith=SYNTHETIC_PREFIX).count() - before
+
+
+def refresh_derived_tables(start_day, end_day, user_ids=None, chunk_days=31, chunk_size=1000):
+    """
+    Brings rollups, customer metrics, cached panels and the snapshot dirty list in line with
+    rows written without signals.
+    """
+    for chunk_start, chunk_end in iter_day_chunks(start_day, end_day, chunk_days):
+        rebuild_product_sales(chunk_start, chunk_end)
+        rebuild_service_sales(chunk_start, chunk_end)
+
+    if user_ids is None:
+        rebuild_customer_metrics()
+    else:
+        for offset in range(0, len(user_ids), chunk_size):
+            rebuild_customer_metrics(user_ids[offset:offset + chunk_size])
+
+    days = [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)]
+    for month_start in sorted({day.replace(day=1) for day in days}):
+        bump_version(SALES_SCOPE, month_start)
+    try:
+        mark_days_dirty(days)
+    except DatabaseError as e:
+        logger.error(f"[Synthetic] Could not mark snapshot days dirty: {e}")
+
+
+def generate_synthetic_data(end_day, customers, order_items, bookings, days=365, batch_size=5000,
+                            seed=None, progress=None):
+    """
+    Generates a synthetic data set and refreshes the derived analytics tables. Returns counts.
+    """
+    generator = SyntheticDataGenerator(end_day, days=days, batch_size=batch_size, seed=seed, progress=progress)
+    variants, services = ensure_synthetic_catalog()
+    customer_ids = generator.create_customers(customers)
+
+    orders_written, items_written = generator.create_orders(customer_ids, variants, order_items)
+    bookings_written = generator.create_bookings(customer_ids, services, bookings)
+
+    generator.progress("Refreshing rollups and customer metrics")
+    refresh_derived_tables(generator.start_day, end_day, user_ids=customer_ids)
+
+    logger.info(f"[Synthetic] Generated {len(customer_ids)} customers, {orders_written} orders, "
+                f"{items_written} order items, {bookings_written} bookings "
+                f"({generator.start_day} → {end_day})")
+    return {
+        'customers': len(customer_ids),
+        'orders': orders_written,
+        'order_items': items_written,
+        'bookings': bookings_written,
+        'start_day': generator.start_day,
+        'end_day': end_day,
+    }
+
+
+def purge_synthetic_data(batch_size=500):
+    """
+    Deletes every synthetic customer (with their orders and bookings) and the synthetic catalogue,
+    then rebuilds the derived tables for the days they covered. Returns the number of customers removed.
+    """
+    synthetic_users = User.objects.filter(username__startswith=SYNTHETIC_PREFIX)
+    user_ids = list(synthetic_users.order_by('id').values_list('id', flat=True))
+    orders = Order.objects.filter(user__in=synthetic_users).aggregate(first=Min('created_at'), last=Max('created_at'))
+    bookings = Booking.objects.filter(customer__in=synthetic_users).aggregate(first=Min('date'), last=Max('date'))
+    first_days = [d for d in (to_business_date(orders['first']), bookings['first']) if d]
+    last_days = [d for d in (to_business_date(orders['last']), bookings['last']) if d]
+
+    # Orders and bookings go with their customers; chunked so each transaction stays small
+    for offset in range(0, len(user_ids), batch_size):
+        with transaction.atomic():
+            User.objects.filter(id__in=user_ids[offset:offset + batch_size]).delete()
+    with transaction.atomic():
+        Product.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).delete()
+        Service.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).delete()
+
+    if first_days:
+        refresh_derived_tables(min(first_days), max(last_days), user_ids=[])
+    logger.info(f"[Synthetic] Purged {len(user_ids)} synthetic customers")
+    return len(user_ids)
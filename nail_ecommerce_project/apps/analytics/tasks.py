@@ -0,0 +1,64 @@
+from celery import shared_task
+
+
+@shared_task(name='analytics.run_report')
+def run_report_task(report_id):
+    from nail_ecommerce_project.apps.analytics.reports import run_report
+
+    run_report(report_id)
+
+
+@shared_task(name='analytics.refresh_customer_segments')
+def refresh_customer_segments_task():
+    from nail_ecommerce_project.apps.analytics.segmentation import refresh_segment_model
+
+    refresh_segment_model()
+
+
+@shared_task(name='analytics.update_customer_segments')
+def update_customer_segments_task(user_ids):
+    from nail_ecommerce_project.apps.analytics.segmentation import update_customer_segments
+
+    update_customer_segments(user_ids)
+
+
+@shared_task(name='analytics.build_analytics_snapshot')
+def build_analytics_snapshot_task():
+    from nail_ecommerce_project.apps.analytics.snapshot import build_snapshot
+
+    build_snapshot()
+
+
+@shared_task(name='analytics.rebuild_recommendations')
+def rebuild_recommendations_task():
+    from nail_ecommerce_project.apps.analytics.recommendations import rebuild_recommendations
+
+    rebuild_recommendations()
+
+
+@shared_task(name='analytics.detect_revenue_anomalies')
+def detect_revenue_anomalies_task():
+    from nail_ecommerce_project.apps.analytics.anomalies import scan_closed_days
+
+    scan_closed_days()
+
+
+@shared_task(name='analytics.refresh_restock_suggestions')
+def refresh_restock_suggestions_task():
+    from nail_ecommerce_project.apps.analytics.restock import refresh_restock_suggestions
+
+    refresh_restock_suggestions()
+
+
+@shared_task(name='analytics.train_booking_risk_model')
+def train_booking_risk_model_task():
+    from nail_ecommerce_project.apps.analytics.cancellations import fit_cancellation_model
+
+    fit_cancellation_model()
+
+
+@shared_task(name='analytics.score_booking_risk')
+def score_booking_risk_task():
+    from nail_ecommerce_project.apps.analytics.cancellations import score_open_bookings
+
+    score_open_bookings()
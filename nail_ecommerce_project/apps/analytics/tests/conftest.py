@@ -0,0 +1,134 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from nail_ecommerce_project.apps.analytics.dates import get_business_timezone
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+from nail_ecommerce_project.apps.products.models import Product, ProductVariant
+from nail_ecommerce_project.apps.services.models import Service
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def analytics_artifact_dir(settings, tmp_path):
+    """Keep fitted models and snapshots out of the project tree."""
+    settings.ANALYTICS_ARTIFACT_DIR = tmp_path / "analytics"
+    return settings.ANALYTICS_ARTIFACT_DIR
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    """Dashboard panels are cached across requests; start every test cold."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+# --------------------------
+# USER FIXTURES
+# --------------------------
+
+@pytest.fixture
+def customer(db):
+    return User.objects.create_user(
+        username="analytics_customer",
+        email="analytics_customer@example.com",
+        password="testpass123",
+        full_name="Analytics Customer",
+        role="customer"
+    )
+
+
+@pytest.fixture
+def superuser(db):
+    return User.objects.create_superuser(
+        username="analytics_admin", email="analytics_admin@example.com", password="adminpass"
+    )
+
+
+@pytest.fixture
+def make_customer(db):
+    """Factory: additional customers with unique usernames."""
+    def _create(index, full_name=""):
+        return User.objects.create_user(
+            username=f"customer_{index}", email=f"customer_{index}@example.com",
+            password="pass", full_name=full_name, role="customer"
+        )
+    return _create
+
+
+@pytest.fixture
+def admin_client(client, superuser):
+    client.force_login(superuser)
+    return client
+
+
+# --------------------------
+# CATALOG FIXTURES
+# --------------------------
+
+@pytest.fixture
+def product_variant(db):
+    product = Product.objects.create(name="Gel Polish", slug="gel-polish")
+    return ProductVariant.objects.create(
+        product=product, size="10ml", color="Red", price=Decimal("200.00"), stock_quantity=20
+    )
+
+
+@pytest.fixture
+def service(db):
+    return Service.objects.create(title="Manicure", price=Decimal("1000.00"))
+
+
+# --------------------------
+# SALES FACTORIES
+# --------------------------
+
+def business_datetime(day, hour=12):
+    """Aware datetime at `hour` o'clock on `day` in the business timezone."""
+    return datetime.combine(day, time(hour), tzinfo=get_business_timezone())
+
+
+@pytest.fixture
+def make_order(customer, product_variant):
+    """Factory: order on a given business day with (variant, quantity, unit price) lines."""
+    def _create(day=None, status='DELIVERED', lines=None, user=None, hour=12):
+        order = Order.objects.create(
+            user=user or customer,
+            full_name="Analytics Customer",
+            phone="1234567890",
+            address_line1="Line 1",
+            city="Pune",
+            postal_code="411001",
+            state="Maharashtra",
+            status=status,
+        )
+        if day is not None:
+            Order.objects.filter(pk=order.pk).update(created_at=business_datetime(day, hour))
+            order.refresh_from_db()
+        for variant, quantity, price in (lines or [(product_variant, 1, product_variant.price)]):
+            OrderItem.objects.create(order=order, product_variant=variant, quantity=quantity, price_at_order=price)
+        return order
+    return _create
+
+
+@pytest.fixture
+def make_booking(customer, service):
+    """Factory: booking for a service date with the given pricing inputs."""
+    def _create(day=None, status=BookingStatus.COMPLETED_SERVICE, time_slot='10:00', user=None,
+                number_of_customers=1, is_home_service=False, booking_service=None):
+        return Booking.objects.create(
+            customer=user or customer,
+            service=booking_service or service,
+            date=day or date.today(),
+            time_slot=time_slot,
+            status=status,
+            number_of_customers=number_of_customers,
+            is_home_service=is_home_service,
+        )
+    return _create
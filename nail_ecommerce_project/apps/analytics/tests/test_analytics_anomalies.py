@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.anomalies import CHECKPOINT_NAME, detect_anomalies, robust_zscores, \
+    scan_closed_days
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+from nail_ecommerce_project.apps.analytics.models import AnalyticsCheckpoint, RevenueAnomaly
+
+pytestmark = pytest.mark.django_db
+
+
+def test_robust_zscores_ignore_outliers_in_the_window():
+    values = np.array([100.0, 110, 90, 105, 95, 1000, 100, 98, 0])
+
+    scores, medians = robust_zscores(values, window=5)
+
+    assert np.isnan(scores[:5]).all()
+    assert scores[5] > 10
+    # The spike inside later windows barely moves their median
+    assert medians[8] == 100.0
+    assert scores[8] < -10
+    assert abs(scores[6]) < 1
+
+
+@pytest.fixture
+def daily_orders(make_order, product_variant, django_capture_on_commit_callbacks):
+    """Daily ₹200 orders; `spikes` maps a day to its order quantity (0 = no order that day)."""
+    def _create(start_day, days, spikes=None):
+        spikes = spikes or {}
+        with django_capture_on_commit_callbacks(execute=True):
+            for offset in range(days):
+                day = start_day + timedelta(days=offset)
+                quantity = spikes.get(day, 1)
+                if quantity:
+                    make_order(day=day, lines=[(product_variant, quantity, product_variant.price)])
+    return _create
+
+
+def test_detects_spike_and_outage(daily_orders, settings):
+    settings.ANALYTICS_ANOMALY_WINDOW_DAYS = 14
+    spike, outage = date(2025, 3, 20), date(2025, 3, 25)
+    daily_orders(date(2025, 3, 1), 31, spikes={spike: 6, outage: 0})
+
+    anomalies = detect_anomalies(date(2025, 3, 1), date(2025, 3, 31))
+
+    assert [(a.day, a.series, a.direction) for a in anomalies] == [
+        (spike, 'Orders', 'SPIKE'), (outage, 'Orders', 'DROP'),
+    ]
+    stored = RevenueAnomaly.objects.get(day=spike)
+    assert (stored.revenue, stored.expected) == (Decimal('1200.00'), Decimal('200.00'))
+
+
+def test_days_before_a_full_window_of_history_are_not_scored(daily_orders, settings):
+    settings.ANALYTICS_ANOMALY_WINDOW_DAYS = 14
+    # Spike on day 10 of trading: only 9 days of history behind it
+    daily_orders(date(2025, 3, 1), 20, spikes={date(2025, 3, 10): 6})
+
+    assert detect_anomalies(date(2025, 3, 1), date(2025, 3, 20)) == []
+
+
+def test_nightly_scan_only_covers_newly_closed_days(daily_orders, settings):
+    settings.ANALYTICS_ANOMALY_WINDOW_DAYS = 7
+    yesterday = to_business_date(timezone.now()) - timedelta(days=1)
+    daily_orders(yesterday - timedelta(days=20), 21, spikes={yesterday: 8})
+    AnalyticsCheckpoint.objects.create(name=CHECKPOINT_NAME, day=yesterday - timedelta(days=3))
+
+    start_day, end_day, anomalies = scan_closed_days()
+
+    assert (start_day, end_day) == (yesterday - timedelta(days=2), yesterday)
+    assert [a.day for a in anomalies] == [yesterday]
+    assert AnalyticsCheckpoint.objects.get(name=CHECKPOINT_NAME).day == yesterday
+    assert scan_closed_days() is None
+
+
+def test_command_and_dashboard_panel(admin_client, daily_orders, settings, capsys):
+    settings.ANALYTICS_ANOMALY_WINDOW_DAYS = 7
+    spike = date(2025, 3, 15)
+    daily_orders(date(2025, 3, 1), 20, spikes={spike: 5})
+
+    call_command('detect_revenue_anomalies', start='2025-03-01', end='2025-03-20')
+
+    assert 'Scanned 2025-03-01 to 2025-03-20: 1 anomalies.' in capsys.readouterr().out
+    assert not AnalyticsCheckpoint.objects.exists()
+    response = admin_client.get(reverse('analytics:dashboard_panel', args=['anomalies']),
+                                {'start_date': '2025-03-01', 'end_date': '2025-03-31'})
+    rows = response.json()['data']['rows']
+    assert [(row['day'], row['direction']) for row in rows] == [('2025-03-15', 'SPIKE')]
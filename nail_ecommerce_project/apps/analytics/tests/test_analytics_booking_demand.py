@@ -0,0 +1,89 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.utils import get_booking_demand
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+from nail_ecommerce_project.apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+MONDAY, SATURDAY = 0, 5
+SLOT_10AM, SLOT_2PM = 2, 6
+
+
+def _range(start_day, end_day):
+    return (
+        make_business_aware(datetime.combine(start_day, time.min)),
+        make_business_aware(datetime.combine(end_day, time.max)),
+    )
+
+
+@pytest.fixture
+def stylist(db):
+    return User.objects.create_user(
+        username="stylist", email="stylist@example.com", password="pass", full_name="Asha Rao", is_staff=True
+    )
+
+
+@pytest.fixture
+def february_bookings(stylist, make_customer, make_booking):
+    """
+    February 2025 (4 of each weekday): two Monday 10:00 manicures and a Saturday 14:00 pedicure,
+    all with the one stylist, plus an unassigned Monday manicure and a cancelled booking.
+    """
+    pedicure = Service.objects.create(title="Pedicure", price=Decimal("800.00"))
+    make_booking(day=date(2025, 2, 3))
+    make_booking(day=date(2025, 2, 10))
+    make_booking(day=date(2025, 2, 8), time_slot='14:00', booking_service=pedicure)
+    make_booking(day=date(2025, 2, 4), status=BookingStatus.CANCELLED_SERVICE)
+    make_booking(day=date(2025, 3, 3))
+    # Staff are auto-assigned at random; pin them
+    Booking.objects.update(staff=stylist)
+    unassigned = make_booking(day=date(2025, 2, 17), user=make_customer(1))
+    Booking.objects.filter(pk=unassigned.pk).update(staff=None)
+
+
+def test_demand_by_weekday_slot_service_and_staff(february_bookings):
+    result = get_booking_demand(*_range(date(2025, 2, 10), date(2025, 2, 20)))
+
+    total = result['total']
+    assert (total[MONDAY][SLOT_10AM], total[SATURDAY][SLOT_2PM]) == (3, 1)
+    assert sum(map(sum, total)) == 4
+    # 3 bookings over 4 Mondays with one staff member
+    assert result['utilization'][MONDAY][SLOT_10AM] == 75.0
+    assert [(s['name'], s['bookings']) for s in result['services']] == [('Manicure', 3), ('Pedicure', 1)]
+
+    stylist, unassigned = result['staff']
+    assert (stylist['name'], stylist['bookings'], stylist['available']) == ('Asha Rao', 3, 28 * 13)
+    assert stylist['utilization'] == round(3 / (28 * 13) * 100, 1)
+    assert stylist['matrix'][SATURDAY][SLOT_2PM] == 1
+    assert (unassigned['name'], unassigned['bookings'], unassigned['available']) == ('Unassigned', 1, 0)
+
+
+def test_demand_is_one_aggregate_query(february_bookings, django_assert_num_queries):
+    # Grouped bookings, the service titles and the staff roster
+    with django_assert_num_queries(3):
+        get_booking_demand(*_range(date(2025, 2, 1), date(2025, 2, 28)))
+
+
+def test_panel_cached_per_month(admin_client, february_bookings, django_assert_num_queries):
+    url = reverse('analytics:dashboard_panel', args=['booking_demand'])
+    data = admin_client.get(url, {'start_date': '2025-02-01', 'end_date': '2025-02-28'}).json()['data']
+
+    heatmap = data['figures']['booking-demand-heatmap']['data']
+    # The admin is staff too: on the roster, with nothing booked
+    assert [trace['name'] for trace in heatmap] == [
+        'All bookings (% of staff slots booked)', 'Service: Manicure', 'Service: Pedicure',
+        'Staff: Asha Rao', 'Staff: Unassigned', 'Staff: analytics_admin',
+    ]
+    assert data['rows'][0] == {'name': 'Asha Rao', 'bookings': 3, 'available': 364, 'utilization': 0.8}
+
+    with django_assert_num_queries(2):  # session + user
+        admin_client.get(url, {'start_date': '2025-02-10', 'end_date': '2025-02-15'})
@@ -0,0 +1,143 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics import cache as analytics_cache, snapshot
+from nail_ecommerce_project.apps.analytics.cache import (
+    INVENTORY_SCOPE, SALES_SCOPE, bump_version, cached_panel, is_shared_cache, panel_timeout,
+    note_fallback, reset_analytics_cache,
+)
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware, to_business_date
+from nail_ecommerce_project.apps.analytics.utils import get_sales_data
+
+pytestmark = pytest.mark.django_db
+
+MARCH = (date(2025, 3, 1), date(2025, 3, 31))
+APRIL = (date(2025, 4, 1), date(2025, 4, 30))
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'calls': self.calls}
+
+
+def test_cached_panel_reuses_result_for_same_range():
+    compute = Counter()
+
+    first = cached_panel('sales', *MARCH, compute)
+    second = cached_panel('sales', *MARCH, compute)
+
+    assert first == second == {'calls': 1}
+    assert compute.calls == 1
+
+
+def test_sales_write_invalidates_only_its_month(django_capture_on_commit_callbacks):
+    march, april = Counter(), Counter()
+    cached_panel('sales', *MARCH, march)
+    cached_panel('sales', *APRIL, april)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_version(SALES_SCOPE, date(2025, 3, 15))
+
+    cached_panel('sales', *MARCH, march)
+    cached_panel('sales', *APRIL, april)
+    assert march.calls == 2
+    assert april.calls == 1
+
+
+def test_order_save_invalidates_cached_sales(make_order, django_capture_on_commit_callbacks):
+    compute = Counter()
+    cached_panel('sales', *MARCH, compute)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2025, 3, 10))
+
+    cached_panel('sales', *MARCH, compute)
+    assert compute.calls == 2
+
+
+def test_variant_save_invalidates_inventory_panels(product_variant, django_capture_on_commit_callbacks):
+    compute = Counter()
+    cached_panel('low_stock', *MARCH, compute, scopes=(INVENTORY_SCOPE,))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product_variant.stock_quantity = 1
+        product_variant.save(update_fields=['stock_quantity'])
+
+    cached_panel('low_stock', *MARCH, compute, scopes=(INVENTORY_SCOPE,))
+    assert compute.calls == 2
+
+
+def test_panel_timeout_only_expires_open_ranges(settings, monkeypatch):
+    today = to_business_date(timezone.now())
+    monkeypatch.setattr(analytics_cache, 'is_shared_cache', lambda: True)
+
+    assert panel_timeout(today - timedelta(days=1)) is None
+    assert panel_timeout(today + timedelta(days=1)) == settings.ANALYTICS_CACHE_TTL
+
+
+def test_process_local_cache_expires_closed_ranges_too(settings):
+    today = to_business_date(timezone.now())
+
+    assert not is_shared_cache()
+    assert panel_timeout(today - timedelta(days=1)) == settings.ANALYTICS_CACHE_TTL
+
+
+def test_dashboard_panel_served_from_cache(admin_client, make_order, django_assert_max_num_queries,
+                                          django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order()
+    url = reverse('analytics:dashboard_panel', args=['summary'])
+    admin_client.get(url)
+
+    # Warm cache: only the session/user lookups remain
+    with django_assert_max_num_queries(2):
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    assert response.json()['data']['summary']['orders']['count'] == 1
+
+
+def test_reset_drops_cached_panels():
+    compute = Counter()
+    cached_panel('sales', *MARCH, compute)
+
+    reset_analytics_cache()
+
+    cached_panel('sales', *MARCH, compute)
+    assert compute.calls == 2
+
+
+def test_fallback_results_are_not_cached():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            note_fallback()
+            return {'empty': True}
+        return {'empty': False}
+
+    assert cached_panel('sales', *MARCH, flaky) == {'empty': True}
+    assert cached_panel('sales', *MARCH, flaky) == {'empty': False}
+    assert cached_panel('sales', *MARCH, flaky) == {'empty': False}
+    assert len(calls) == 2
+
+
+def test_getter_error_fallback_is_not_cached(monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(snapshot, 'product_sales', broken)
+    bounds = [make_business_aware(datetime.combine(day, time.min)) for day in MARCH]
+    result = cached_panel('sales', *MARCH, lambda: get_sales_data(*bounds))
+    assert result['orders']['count'] == 0
+
+    compute = Counter()
+    cached_panel('sales', *MARCH, compute)
+    assert compute.calls == 1
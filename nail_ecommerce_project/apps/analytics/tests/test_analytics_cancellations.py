@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics.cancellations import fit_cancellation_model, get_booking_feature_frame, \
+    score_open_bookings
+from nail_ecommerce_project.apps.analytics.models import BookingRiskScore, ReportLog
+from nail_ecommerce_project.apps.analytics.tests.conftest import business_datetime
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+
+pytestmark = pytest.mark.django_db
+
+CANCELLED, COMPLETED = BookingStatus.CANCELLED_SERVICE, BookingStatus.COMPLETED_SERVICE
+
+
+@pytest.fixture
+def book(make_booking):
+    """Factory: booking on `day`, made `lead_days` before it and resolved (if it is) on the day."""
+    def _create(day, lead_days=3, **kwargs):
+        booking = make_booking(day=day, **kwargs)
+        Booking.objects.filter(pk=booking.pk).update(
+            created_at=business_datetime(day - timedelta(days=lead_days)),
+            resolved_at=business_datetime(day) if booking.resolved_at else None,
+        )
+        return booking
+    return _create
+
+
+@pytest.fixture
+def booking_history(book, customer, make_customer):
+    """
+    `customer` always turns up (12 completed 10:00 bookings); `flaky` cancelled 8 of 10
+    11:00 bookings. Both have an upcoming confirmed booking.
+    """
+    flaky = make_customer(1)
+    start = date.today() - timedelta(days=90)
+    for i in range(12):
+        book(start + timedelta(days=i * 7))
+    for i in range(10):
+        book(start + timedelta(days=i * 7 + 1), time_slot='11:00', user=flaky,
+             status=CANCELLED if i < 8 else COMPLETED)
+    upcoming = date.today() + timedelta(days=5)
+    return {
+        'reliable': book(upcoming, status=BookingStatus.CONFIRMED_SERVICE),
+        'flaky': book(upcoming, time_slot='11:00', user=flaky, status=BookingStatus.CONFIRMED_SERVICE),
+    }
+
+
+def test_history_only_counts_bookings_before_this_one_was_made(book):
+    day = date(2025, 3, 1)
+    first = book(day, status=CANCELLED)
+    # Made after the first booking's date: it can know the first one was cancelled
+    second = book(day + timedelta(days=10), lead_days=8)
+    # Made before it: it can't
+    early = book(day + timedelta(days=20), lead_days=25)
+
+    df = get_booking_feature_frame(Booking.objects.all()).set_index('id')
+
+    assert df.loc[first.pk, ['prior_bookings', 'lead_days', 'cancelled']].tolist() == [0, 3, 1]
+    assert df.loc[second.pk, ['prior_bookings', 'prior_cancellation_rate', 'lead_days']].tolist() == [1, 1.0, 8]
+    assert df.loc[early.pk, ['prior_bookings', 'weekday']].tolist() == [0, (day + timedelta(days=20)).weekday()]
+
+
+def test_history_ignores_outcomes_recorded_after_this_booking_was_made(book):
+    day = date(2025, 3, 1)
+    late = book(day, status=CANCELLED)
+    # Cancelled weeks after its date, once the next booking had been made
+    Booking.objects.filter(pk=late.pk).update(resolved_at=business_datetime(day + timedelta(days=20)))
+    # Resolved before resolved_at was recorded: known once its date passed
+    legacy = book(day + timedelta(days=1), status=CANCELLED)
+    Booking.objects.filter(pk=legacy.pk).update(resolved_at=None)
+    scored = book(day + timedelta(days=14), lead_days=7)
+
+    df = get_booking_feature_frame(Booking.objects.filter(pk=scored.pk)).set_index('id')
+
+    assert df.loc[scored.pk, ['prior_bookings', 'prior_cancellation_rate']].tolist() == [1, 1.0]
+
+
+def test_resolving_a_booking_records_when(make_booking):
+    booking = make_booking(status=BookingStatus.CONFIRMED_SERVICE)
+    assert booking.resolved_at is None
+
+    booking.status = CANCELLED
+    booking.save()
+    assert booking.resolved_at is not None
+
+    booking.status = BookingStatus.CONFIRMED_SERVICE
+    booking.save()
+    assert booking.resolved_at is None
+
+
+def test_fit_scores_open_bookings(booking_history):
+    model = fit_cancellation_model()
+
+    assert model['n_samples'] == 22
+    scores = dict(BookingRiskScore.objects.values_list('booking_id', 'probability'))
+    assert set(scores) == {booking_history['reliable'].pk, booking_history['flaky'].pk}
+    assert scores[booking_history['flaky'].pk] > 10 * scores[booking_history['reliable'].pk]
+    assert ReportLog.objects.filter(report_type='PREDICT').count() == 1
+
+    # Resolved bookings lose their score on the next run
+    Booking.objects.filter(pk=booking_history['flaky'].pk).update(status=CANCELLED)
+    assert score_open_bookings() == 1
+    assert list(BookingRiskScore.objects.values_list('booking_id', flat=True)) == [booking_history['reliable'].pk]
+
+
+def test_command_needs_both_outcomes(book, capsys):
+    for i in range(25):
+        book(date(2025, 1, 1) + timedelta(days=i))
+
+    call_command('train_booking_risk_model')
+
+    assert 'Not enough completed and cancelled bookings yet' in capsys.readouterr().out
+    assert not BookingRiskScore.objects.exists()
+    call_command('train_booking_risk_model', score_only=True)
+    assert 'Scored 0 open bookings.' in capsys.readouterr().out
+
+
+def test_admin_booking_list_sorts_by_stored_risk(admin_client, booking_history):
+    call_command('train_booking_risk_model')
+    url = reverse('bookings_admin:bookings_list')
+
+    response = admin_client.get(url, {'sort': 'risk'})
+
+    bookings = list(response.context['bookings'])
+    assert bookings[:2] == [booking_history['flaky'], booking_history['reliable']]
+    assert f"{bookings[0].risk.percent}%".encode() in response.content
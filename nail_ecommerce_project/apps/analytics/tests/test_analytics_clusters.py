@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from nail_ecommerce_project.apps.analytics.utils import get_customer_clusters, get_customer_feature_frame
+
+pytestmark = pytest.mark.django_db
+
+
+def test_feature_frame_aggregates_orders_and_bookings(customer, make_order, make_booking, product_variant,
+                                                      django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(lines=[(product_variant, 2, Decimal("150.00"))])
+        make_order(lines=[(product_variant, 1, Decimal("100.00")), (product_variant, 1, Decimal("50.00"))])
+        make_booking(day=date(2025, 5, 1))
+
+    df = get_customer_feature_frame()
+
+    row = df.iloc[0].to_dict()
+    assert row['user_id'] == customer.id
+    assert row['name'] == "Analytics Customer"
+    assert row['total_value'] == 450.0
+    assert row['frequency'] == 3
+    assert row['avg_order_value'] == 225.0
+
+
+def test_feature_frame_handles_booking_only_customers(make_customer, make_booking,
+                                                     django_capture_on_commit_callbacks):
+    user = make_customer(1)
+    with django_capture_on_commit_callbacks(execute=True):
+        make_booking(user=user)
+
+    df = get_customer_feature_frame()
+
+    assert df['name'].tolist() == ["customer_1"]
+    assert df['avg_order_value'].tolist() == [0.0]
+
+
+def test_feature_frame_query_count_is_constant(make_customer, make_order, django_assert_num_queries,
+                                               django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        for index in range(10):
+            make_order(user=make_customer(index))
+
+    # One read of the metrics table, however many customers
+    with django_assert_num_queries(1):
+        df = get_customer_feature_frame()
+    assert len(df) == 10
+
+
+def test_clusters_assign_every_customer(make_customer, make_order, product_variant,
+                                       django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        for index in range(6):
+            make_order(user=make_customer(index), lines=[(product_variant, index + 1, Decimal("100.00"))])
+
+    result = get_customer_clusters()
+
+    assert len(result['names']) == 6
+    assert set(result['labels']) <= {0, 1, 2}
+    assert sorted(result['revenue']) == [100.0, 200.0, 300.0, 400.0, 500.0, 600.0]
+
+
+def test_clusters_with_fewer_customers_than_clusters(make_order, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order()
+
+    result = get_customer_clusters()
+
+    assert result['labels'] == [0]
+
+
+def test_clusters_empty_when_no_activity(db):
+    assert get_customer_clusters()['cluster_data'] == []
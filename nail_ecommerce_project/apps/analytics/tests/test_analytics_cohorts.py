@@ -0,0 +1,83 @@
+from datetime import date, datetime, time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.utils import get_cohort_retention
+from nail_ecommerce_project.apps.bookings.models import BookingStatus
+
+pytestmark = pytest.mark.django_db
+
+
+def _range(start_day, end_day):
+    return (
+        make_business_aware(datetime.combine(start_day, time.min)),
+        make_business_aware(datetime.combine(end_day, time.max)),
+    )
+
+
+@pytest.fixture
+def cohort_activity(customer, make_customer, make_order, make_booking):
+    """
+    January cohort: `customer` (orders in Jan and Mar) and customer_1 (booking in Jan, order in Feb).
+    February cohort: customer_2. customer_3 first bought in December, before the range.
+    """
+    first, second, early = make_customer(1), make_customer(2), make_customer(3)
+    make_order(day=date(2025, 1, 5))
+    make_order(day=date(2025, 1, 20))
+    make_order(day=date(2025, 3, 2))
+    make_booking(day=date(2025, 1, 10), user=first)
+    make_order(day=date(2025, 2, 14), user=first)
+    make_order(day=date(2025, 2, 3), user=second)
+    make_order(day=date(2024, 12, 30), user=early)
+    make_order(day=date(2025, 2, 1), user=early)
+
+
+def test_cohorts_group_by_first_month(cohort_activity):
+    result = get_cohort_retention(*_range(date(2025, 1, 1), date(2025, 3, 31)))
+
+    assert result['cohorts'] == [
+        {'month': '2025-01', 'size': 2, 'retention': [100.0, 50.0, 50.0]},
+        {'month': '2025-02', 'size': 1, 'retention': [100.0, 0.0]},
+    ]
+
+
+def test_cancelled_activity_does_not_count(customer, make_order, make_booking):
+    make_order(day=date(2025, 1, 5))
+    make_order(day=date(2025, 2, 5), status='CANCELLED')
+    make_booking(day=date(2025, 2, 6), status=BookingStatus.CANCELLED_SERVICE)
+
+    result = get_cohort_retention(*_range(date(2025, 1, 1), date(2025, 2, 28)))
+
+    assert result['cohorts'] == [{'month': '2025-01', 'size': 1, 'retention': [100.0, 0.0]}]
+
+
+def test_retention_is_one_query(cohort_activity, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        get_cohort_retention(*_range(date(2025, 1, 1), date(2025, 3, 31)))
+
+
+def test_panel_cached_per_month(admin_client, cohort_activity, django_assert_num_queries):
+    url = reverse('analytics:dashboard_panel', args=['cohorts'])
+    first = admin_client.get(url, {'start_date': '2025-01-01', 'end_date': '2025-03-31'}).json()
+    assert first['data']['figures']['cohort-heatmap']['data'][0]['y'] == ['2025-01 (2)', '2025-02 (1)']
+
+    # Another range over the same months is served from the cached entry: no cohort query
+    with django_assert_num_queries(2):  # session + user
+        admin_client.get(url, {'start_date': '2025-01-15', 'end_date': '2025-03-10'})
+
+
+def test_panel_follows_activity_before_the_range(admin_client, cohort_activity, make_order,
+                                                 django_capture_on_commit_callbacks):
+    url = reverse('analytics:dashboard_panel', args=['cohorts'])
+    query = {'start_date': '2025-01-01', 'end_date': '2025-03-31'}
+    admin_client.get(url, query)
+
+    # customer_2's first purchase moves back to November, out of the February cohort
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2024, 11, 20), user=get_user_model().objects.get(username='customer_2'))
+
+    figure = admin_client.get(url, query).json()['data']['figures']['cohort-heatmap']
+    assert figure['data'][0]['y'] == ['2025-01 (2)']
@@ -0,0 +1,101 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from nail_ecommerce_project.apps.analytics.customer_metrics import rebuild_customer_metrics
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.models import CustomerMetrics
+from nail_ecommerce_project.apps.analytics.utils import get_customer_segments
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+
+pytestmark = pytest.mark.django_db
+
+
+def test_order_lines_do_not_inflate_counts(customer, make_order, product_variant):
+    # Charged prices differ from the catalogue price (200.00)
+    make_order(day=date(2025, 3, 3), lines=[
+        (product_variant, 2, Decimal('150.00')),
+        (product_variant, 1, Decimal('120.00')),
+        (product_variant, 1, Decimal('80.00')),
+    ])
+
+    rebuild_customer_metrics()
+
+    metrics = CustomerMetrics.objects.get(user=customer)
+    assert metrics.order_count == 1
+    assert metrics.order_value == Decimal('500.00')
+    assert metrics.first_activity == metrics.last_activity
+
+
+def test_cancelled_activity_and_unfinished_bookings(customer, make_order, make_booking):
+    make_order(status='CANCELLED')
+    completed = make_booking(day=date(2025, 3, 5))
+    make_booking(day=date(2025, 3, 6), status=BookingStatus.CONFIRMED_SERVICE)
+    make_booking(day=date(2025, 3, 7), status=BookingStatus.CANCELLED_SERVICE)
+
+    rebuild_customer_metrics()
+
+    metrics = CustomerMetrics.objects.get(user=customer)
+    assert (metrics.order_count, metrics.booking_count, metrics.frequency) == (0, 2, 2)
+    # Only the completed booking has been paid for
+    paid = Booking.objects.with_final_price().get(pk=completed.pk).final_price
+    assert metrics.booking_value == metrics.monetary == paid.quantize(Decimal('0.01'))
+
+
+def test_metrics_follow_order_changes_on_commit(customer, make_order, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        order = make_order()
+    assert CustomerMetrics.objects.get(user=customer).monetary == Decimal('200.00')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        order.status = 'CANCELLED'
+        order.save()
+    assert not CustomerMetrics.objects.filter(user=customer).exists()
+
+
+def test_segments_read_metrics_sorted_by_spend(make_customer, make_order, product_variant,
+                                               django_capture_on_commit_callbacks, django_assert_num_queries):
+    with django_capture_on_commit_callbacks(execute=True):
+        for index, quantity in enumerate([1, 5, 3]):
+            make_order(day=date(2025, 3, 10), user=make_customer(index, full_name=f"Customer {index}"),
+                       lines=[(product_variant, quantity, Decimal('100.00'))])
+        make_order(day=date(2025, 1, 10), user=make_customer(9), lines=[(product_variant, 9, Decimal('100.00'))])
+
+    start = make_business_aware(datetime.combine(date(2025, 3, 1), time.min))
+    end = make_business_aware(datetime.combine(date(2025, 3, 31), time.max))
+    with django_assert_num_queries(3):
+        segments = get_customer_segments(start, end)
+
+    assert [s['name'] for s in segments] == ["Customer 1", "Customer 2", "Customer 0"]
+    assert segments[0]['total_spent'] == Decimal('500.00')
+    assert segments[0]['order_count'] == 1
+
+
+def test_segments_only_count_activity_in_range(customer, make_customer, make_order, product_variant):
+    # Active before and after March, never during it
+    make_order(day=date(2025, 2, 10), lines=[(product_variant, 4, Decimal('100.00'))])
+    make_order(day=date(2025, 4, 10), lines=[(product_variant, 4, Decimal('100.00'))])
+    regular = make_customer(1, full_name="Regular")
+    make_order(day=date(2025, 1, 10), user=regular, lines=[(product_variant, 9, Decimal('100.00'))])
+    make_order(day=date(2025, 3, 10), user=regular, lines=[(product_variant, 1, Decimal('100.00'))])
+    rebuild_customer_metrics()
+
+    start = make_business_aware(datetime.combine(date(2025, 3, 1), time.min))
+    end = make_business_aware(datetime.combine(date(2025, 3, 31), time.max))
+    segments = get_customer_segments(start, end)
+
+    assert [s['name'] for s in segments] == ["Regular"]
+    assert segments[0]['total_spent'] == Decimal('100.00')
+    assert segments[0]['order_count'] == 1
+    assert segments[0]['last_activity'].date() == date(2025, 3, 10)
+
+
+def test_rebuild_command(customer, make_order, capsys):
+    make_order()
+
+    call_command('rebuild_customer_metrics', chunk_size=1)
+
+    assert CustomerMetrics.objects.get(user=customer).frequency == 1
+    assert 'Customer metrics rebuilt: 1 active' in capsys.readouterr().out
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics.downsampling import (
+    choose_resolution, downsample_series, fill_daily, lttb, resample,
+)
+
+
+@pytest.mark.parametrize('days, resolution', [(31, 'day'), (92, 'day'), (93, 'week'), (731, 'week'), (732, 'month')])
+def test_resolution_follows_range_length(days, resolution):
+    start = date(2024, 1, 1)
+    assert choose_resolution(start, start + timedelta(days=days - 1)) == resolution
+
+
+def test_weekly_buckets_start_on_monday():
+    # 2025-03-05 is a Wednesday
+    dates, values = fill_daily([np.datetime64('2025-03-05'), np.datetime64('2025-03-10')], [2, 3],
+                               date(2025, 3, 5), date(2025, 3, 16))
+
+    buckets, totals = resample(dates, values, 'week')
+    assert [str(d) for d in buckets] == ['2025-03-03', '2025-03-10']
+    assert totals.tolist() == [2.0, 3.0]
+
+    _, means = resample(dates, values, 'week', how='mean')
+    # Partial first week only covers Wed..Sun
+    assert means.tolist() == pytest.approx([2 / 5, 3 / 7])
+
+
+def test_monthly_buckets_sum_values():
+    dates, values = fill_daily([], [], date(2025, 1, 30), date(2025, 3, 2))
+    buckets, totals = resample(dates, values + 1, 'month')
+
+    assert [str(d) for d in buckets] == ['2025-01-01', '2025-02-01', '2025-03-01']
+    assert totals.tolist() == [2.0, 28.0, 2.0]
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 50
+
+    keep = lttb(x, y, 50)
+
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert 437 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_downsample_caps_points(settings):
+    settings.ANALYTICS_CHART_MAX_POINTS = 40
+    dates, values = fill_daily([], [], date(2020, 1, 1), date(2022, 12, 31))
+
+    out_dates, out_values = downsample_series(dates, values, 'day')
+
+    assert len(out_dates) == len(out_values) == 40
+
+
+@pytest.mark.django_db
+def test_forecast_panel_sends_compact_bucketed_series(admin_client, make_order, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2024, 2, 10))
+        make_order(day=date(2024, 11, 20))
+
+    response = admin_client.get(reverse('analytics:dashboard_panel', args=['forecast']),
+                                {'start_date': '2024-01-01', 'end_date': '2024-12-31'})
+
+    data = response.json()['data']
+    assert data['resolution'] == 'week'
+    orders = data['charts']['forecast-order']['traces'][0]
+    assert orders['type'] == 'line'
+    assert len(orders['x']) == len(orders['y']) == 53
+    revenue = data['charts']['forecast-chart']['traces']
+    assert [t['name'] for t in revenue] == ['Orders']
+    assert len(revenue[0]['x']) == 53
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics import exports
+from nail_ecommerce_project.apps.analytics.models import AnalyticsExportLog
+from nail_ecommerce_project.apps.bookings.models import BookingStatus
+
+pytestmark = pytest.mark.django_db
+
+RANGE = {'start_date': '2025-03-01', 'end_date': '2025-03-31'}
+
+
+@pytest.fixture
+def march_sales(make_order, make_booking, product_variant):
+    make_order(day=date(2025, 3, 10), lines=[(product_variant, 2, Decimal("150.00"))])
+    make_order(day=date(2025, 3, 11), status='CANCELLED')
+    make_order(day=date(2025, 4, 2))
+    make_booking(day=date(2025, 3, 12), number_of_customers=2, is_home_service=True)
+    make_booking(day=date(2025, 3, 13), status=BookingStatus.CONFIRMATION_PENDING)
+
+
+def test_csv_export_streams_every_order_line_and_completed_booking(admin_client, march_sales):
+    response = admin_client.get(reverse('analytics:export_rows'), {**RANGE, 'format': 'csv'})
+
+    assert response.status_code == 200
+    assert response.streaming
+    rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+    assert [row['record_type'] for row in rows] == ['order_line', 'order_line', 'booking']
+    assert rows[0]['amount'] == '300.00'
+    assert rows[1]['status'] == 'CANCELLED'
+    # 1000 - 5% = 950 per head, 2 heads less 5% group discount, plus the 250 home visit fee
+    assert rows[2]['amount'] == '2055.00'
+
+
+def test_ndjson_export_is_one_object_per_line(admin_client, march_sales):
+    response = admin_client.get(reverse('analytics:export_rows'), {**RANGE, 'format': 'ndjson'})
+
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert len(records) == 3
+    assert records[0]['date'] == '2025-03-10'
+
+
+def test_export_is_logged_with_row_count_and_duration(admin_client, march_sales):
+    response = admin_client.get(reverse('analytics:export_rows'), {**RANGE, 'format': 'csv'})
+    b''.join(response.streaming_content)
+
+    log = AnalyticsExportLog.objects.get(export_type='rows_csv')
+    assert log.success
+    assert log.row_count == 3
+    assert log.duration_ms is not None
+
+
+def test_export_fetches_rows_in_chunks(admin_client, make_order, monkeypatch):
+    monkeypatch.setattr(exports, 'EXPORT_CHUNK_SIZE', 2)
+    for day in range(1, 6):
+        make_order(day=date(2025, 3, day))
+
+    rows = list(exports.iter_order_line_rows(date(2025, 3, 1), date(2025, 3, 31)))
+
+    assert len(rows) == 5
+
+
+@pytest.mark.parametrize('params', [
+    {**RANGE, 'format': 'xlsx'},
+    {'format': 'csv'},
+    {'start_date': '03/01/2025', 'end_date': '2025-03-31'},
+])
+def test_export_rejects_bad_parameters(admin_client, params):
+    response = admin_client.get(reverse('analytics:export_rows'), params)
+    assert response.status_code == 400
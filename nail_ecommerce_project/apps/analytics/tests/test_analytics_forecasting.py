@@ -0,0 +1,86 @@
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pytest
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics import forecasting
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware, to_business_date
+from nail_ecommerce_project.apps.analytics.forecasting import (
+    fit_holt_winters, forecast_holt_winters, forecast_series, get_series_fit,
+)
+from nail_ecommerce_project.apps.analytics.utils import TIME_SERIES_COLUMNS, get_time_series_forecast
+
+pytestmark = pytest.mark.django_db
+
+
+def day_range(start_day, end_day):
+    return (
+        make_business_aware(datetime.combine(start_day, time.min)),
+        make_business_aware(datetime.combine(end_day, time.max)),
+    )
+
+
+def test_holt_winters_projects_weekly_pattern():
+    t = np.arange(10 * 7)
+    y = 10 + 5 * (t % 7 == 5) + np.random.default_rng(0).normal(0, 0.3, len(t))
+
+    mean, lower, upper = forecast_holt_winters(fit_holt_winters(y), 14)
+
+    expected = 10 + 5 * (np.arange(len(t), len(t) + 14) % 7 == 5)
+    assert np.abs(mean - expected).max() < 1.5
+    assert np.all(lower <= mean) and np.all(mean <= upper)
+    # Uncertainty grows with the horizon
+    assert (upper - lower)[-1] > (upper - lower)[0]
+
+
+@pytest.mark.parametrize('history', [[], [3.0], [1.0, 2.0, 3.0]])
+def test_holt_winters_handles_short_history(history):
+    mean, lower, upper = forecast_holt_winters(fit_holt_winters(history), 7)
+
+    assert len(mean) == 7
+    assert np.all(np.isfinite(mean)) and np.all(lower >= 0)
+
+
+def test_empty_range_returns_typed_frames():
+    order_df, booking_df = get_time_series_forecast(*day_range(date(2020, 1, 1), date(2020, 1, 31)))
+
+    assert list(order_df.columns) == TIME_SERIES_COLUMNS
+    assert (order_df['kind'] == 'actual').all()
+    assert order_df['count'].sum() == 0
+    assert list(booking_df.columns) == TIME_SERIES_COLUMNS
+
+
+def test_current_range_appends_forecast(make_order, settings):
+    settings.ANALYTICS_FORECAST_HORIZON = 5
+    today = to_business_date(timezone.now())
+    for offset in range(1, 15):
+        make_order(day=today - timedelta(days=offset))
+
+    order_df, _ = get_time_series_forecast(*day_range(today - timedelta(days=13), today))
+
+    forecast = order_df[order_df['kind'] == 'forecast']
+    assert len(forecast) == 5
+    assert forecast['date'].min().date() == today
+    assert (forecast['lower'] <= forecast['upper']).all()
+
+
+def test_fit_is_cached_until_new_day_lands(make_order, monkeypatch):
+    today = to_business_date(timezone.now())
+    make_order(day=today - timedelta(days=3))
+    fits = []
+    real_fit = forecasting.fit_holt_winters
+    monkeypatch.setattr(forecasting, 'fit_holt_winters', lambda y: fits.append(len(y)) or real_fit(y))
+
+    get_series_fit('orders', as_of=today)
+    get_series_fit('orders', as_of=today)
+    assert len(fits) == 1
+
+    # Today's orders don't change the closed-day history
+    make_order(day=today)
+    forecast_series('orders', as_of=today)
+    assert len(fits) == 1
+
+    make_order(day=today - timedelta(days=1))
+    get_series_fit('orders', as_of=today)
+    assert len(fits) == 2
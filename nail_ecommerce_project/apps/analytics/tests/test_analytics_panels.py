@@ -0,0 +1,118 @@
+import time
+from datetime import date
+
+import pytest
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics.models import ReportLog
+from nail_ecommerce_project.apps.analytics.panels import PANELS, compute_panels
+
+pytestmark = pytest.mark.django_db
+
+RANGE = {'start_date': '2025-03-01', 'end_date': '2025-03-31'}
+
+
+def test_dashboard_renders_shell_without_computing_panels(admin_client, django_assert_max_num_queries):
+    # Session/user lookups plus the ReportLog insert; no analytics queries
+    with django_assert_max_num_queries(3):
+        response = admin_client.get(reverse('analytics:dashboard'), RANGE)
+
+    assert response.status_code == 200
+    assert response.context['range_query'] == 'start_date=2025-03-01&end_date=2025-03-31'
+    assert set(response.context['panels']) == set(PANELS)
+    assert ReportLog.objects.filter(report_type='SALES').count() == 1
+
+
+@pytest.mark.parametrize('panel', list(PANELS))
+def test_every_panel_returns_json(admin_client, make_order, make_booking, panel):
+    make_order(day=date(2025, 3, 10))
+    make_booking(day=date(2025, 3, 12))
+
+    response = admin_client.get(reverse('analytics:dashboard_panel', args=[panel]), RANGE)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload['panel'] == panel
+    assert payload['error'] is None
+    assert payload['data'] is not None
+
+
+def test_failing_panel_reports_its_own_error(admin_client, monkeypatch):
+    def broken(start_date, end_date):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(PANELS, 'clusters', PANELS['clusters']._replace(build=broken))
+
+    failed = admin_client.get(reverse('analytics:dashboard_panel', args=['clusters']), RANGE)
+    healthy = admin_client.get(reverse('analytics:dashboard_panel', args=['summary']), RANGE)
+
+    assert failed.status_code == 500
+    assert failed.json()['error']
+    assert healthy.status_code == 200
+
+
+def test_unknown_panel_is_404(admin_client):
+    response = admin_client.get(reverse('analytics:dashboard_panel', args=['nope']))
+    assert response.status_code == 404
+
+
+def test_invalid_range_is_400(admin_client):
+    response = admin_client.get(reverse('analytics:dashboard_panel', args=['summary']),
+                                {'start_date': 'yesterday', 'end_date': '2025-03-31'})
+    assert response.status_code == 400
+
+
+def test_panel_endpoints_require_superuser(client, customer):
+    client.force_login(customer)
+    response = client.get(reverse('analytics:dashboard_panel', args=['summary']))
+    assert response.status_code == 302
+
+
+def test_all_panels_endpoint_isolates_failures(admin_client, monkeypatch):
+    def broken(start_date, end_date):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(PANELS, 'forecast', PANELS['forecast']._replace(build=broken))
+
+    response = admin_client.get(reverse('analytics:dashboard_panels'), RANGE)
+
+    results = response.json()['panels']
+    assert set(results) == set(PANELS)
+    assert results['forecast']['error']
+    assert all(results[name]['error'] is None for name in PANELS if name != 'forecast')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compute_panels_runs_concurrently(settings, monkeypatch):
+    settings.ANALYTICS_PANEL_WORKERS = 4
+    threads = set()
+
+    def record(start_date, end_date):
+        import threading
+        threads.add(threading.current_thread().name)
+        return {}
+
+    for name in ('summary', 'comparison'):
+        monkeypatch.setitem(PANELS, name, PANELS[name]._replace(build=record))
+
+    results = compute_panels(date(2025, 3, 1), date(2025, 3, 31), ['summary', 'comparison'])
+
+    assert all(result['error'] is None for result in results.values())
+    assert all(name.startswith('analytics-panel') for name in threads)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compute_panels_holds_each_panel_to_its_own_timeout(settings, monkeypatch):
+    settings.ANALYTICS_PANEL_WORKERS = 4
+
+    def slow(start_date, end_date):
+        time.sleep(1)
+        return {}
+
+    monkeypatch.setitem(PANELS, 'summary', PANELS['summary']._replace(build=slow, timeout=0.2))
+    monkeypatch.setitem(PANELS, 'comparison', PANELS['comparison']._replace(build=lambda s, e: {}, timeout=5))
+
+    results = compute_panels(date(2025, 3, 1), date(2025, 3, 31), ['summary', 'comparison'])
+
+    assert results['summary']['error'] == 'Timed out.'
+    assert results['comparison']['error'] is None
@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics.models import ProductRecommendation
+from nail_ecommerce_project.apps.analytics.recommendations import read_meta, rebuild_recommendations
+from nail_ecommerce_project.apps.products.models import Product, ProductVariant
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_settle_delay(settings):
+    settings.ANALYTICS_RECOMMENDATIONS_SETTLE_SECONDS = 0
+
+
+@pytest.fixture
+def catalog(product_variant):
+    """Gel Polish plus Top Coat, Base Coat and Remover variants."""
+    variants = {'gel': product_variant}
+    for name in ('Top Coat', 'Base Coat', 'Remover'):
+        product = Product.objects.create(name=name)
+        variants[name] = ProductVariant.objects.create(
+            product=product, size="10ml", color="Clear", price=Decimal("150.00"), stock_quantity=50
+        )
+    return variants
+
+
+def _order(make_order, *variants, status='DELIVERED'):
+    return make_order(status=status, lines=[(variant, 1, variant.price) for variant in variants])
+
+
+def _recommended(product):
+    return list(
+        ProductRecommendation.objects.filter(product=product).order_by('rank')
+        .values_list('recommended__name', 'score')
+    )
+
+
+def test_top_neighbours_ranked_by_shared_orders(catalog, make_order):
+    gel, top, base = catalog['gel'], catalog['Top Coat'], catalog['Base Coat']
+    _order(make_order, gel, top)
+    _order(make_order, gel, top, base)
+    # Two variants of one product in one order still count the pair once
+    _order(make_order, gel, top, top)
+    _order(make_order, gel, catalog['Remover'], status='CANCELLED')
+
+    result = rebuild_recommendations()
+
+    assert result['orders'] == 3
+    assert _recommended(gel.product) == [('Top Coat', 3), ('Base Coat', 1)]
+    assert _recommended(base.product) == [('Gel Polish', 1), ('Top Coat', 1)]
+
+
+def test_rebuild_only_folds_in_new_orders(catalog, make_order, settings):
+    gel, top, remover = catalog['gel'], catalog['Top Coat'], catalog['Remover']
+    _order(make_order, gel, top)
+    first = rebuild_recommendations()
+
+    _order(make_order, gel, remover)
+    _order(make_order, gel, remover)
+    second = rebuild_recommendations()
+
+    assert second['orders'] == 2
+    assert second['watermark'] > first['watermark']
+    assert read_meta()['watermark'] == second['watermark']
+    # Top Coat's neighbours weren't touched by the new orders and keep their rows
+    assert second['products'] == 2
+    assert _recommended(gel.product) == [('Remover', 2), ('Top Coat', 1)]
+    assert _recommended(top.product) == [('Gel Polish', 1)]
+
+    settings.ANALYTICS_RECOMMENDATIONS_SETTLE_SECONDS = 3600
+    _order(make_order, gel, top)
+    assert rebuild_recommendations()['orders'] == 0
+
+
+def test_full_rebuild_matches_incremental(catalog, make_order):
+    gel, top, base = catalog['gel'], catalog['Top Coat'], catalog['Base Coat']
+    _order(make_order, gel, top)
+    rebuild_recommendations()
+    _order(make_order, base, top)
+    rebuild_recommendations()
+    incremental = {p.name: _recommended(p) for p in Product.objects.all()}
+
+    call_command('rebuild_recommendations', full=True)
+
+    assert {p.name: _recommended(p) for p in Product.objects.all()} == incremental
+
+
+def test_product_page_reads_recommendations_in_one_query(client, catalog, make_order):
+    gel, top, base = catalog['gel'], catalog['Top Coat'], catalog['Base Coat']
+    _order(make_order, gel, top)
+    _order(make_order, gel, base)
+    rebuild_recommendations()
+    Product.objects.filter(pk=base.product_id).update(is_available=False)
+    url = reverse('products:product_detail', args=[gel.product.slug])
+
+    response = client.get(url)
+
+    assert response.context['recommendations'] == [top.product]
+    assert b'Frequently Bought Together' in response.content
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert sum('analytics_productrecommendation' in q['sql'] for q in queries.captured_queries) == 1
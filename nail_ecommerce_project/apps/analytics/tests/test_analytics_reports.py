@@ -0,0 +1,89 @@
+import json
+from datetime import date
+
+import pytest
+from django.urls import reverse
+
+from nail_ecommerce_project.apps.analytics import reports
+from nail_ecommerce_project.apps.analytics.models import ReportLog
+from nail_ecommerce_project.apps.analytics.panels import PANELS
+from nail_ecommerce_project.apps.analytics.reports import run_report, submit_report
+
+pytestmark = pytest.mark.django_db
+
+SHORT_RANGE = {'start_date': '2025-03-01', 'end_date': '2025-03-31'}
+LONG_RANGE = {'start_date': '2024-01-01', 'end_date': '2024-12-31'}
+
+
+def test_short_range_stays_synchronous(admin_client):
+    response = admin_client.get(reverse('analytics:dashboard'), SHORT_RANGE)
+
+    assert response.context['report'] is None
+    log = ReportLog.objects.get(report_type='SALES')
+    assert log.status == ReportLog.STATUS_SUCCESS
+
+
+def test_long_range_dashboard_runs_as_background_job(admin_client, make_order,
+                                                     django_capture_on_commit_callbacks):
+    make_order(day=date(2024, 6, 1))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.get(reverse('analytics:dashboard'), LONG_RANGE)
+
+    report = response.context['report']
+    assert b'data-report-job' in response.content
+    report.refresh_from_db()
+    assert report.status == ReportLog.STATUS_SUCCESS
+    assert report.duration_ms is not None and report.finished_at is not None
+
+    status = admin_client.get(reverse('analytics:report_status', args=[report.pk])).json()
+    assert status['status'] == 'SUCCESS'
+    result = admin_client.get(status['result_url'])
+    assert set(json.loads(b''.join(result.streaming_content))['panels']) == set(PANELS)
+
+
+def test_threshold_is_configurable(admin_client, settings):
+    settings.ANALYTICS_ASYNC_THRESHOLD_DAYS = 7
+
+    response = admin_client.get(reverse('analytics:dashboard'), SHORT_RANGE)
+
+    assert response.context['report'].status == ReportLog.STATUS_PENDING
+
+
+def test_reload_reuses_unfinished_job(superuser):
+    first = submit_report(superuser, 'SALES', 'dashboard', date(2024, 1, 1), date(2024, 12, 31))
+    second = submit_report(superuser, 'SALES', 'dashboard', date(2024, 1, 1), date(2024, 12, 31))
+
+    assert first.pk == second.pk
+    assert ReportLog.objects.count() == 1
+
+
+def test_long_export_is_prepared_in_background(admin_client, make_order, django_capture_on_commit_callbacks):
+    make_order(day=date(2024, 6, 1))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.get(reverse('analytics:export_csv'), LONG_RANGE)
+
+    assert response.status_code == 202
+    report = ReportLog.objects.get(report_type='EXPORT')
+    assert report.status == ReportLog.STATUS_SUCCESS
+    assert bytes(report.result_data).startswith(b'Type,Item,Total Revenue')
+
+    download = admin_client.get(reverse('analytics:report_result', args=[report.pk]))
+    assert download['Content-Disposition'].startswith('attachment')
+
+
+def test_failed_job_is_recorded(superuser, monkeypatch):
+    def broken(report, f):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(reports.REPORT_KINDS, 'dashboard', (broken, 'json', 'application/json'))
+    report = submit_report(superuser, 'SALES', 'dashboard', date(2024, 1, 1), date(2024, 12, 31))
+
+    run_report(report.pk)
+
+    report.refresh_from_db()
+    assert report.status == ReportLog.STATUS_FAILED
+    assert report.error_message == 'boom'
+    # Finished jobs are never picked up twice
+    assert run_report(report.pk) is None
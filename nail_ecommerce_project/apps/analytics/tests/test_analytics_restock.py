@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.dates import to_business_date
+from nail_ecommerce_project.apps.analytics.models import RestockSuggestion
+from nail_ecommerce_project.apps.analytics.restock import plan_restock, refresh_restock_suggestions
+from nail_ecommerce_project.apps.products.models import Product, ProductVariant
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def restock_settings(settings):
+    settings.ANALYTICS_RESTOCK_HISTORY_DAYS = 28
+    settings.ANALYTICS_RESTOCK_LEAD_DAYS = 7
+    settings.ANALYTICS_RESTOCK_COVER_DAYS = 21
+
+
+@pytest.fixture
+def yesterday():
+    return to_business_date(timezone.now()) - timedelta(days=1)
+
+
+@pytest.fixture
+def slow_mover(db):
+    product = Product.objects.create(name="Cuticle Oil", slug="cuticle-oil")
+    return ProductVariant.objects.create(
+        product=product, size="15ml", color="Clear", price=Decimal("150.00"), stock_quantity=4
+    )
+
+
+@pytest.fixture
+def sales_history(make_order, product_variant, slow_mover, yesterday):
+    """Gel Polish sells 2 a day for the last 10 days; Cuticle Oil once in that time."""
+    for offset in range(10):
+        make_order(day=yesterday - timedelta(days=offset), lines=[(product_variant, 2, product_variant.price)])
+    make_order(day=yesterday, lines=[(slow_mover, 1, slow_mover.price)])
+    make_order(day=yesterday, status='CANCELLED', lines=[(product_variant, 50, product_variant.price)])
+    # Today hasn't closed yet
+    make_order(day=yesterday + timedelta(days=1), lines=[(product_variant, 9, product_variant.price)])
+    ProductVariant.objects.filter(pk=product_variant.pk).update(stock_quantity=10)
+
+
+def test_plan_restock_levels():
+    units = np.array([[2.0] * 10, [0.0] * 9 + [1.0], [0.0] * 10])
+    stock = np.array([10, 4, 0])
+
+    demand, reorder_point, target_stock, reorder_quantity = plan_restock(units, stock, lead_days=7, cover_days=21)
+
+    np.testing.assert_allclose(demand, [2.0, 0.1, 0.0])
+    # Steady sales need no safety stock: 2/day x 7 days lead time, 2/day x 28 days target
+    assert (reorder_point[0], target_stock[0], reorder_quantity[0]) == (14, 56, 46)
+    # The occasional sale is covered for the lead time by 4 in stock
+    assert reorder_point[1] == np.ceil(0.7 + 1.65 * 0.3 * np.sqrt(7)) == 3
+    assert reorder_quantity[1] == 0
+    # Nothing selling is never due for a reorder, even out of stock
+    assert reorder_quantity[2] == 0
+
+
+def test_refresh_averages_closed_days_of_trading(sales_history, product_variant, slow_mover):
+    result = refresh_restock_suggestions()
+
+    # The shop has traded for 10 days, fewer than the 28-day window
+    assert result == {
+        'variants': 2, 'reorder': 1, 'history_days': 10,
+        'end_day': to_business_date(timezone.now()) - timedelta(days=1),
+    }
+    gel = RestockSuggestion.objects.select_related('variant').get(variant=product_variant)
+    assert (gel.daily_demand, gel.reorder_point, gel.target_stock) == (2.0, 14, 56)
+    assert (gel.days_of_cover, gel.reorder_quantity) == (5.0, 46)
+    oil = RestockSuggestion.objects.get(variant=slow_mover)
+    assert (oil.daily_demand, oil.days_of_cover, oil.reorder_quantity) == (0.1, 40.0, 0)
+
+
+def test_cover_follows_current_stock(sales_history, product_variant):
+    refresh_restock_suggestions()
+    ProductVariant.objects.filter(pk=product_variant.pk).update(stock_quantity=60)
+
+    gel = RestockSuggestion.objects.with_cover().select_related('variant').get(variant=product_variant)
+
+    assert (gel.cover, gel.days_of_cover, gel.reorder_quantity) == (30.0, 30.0, 0)
+    assert not RestockSuggestion.objects.needing_reorder().exists()
+
+
+def test_refresh_updates_rows_in_place(sales_history, product_variant, yesterday):
+    refresh_restock_suggestions()
+    call_command('refresh_restock_suggestions', end=(yesterday + timedelta(days=20)).isoformat())
+
+    gel = RestockSuggestion.objects.get(variant=product_variant)
+    assert RestockSuggestion.objects.count() == 2
+    # Full 28-day window: the last 8 days of steady sales plus the 9 sold "today"
+    assert gel.history_days == 28
+    assert gel.daily_demand == pytest.approx((8 * 2 + 9) / 28, abs=1e-4)
+
+
+def test_dashboard_panel_and_inventory_tab(admin_client, sales_history, product_variant,
+                                           django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        refresh_restock_suggestions()
+
+    response = admin_client.get(reverse('analytics:dashboard_panel', args=['restock']))
+    rows = response.json()['data']['rows']
+    assert [(r['product__name'], r['days_of_cover'], r['reorder_quantity']) for r in rows] == [
+        ('Gel Polish', 5.0, 46),
+    ]
+
+    response = admin_client.get(reverse('orders_admin:order_list'), {'tab': 'inventory'})
+    assert [s.variant_id for s in response.context['restock_suggestions']] == [product_variant.id]
+    assert b'Reorder 46' in response.content
+    assert b'5.0 days of cover' in response.content
@@ -0,0 +1,139 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.models import DailyProductSales, DailyServiceSales
+from nail_ecommerce_project.apps.analytics.rollups import flush_dirty_days, rebuild_product_sales, rebuild_service_sales
+from nail_ecommerce_project.apps.analytics.utils import get_sales_data, get_top_products_vs_services
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus
+from nail_ecommerce_project.apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+DAY = date(2025, 3, 10)
+
+
+def day_range(start_day, end_day):
+    return (
+        make_business_aware(datetime.combine(start_day, time.min)),
+        make_business_aware(datetime.combine(end_day, time.max)),
+    )
+
+
+def test_product_rollup_uses_price_at_order_and_quantity(make_order, product_variant):
+    make_order(day=DAY, lines=[(product_variant, 3, Decimal("150.00"))])
+    make_order(day=DAY, lines=[(product_variant, 1, Decimal("200.00"))])
+
+    rebuild_product_sales(DAY, DAY)
+
+    rollup = DailyProductSales.objects.get(day=DAY, product=product_variant.product, status='DELIVERED')
+    assert rollup.units == 4
+    assert rollup.revenue == Decimal("650.00")
+    assert rollup.order_count == 2
+
+
+def test_product_rollup_buckets_by_business_day(make_order):
+    # 01:00 business time is still the previous day in UTC
+    make_order(day=DAY, hour=1)
+
+    rebuild_product_sales(DAY - timedelta(days=1), DAY)
+
+    assert list(DailyProductSales.objects.values_list('day', flat=True)) == [DAY]
+
+
+def test_service_rollup_uses_final_booking_price(make_booking):
+    make_booking(day=DAY, number_of_customers=3)
+    make_booking(day=DAY, time_slot='11:00', is_home_service=True)
+
+    rebuild_service_sales(DAY, DAY)
+
+    rollup = DailyServiceSales.objects.get(day=DAY, status=BookingStatus.COMPLETED_SERVICE)
+    assert rollup.bookings == 2
+    assert rollup.customers == 4
+    # 3 × 950 less 5% group discount, plus 950 + 250 home visit fee
+    assert rollup.revenue == Decimal("2707.50") + Decimal("1200.00")
+
+
+@pytest.mark.parametrize('price, customers, is_home_service', [
+    (Decimal("1000.00"), 1, False),
+    (Decimal("1000.00"), 5, True),
+    (Decimal("799.99"), 2, True),
+    (Decimal("349.50"), 4, False),
+])
+def test_final_price_annotation_matches_model(make_booking, price, customers, is_home_service):
+    service = Service.objects.create(title="Pedicure", price=price)
+    booking = make_booking(day=DAY, booking_service=service, number_of_customers=customers,
+                           is_home_service=is_home_service)
+
+    annotated = Booking.objects.with_final_price().get(pk=booking.pk)
+
+    assert annotated.final_price == booking.get_final_price()
+
+
+def test_rebuild_replaces_stale_rows(make_order):
+    order = make_order(day=DAY)
+    rebuild_product_sales(DAY, DAY)
+
+    order.items.all().delete()
+    order.delete()
+    rebuild_product_sales(DAY, DAY)
+
+    assert not DailyProductSales.objects.exists()
+
+
+def test_signals_refresh_rollups_on_commit(make_order, make_booking, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        order = make_order(day=DAY, status='PROCESSING')
+        booking = make_booking(day=DAY)
+
+    assert DailyProductSales.objects.get(day=DAY).status == 'PROCESSING'
+    assert DailyServiceSales.objects.get(day=DAY).bookings == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        order.status = 'CANCELLED'
+        order.save()
+        booking.date = DAY + timedelta(days=1)
+        booking.save()
+
+    assert DailyProductSales.objects.get(day=DAY).status == 'CANCELLED'
+    assert list(DailyServiceSales.objects.values_list('day', flat=True)) == [DAY + timedelta(days=1)]
+
+
+def test_one_flush_per_commit(make_order, product_variant, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        make_order(day=DAY, lines=[(product_variant, 1, Decimal("100.00"))] * 5)
+        make_order(day=DAY + timedelta(days=1))
+
+    assert [callback for callback in callbacks if callback is flush_dirty_days] == [flush_dirty_days]
+    assert DailyProductSales.objects.filter(day__in=[DAY, DAY + timedelta(days=1)]).count() == 2
+
+
+def test_dashboard_functions_read_rollups(make_order, make_booking, product_variant):
+    make_order(day=DAY, lines=[(product_variant, 2, Decimal("180.00"))])
+    make_order(day=DAY, status='CANCELLED')
+    make_booking(day=DAY)
+    rebuild_product_sales(DAY, DAY)
+    rebuild_service_sales(DAY, DAY)
+
+    data = get_sales_data(*day_range(DAY, DAY))
+
+    assert data['orders'] == {'count': 2, 'revenue': Decimal("360.00")}
+    assert data['bookings'] == {'count': 1, 'revenue': Decimal("950.00")}
+    assert data['product_chart'] == {'labels': ["Gel Polish"], 'revenue': [360.0]}
+
+    comparison = get_top_products_vs_services(*day_range(DAY, DAY))
+    assert comparison['product']['revenue'] == [560.0]
+    assert comparison['service']['labels'] == ["Manicure"]
+
+
+def test_backfill_command_rebuilds_range(make_order, make_booking):
+    make_order(day=DAY)
+    make_booking(day=DAY + timedelta(days=3))
+
+    call_command('backfill_sales_rollups', start='2025-03-01', end='2025-03-31', chunk_days=7)
+
+    assert DailyProductSales.objects.filter(day=DAY).exists()
+    assert DailyServiceSales.objects.filter(day=DAY + timedelta(days=3)).exists()
@@ -0,0 +1,109 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.analytics.models import CustomerMetrics, CustomerSegment, ReportLog
+from nail_ecommerce_project.apps.analytics.segmentation import (
+    fit_segment_model, get_model_path, load_segment_model, refresh_segment_model,
+)
+from nail_ecommerce_project.apps.analytics.tasks import update_customer_segments_task
+from nail_ecommerce_project.apps.analytics.utils import get_customer_clusters
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def spending_customers(make_customer, make_order, product_variant, django_capture_on_commit_callbacks):
+    customers = []
+    with django_capture_on_commit_callbacks(execute=True):
+        for index in range(6):
+            user = make_customer(index)
+            make_order(user=user, lines=[(product_variant, index + 1, Decimal("100.00"))])
+            customers.append(user)
+    return customers
+
+
+def test_full_fit_persists_model_and_assignments(spending_customers):
+    model = fit_segment_model()
+
+    assert get_model_path().exists()
+    assert load_segment_model()['version'] == model['version']
+    assert CustomerSegment.objects.count() == 6
+    assert not CustomerSegment.objects.filter(is_stale=True).exists()
+    assert ReportLog.objects.filter(report_type='SEGMENT').count() == 1
+
+
+def test_dashboard_reads_stored_assignments(spending_customers, django_assert_max_num_queries):
+    fit_segment_model()
+
+    with django_assert_max_num_queries(2):
+        result = get_customer_clusters()
+
+    assert sorted(result['revenue']) == [100.0, 200.0, 300.0, 400.0, 500.0, 600.0]
+
+
+def test_new_customer_is_scored_on_commit(spending_customers, make_customer, make_order,
+                                          django_capture_on_commit_callbacks):
+    fit_segment_model()
+    newcomer = make_customer(99)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(user=newcomer)
+
+    segment = CustomerSegment.objects.get(user=newcomer)
+    assert segment.cluster is not None
+    assert not segment.is_stale
+
+
+def test_commit_hands_customers_to_a_background_task(spending_customers, make_customer, make_order, monkeypatch,
+                                                     django_capture_on_commit_callbacks):
+    fit_segment_model()
+    queued = []
+    monkeypatch.setattr(update_customer_segments_task, 'delay', queued.append)
+    newcomer = make_customer(99)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(user=newcomer)
+
+    assert queued == [[newcomer.pk]]
+    assert not CustomerSegment.objects.filter(user=newcomer).exists()
+
+
+def test_activity_marks_existing_customer_stale_until_refresh(spending_customers, make_order,
+                                                              product_variant,
+                                                              django_capture_on_commit_callbacks):
+    fit_segment_model()
+    customer = spending_customers[0]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(user=customer, lines=[(product_variant, 10, Decimal("100.00"))])
+
+    assert CustomerSegment.objects.get(user=customer).is_stale
+
+    refresh_segment_model()
+
+    segment = CustomerSegment.objects.get(user=customer)
+    assert not segment.is_stale
+    assert segment.total_value == 1100.0
+
+
+def test_refresh_without_model_runs_full_fit(spending_customers):
+    call_command('refresh_customer_segments')
+
+    assert get_model_path().exists()
+    assert CustomerSegment.objects.count() == 6
+
+
+def test_dashboard_range_keeps_customers_active_in_it(spending_customers):
+    fit_segment_model()
+    lapsed = spending_customers[:2]
+    old = timezone.make_aware(datetime(2020, 1, 10, 12))
+    CustomerMetrics.objects.filter(user__in=lapsed).update(first_activity=old, last_activity=old)
+    CustomerSegment.objects.filter(user__in=lapsed).update(last_activity=old)
+
+    result = get_customer_clusters(datetime(2020, 1, 1), datetime(2020, 1, 31))
+
+    assert sorted(result['revenue']) == [100.0, 200.0]
@@ -0,0 +1,139 @@
+import shutil
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from nail_ecommerce_project.apps.analytics import snapshot
+from nail_ecommerce_project.apps.analytics.dates import make_business_aware
+from nail_ecommerce_project.apps.analytics.utils import get_sales_data, get_top_products_vs_services
+from nail_ecommerce_project.apps.products.models import Product
+
+pytestmark = pytest.mark.django_db
+
+MARCH_1, MARCH_31 = date(2025, 3, 1), date(2025, 3, 31)
+MARCH = (make_business_aware(datetime.combine(MARCH_1, time.min)),
+         make_business_aware(datetime.combine(MARCH_31, time.max)))
+
+
+@pytest.fixture
+def march_sales(make_order, make_booking, product_variant, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2025, 3, 3), lines=[(product_variant, 2, Decimal('200.00'))])
+        make_order(day=date(2025, 3, 10), status='CANCELLED')
+        make_booking(day=date(2025, 3, 5))
+        make_booking(day=date(2025, 3, 12), number_of_customers=2, is_home_service=True)
+
+
+def test_snapshot_matches_rollups(march_sales, django_assert_num_queries):
+    from_rollups = (
+        snapshot.product_sales(MARCH_1, MARCH_31),
+        snapshot.service_sales(MARCH_1, MARCH_31),
+        snapshot.daily_revenue('order_lines', MARCH_1, MARCH_31),
+    )
+
+    snapshot.build_snapshot(through=MARCH_31)
+
+    # Fully covered ranges are answered from the memory-mapped arrays, plus a dirty-day check
+    # per call and a name lookup for product / service sales
+    with django_assert_num_queries(5):
+        from_snapshot = (
+            snapshot.product_sales(MARCH_1, MARCH_31),
+            snapshot.service_sales(MARCH_1, MARCH_31),
+            snapshot.daily_revenue('order_lines', MARCH_1, MARCH_31),
+        )
+    assert from_snapshot == from_rollups
+    assert from_snapshot[0] == [{'product__name': 'Gel Polish', 'units': 3, 'revenue': Decimal('600.00')}]
+
+
+def test_status_filter_uses_dictionary_codes(march_sales):
+    snapshot.build_snapshot(through=MARCH_31)
+
+    delivered = snapshot.product_sales(MARCH_1, MARCH_31, statuses=['DELIVERED'])
+    assert delivered == [{'product__name': 'Gel Polish', 'units': 2, 'revenue': Decimal('400.00')}]
+    assert snapshot.product_sales(MARCH_1, MARCH_31, statuses=['SHIPPED']) == []
+
+
+def test_range_past_watermark_reads_tail_from_rollups(march_sales):
+    snapshot.build_snapshot(through=date(2025, 3, 7))
+
+    assert snapshot.covered_through() == date(2025, 3, 7)
+    assert get_sales_data(*MARCH)['summary']['bookings']['count'] == 2
+
+
+def test_build_appends_new_days_only(march_sales, make_order, django_capture_on_commit_callbacks):
+    snapshot.build_snapshot(through=date(2025, 3, 15))
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2025, 3, 20))
+
+    result = snapshot.build_snapshot(through=MARCH_31)
+
+    assert result['appended_from'] == '2025-03-16'
+    assert result['order_lines'] == 1
+    assert snapshot.read_meta()['rows']['order_lines'] == 3
+
+
+def test_changed_day_falls_back_until_rebuilt(march_sales, make_order, django_capture_on_commit_callbacks):
+    snapshot.build_snapshot(through=MARCH_31)
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2025, 3, 20))
+
+    # The new order is visible straight away, served from the rollups
+    assert snapshot.covered_through() == date(2025, 3, 19)
+    assert get_top_products_vs_services(*MARCH)['product']['revenue'] == [800.0]
+
+    result = snapshot.build_snapshot(through=MARCH_31)
+    assert result['appended_from'] == '2025-03-20'
+    assert snapshot.covered_through() == MARCH_31
+    assert snapshot.product_sales(MARCH_1, MARCH_31)[0]['revenue'] == Decimal('800.00')
+
+
+def test_command_reports_up_to_date(march_sales, capsys):
+    call_command('build_analytics_snapshot', through='2025-03-31')
+    call_command('build_analytics_snapshot', through='2025-03-31')
+
+    assert 'already current through 2025-03-31' in capsys.readouterr().out
+
+
+def test_renamed_product_shows_current_name(march_sales, product_variant):
+    snapshot.build_snapshot(through=MARCH_31)
+    Product.objects.filter(pk=product_variant.product_id).update(name='Gel Polish Pro')
+
+    assert snapshot.product_sales(MARCH_1, MARCH_31)[0]['product__name'] == 'Gel Polish Pro'
+
+
+def test_build_keeps_the_previous_generation(march_sales):
+    generations = []
+    for through in (date(2025, 3, 7), date(2025, 3, 15), MARCH_31):
+        snapshot.build_snapshot(through=through)
+        generations.append(snapshot.read_meta()['generation'])
+
+    on_disk = sorted(path.name for path in snapshot.snapshot_dir().glob('g*'))
+    assert on_disk == generations[1:]
+
+
+def test_change_made_by_a_process_without_the_snapshot(march_sales, make_order, settings, tmp_path,
+                                                        django_capture_on_commit_callbacks):
+    snapshot.build_snapshot(through=MARCH_31)
+    artifact_dir = settings.ANALYTICS_ARTIFACT_DIR
+
+    # A web process on another disk: no local generation, so it reads the rollups
+    settings.ANALYTICS_ARTIFACT_DIR = tmp_path / "web"
+    assert snapshot.covered_through() is None
+    with django_capture_on_commit_callbacks(execute=True):
+        make_order(day=date(2025, 3, 20))
+
+    # The builder's generation still sees the change
+    settings.ANALYTICS_ARTIFACT_DIR = artifact_dir
+    assert snapshot.covered_through() == date(2025, 3, 19)
+    assert snapshot.product_sales(MARCH_1, MARCH_31)[0]['revenue'] == Decimal('800.00')
+
+
+def test_missing_generation_falls_back_to_rollups(march_sales):
+    from_rollups = snapshot.product_sales(MARCH_1, MARCH_31)
+    snapshot.build_snapshot(through=MARCH_31)
+    shutil.rmtree(snapshot.snapshot_dir() / snapshot.read_meta()['generation'])
+
+    assert snapshot.read_meta() is None
+    assert snapshot.product_sales(MARCH_1, MARCH_31) == from_rollups
@@ -0,0 +1,19 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+def test_worker_boot_does_not_import_analytics_libraries():
+    out = StringIO()
+    call_command('benchmark_startup', runs=1, json=True, stdout=out)
+
+    report = json.loads(out.getvalue())
+    assert report['heavy_modules'] == []
+    assert report['import_seconds_median'] > 0
+
+
+def test_threshold_breach_fails():
+    with pytest.raises(CommandError, match='median import time'):
+        call_command('benchmark_startup', runs=1, max_seconds=0, stdout=StringIO())
@@ -0,0 +1,83 @@
+import json
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+
+from nail_ecommerce_project.apps.analytics.models import CustomerMetrics, DailyProductSales
+from nail_ecommerce_project.apps.analytics.synthetic import SYNTHETIC_PREFIX, generate_synthetic_data
+from nail_ecommerce_project.apps.bookings.models import Booking
+from nail_ecommerce_project.apps.orders.models import Order, OrderItem
+
+pytestmark = pytest.mark.django_db
+
+END = date(2025, 3, 31)
+
+
+def test_generator_writes_requested_volume_with_history():
+    counts = generate_synthetic_data(END, customers=20, order_items=150, bookings=40, days=60,
+                                     batch_size=16, seed=1)
+
+    assert counts['customers'] == 20
+    assert OrderItem.objects.count() == counts['order_items'] == 150
+    assert Order.objects.count() == counts['orders']
+    # Bookings colliding on the unique constraint are skipped, never duplicated
+    assert 0 < Booking.objects.count() == counts['bookings'] <= 40
+    # Timestamps are spread over the history instead of "now"
+    first = Order.objects.order_by('created_at').first().created_at.date()
+    assert date(2025, 1, 30) <= first < date(2025, 3, 1)
+
+
+def test_generator_refreshes_derived_tables():
+    generate_synthetic_data(END, customers=10, order_items=60, bookings=0, days=30, seed=2)
+
+    raw_units = OrderItem.objects.aggregate(units=Sum('quantity'))['units']
+    assert DailyProductSales.objects.aggregate(units=Sum('units'))['units'] == raw_units
+    assert CustomerMetrics.objects.exists()
+
+
+def test_purge_removes_only_synthetic_data(customer, make_order):
+    make_order()
+    call_command('generate_analytics_data', customers=5, order_items=20, bookings=5, days=10,
+                 end=END.isoformat(), seed=3)
+
+    call_command('generate_analytics_data', purge=True)
+
+    assert Order.objects.count() == 1
+    assert not Order.objects.filter(user__username__startswith=SYNTHETIC_PREFIX).exists()
+
+
+def test_benchmark_writes_comparable_json(tmp_path):
+    generate_synthetic_data(END, customers=8, order_items=40, bookings=10, days=30, seed=4)
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+
+    call_command('benchmark_analytics', output=str(first), ranges='7,30', repeat=1, end=END.isoformat(),
+                 targets='get_sales_data,DashboardView', force=True)
+    call_command('benchmark_analytics', output=str(second), ranges='7', repeat=1, end=END.isoformat(),
+                 targets='get_sales_data', baseline=str(first), force=True)
+
+    report = json.loads(first.read_text())
+    results = report['runs'][0]['results']
+    assert {(r['target'], r['range_days']) for r in results} == {
+        ('get_sales_data', 7), ('get_sales_data', 30), ('DashboardView', 7), ('DashboardView', 30),
+    }
+    assert all(r['queries'] > 0 and r['peak_memory_mb'] >= 0 for r in results)
+    assert report['runs'][0]['data']['order_items'] == 40
+    comparison = json.loads(second.read_text())['comparison']
+    assert [(row['target'], row['range_days']) for row in comparison] == [('get_sales_data', 7)]
+
+
+def test_benchmark_refuses_without_debug_or_force(tmp_path):
+    with pytest.raises(CommandError, match="--force"):
+        call_command('benchmark_analytics', output=str(tmp_path / "out.json"))
+
+
+def test_benchmark_leaves_other_cache_entries(tmp_path):
+    cache.set('session:keep-me', 1)
+
+    call_command('benchmark_analytics', output=str(tmp_path / "out.json"), ranges='7', repeat=1,
+                 end=END.isoformat(), targets='get_sales_data', force=True)
+
+    assert cache.get('session:keep-me') == 1
@@ -1,5 +1,6 @@
 from django.urls import path
-from nail_ecommerce_project.apps.analytics.views_frontend import DashboardView, export_csv_view
+from nail_ecommerce_project.apps.analytics.views_frontend import DashboardView, dashboard_panel_view, \
+    dashboard_panels_view, export_csv_view, export_rows_view, report_result_view, report_status_view
 from logs.logger import get_logger
 logger = get_logger(__name__)
 
@@ -8,5 +9,10 @@ app_name = "analytics"
 
 urlpatterns = [
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('dashboard/panels/', dashboard_panels_view, name='dashboard_panels'),
+    path('dashboard/panels/<slug:panel>/', dashboard_panel_view, name='dashboard_panel'),
     path('dashboard/export/csv/', export_csv_view, name='export_csv'),
+    path('dashboard/export/rows/', export_rows_view, name='export_rows'),
+    path('dashboard/reports/<int:report_id>/', report_status_view, name='report_status'),
+    path('dashboard/reports/<int:report_id>/result/', report_result_view, name='report_result'),
 ]
@@ -1,24 +1,33 @@
-from collections import defaultdict
-from django.db.models import Count, Max
+from datetime import timedelta
 from decimal import Decimal
-from nail_ecommerce_project.apps.orders.models import OrderItem
-from django.db.models import F, ExpressionWrapper, DecimalField
-from nail_ecommerce_project.apps.bookings.models import BookingStatus
+from django.conf import settings
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractIsoWeekDay, TruncDate
+from nail_ecommerce_project.apps.analytics.dates import business_day_bounds, get_business_timezone, month_bounds, \
+    to_business_date
+from nail_ecommerce_project.apps.analytics import snapshot
+from nail_ecommerce_project.apps.analytics.cache import note_fallback
+from nail_ecommerce_project.apps.analytics.customer_metrics import compute_customer_metrics
+from nail_ecommerce_project.apps.analytics.models import CustomerMetrics, CustomerSegment
+from nail_ecommerce_project.apps.bookings.models import Booking, BookingStatus, TIME_SLOT_CHOICES
+from nail_ecommerce_project.apps.orders.models import Order
+from django.utils import timezone
 from django.utils.timezone import make_aware, is_naive
-from django.db.models import Sum, Value, CharField
-from django.db.models.functions import TruncDate
-import pandas as pd
-from sklearn.cluster import KMeans
 from django.contrib.auth import get_user_model
-from nail_ecommerce_project.apps.orders.models import Order
-from nail_ecommerce_project.apps.bookings.models import Booking
 from logs.logger import get_logger
 from nail_ecommerce_project.apps.products.models import ProductVariant
+from nail_ecommerce_project.apps.services.models import Service
 
 logger = get_logger(__name__)
 
 User = get_user_model()
 
+# pandas / NumPy / scikit-learn are imported inside the functions that use them so that
+# loading the URLconf (every worker, every request path) doesn't pay for them.
+
+
+SALES_ORDER_STATUSES = ['DELIVERED', 'PROCESSING']
+
 
 def get_sales_data(start_date, end_date):
     try:
@@ -31,64 +40,25 @@ def get_sales_data(start_date, end_date):
             end_date = make_aware(end_date)
 
         logger.info(f"[get_sales_data] Fetching sales data from {start_date} to {end_date}")
+        start_day, end_day = to_business_date(start_date), to_business_date(end_date)
 
-        # 🛍️ Orders
-        order_items = (
-            OrderItem.objects
-            .filter(order__created_at__range=(start_date, end_date), order__status__in=['DELIVERED', 'PROCESSING'])
-            .select_related('order', 'product_variant', 'product_variant__product')
-            .values(
-                'order_id', 'product_variant__product__name',
-                'quantity', 'product_variant__price',
-            )
-        )
-
-        df_orders = pd.DataFrame(order_items)
-
-        logger.debug(f"[get_sales_data] Orders raw data:\n{df_orders.head()}")
-
-        if not df_orders.empty:
-            df_orders['revenue'] = df_orders['quantity'] * df_orders['product_variant__price']
-            order_summary = {
-                'count': int(df_orders['quantity'].sum()),
-                'revenue': round(df_orders['revenue'].sum(), 2),
-            }
-            product_revenue = (
-                df_orders.groupby('product_variant__product__name')['revenue']
-                .sum().sort_values(ascending=False)
-            )
-            logger.debug(f"[get_sales_data] Product revenue breakdown:\n{product_revenue}")
-        else:
-            order_summary = {'count': 0, 'revenue': Decimal('0.00')}
-            product_revenue = pd.Series(dtype='float64')
+        # 🛍️ Orders (snapshot + daily rollups, revenue at price_at_order)
+        product_rows = snapshot.product_sales(start_day, end_day, statuses=SALES_ORDER_STATUSES)
+        logger.debug(f"[get_sales_data] Product revenue breakdown: {product_rows}")
 
-        # 💅 Bookings
-        bookings = (
-            Booking.objects
-            .filter(date__range=(start_date, end_date), status=BookingStatus.COMPLETED_SERVICE)
-            .select_related('service')
-            .values('service__title', 'number_of_customers', 'service__price')
-        )
+        order_summary = {
+            'count': sum(row['units'] for row in product_rows),
+            'revenue': sum((row['revenue'] for row in product_rows), Decimal('0.00')),
+        }
 
-        df_bookings = pd.DataFrame(bookings)
-        logger.debug(f"[get_sales_data] Bookings raw data:\n{df_bookings.head()}")
+        # 💅 Bookings (snapshot + daily rollups by service date)
+        service_rows = snapshot.service_sales(start_day, end_day, statuses=[BookingStatus.COMPLETED_SERVICE])
+        logger.debug(f"[get_sales_data] Booking revenue breakdown: {service_rows}")
 
-        if not df_bookings.empty:
-            df_bookings['total_price'] = df_bookings.apply(
-                lambda row: get_booking_price(row['service__price'], row['number_of_customers']), axis=1
-            )
-            booking_summary = {
-                'count': df_bookings.shape[0],
-                'revenue': round(df_bookings['total_price'].sum(), 2),
-            }
-            booking_revenue = (
-                df_bookings.groupby('service__title')['total_price']
-                .sum().sort_values(ascending=False)
-            )
-            logger.debug(f"[get_sales_data] Booking revenue breakdown:\n{booking_revenue}")
-        else:
-            booking_summary = {'count': 0, 'revenue': Decimal('0.00')}
-            booking_revenue = pd.Series(dtype='float64')
+        booking_summary = {
+            'count': sum(row['bookings'] for row in service_rows),
+            'revenue': sum((row['revenue'] for row in service_rows), Decimal('0.00')),
+        }
 
         # 🧾 Total Summary
         total_revenue = order_summary['revenue'] + booking_summary['revenue']
@@ -103,12 +73,12 @@ def get_sales_data(start_date, end_date):
                 'estimated_profit': estimated_profit,
             },
             'product_chart': {
-                'labels': list(product_revenue.index),
-                'revenue': list(product_revenue.values),
+                'labels': [row['product__name'] for row in product_rows],
+                'revenue': [float(row['revenue']) for row in product_rows],
             },
             'booking_chart': {
-                'labels': list(booking_revenue.index),
-                'revenue': list(booking_revenue.values),
+                'labels': [row['service__title'] for row in service_rows],
+                'revenue': [float(row['revenue']) for row in service_rows],
             },
             'summary': {
                 'orders': order_summary,
@@ -122,6 +92,7 @@ def get_sales_data(start_date, end_date):
 
     except Exception as e:
         logger.error(f"[Analytics] Failed to get sales data: {e}")
+        note_fallback()
         return {
             'orders': {'count': 0, 'revenue': Decimal('0.00')},
             'bookings': {'count': 0, 'revenue': Decimal('0.00')},
@@ -132,24 +103,10 @@ def get_sales_data(start_date, end_date):
         }
 
 
-def get_booking_price(price, num_customers):
-    try:
-        logger.debug(f"[get_booking_price] Price: {price}, Customers: {num_customers}")
-        base_price = Decimal(price)
-        if 2 <= num_customers <= 5:
-            final_price = base_price * Decimal('0.95')
-        else:
-            final_price = base_price
-        logger.debug(f"[get_booking_price] Final computed price: {final_price}")
-        return final_price
-    except Exception as e:
-        logger.warning(f"Failed to compute booking price: {e}")
-        return Decimal('0.00')
-
-
 def get_customer_segments(start_date, end_date):
     """
-    Returns top customer insights based on orders and bookings within the date range.
+    Returns the customers with orders or bookings within the date range and what they
+    spent in it, highest spend first.
     """
     if is_naive(start_date):
         logger.warning(f"[function_name] start_date is naive: {start_date}")
@@ -160,122 +117,115 @@ def get_customer_segments(start_date, end_date):
         end_date = make_aware(end_date)
     logger.info(f"[get_customer_segments] Generating segments from {start_date} to {end_date}")
 
-    order_data = (
-        Order.objects.filter(created_at__range=(start_date, end_date))
-        .values('user__id', 'user__full_name', 'user__email')
-        .annotate(
-            total_spent=Sum('items__product_variant__price'),
-            order_count=Count('id'),
-            last_order=Max('created_at')
-        )
+    # In-range totals come from the same grouped queries that maintain CustomerMetrics;
+    # the stored rows are lifetime values and can't be cut down to a range
+    metrics = compute_customer_metrics(start=start_date, end=end_date)
+    users = User.objects.filter(id__in=list(metrics)).values('id', 'full_name', 'email')
+    customer_segments = sorted(
+        (
+            {
+                'name': user['full_name'],
+                'email': user['email'],
+                'total_spent': metrics[user['id']]['monetary'],
+                'order_count': metrics[user['id']]['order_count'],
+                'booking_count': metrics[user['id']]['booking_count'],
+                'last_activity': metrics[user['id']]['last_activity'],
+            }
+            for user in users
+        ),
+        key=lambda segment: segment['total_spent'],
+        reverse=True,
     )
-    logger.debug(f"[get_customer_segments] Order data count: {order_data.count()}")
-
-    booking_data = (
-        Booking.objects.filter(created_at__range=(start_date, end_date))
-        .values('customer__id', 'customer__full_name', 'customer__email')
-        .annotate(
-            total_spent=Sum('service__price'),
-            booking_count=Count('id'),
-            last_booking=Max('created_at')
-        )
+    logger.debug(f"[get_customer_segments] Top 5 customers: {customer_segments[:5]}")
+
+    return customer_segments
+
+
+CLUSTER_FEATURES = ['total_value', 'frequency', 'avg_order_value']
+
+
+def get_customer_feature_frame(start_date=None, end_date=None, user_ids=None):
+    """
+    Per-customer clustering features read from CustomerMetrics. A date range keeps the
+    customers whose activity overlaps it; the features themselves are lifetime values.
+    """
+    import numpy as np
+    import pandas as pd
+
+    metrics = CustomerMetrics.objects.filter(user__role='customer', frequency__gt=0)
+    if user_ids is not None:
+        metrics = metrics.filter(user_id__in=user_ids)
+    if start_date and end_date:
+        start_dt, end_dt = business_day_bounds(to_business_date(start_date), to_business_date(end_date))
+        metrics = metrics.filter(first_activity__lt=end_dt, last_activity__gte=start_dt)
+
+    rows = metrics.order_by('user_id').values_list(
+        'user_id', 'user__full_name', 'user__username', 'order_value', 'order_count', 'frequency', 'last_activity'
     )
-    logger.debug(f"[get_customer_segments] Booking data count: {booking_data.count()}")
-
-    customer_dict = defaultdict(lambda: {
-        'name': '',
-        'email': '',
-        'total_spent': 0,
-        'order_count': 0,
-        'booking_count': 0,
-        'last_activity': None
+    df = pd.DataFrame.from_records(list(rows), columns=[
+        'user_id', 'full_name', 'username', 'order_value', 'order_count', 'frequency', 'last_activity'])
+    if df.empty:
+        return pd.DataFrame(columns=['user_id', 'name'] + CLUSTER_FEATURES + ['last_activity'])
+
+    order_total = df['order_value'].to_numpy(dtype=float)
+    order_count = df['order_count'].to_numpy(dtype=float)
+
+    names = df['full_name'].fillna('').str.strip()
+    return pd.DataFrame({
+        'user_id': df['user_id'].astype(int),
+        'name': names.where(names != '', df['username']),
+        'total_value': order_total,
+        'frequency': df['frequency'].astype(int),
+        'avg_order_value': np.divide(order_total, order_count, out=np.zeros_like(order_total), where=order_count > 0),
+        'last_activity': df['last_activity'],
     })
 
-    # Merge Order Data
-    for entry in order_data:
-        user_id = entry['user__id']
-        customer_dict[user_id]['name'] = entry['user__full_name']
-        customer_dict[user_id]['email'] = entry['user__email']
-        customer_dict[user_id]['total_spent'] += entry['total_spent'] or 0
-        customer_dict[user_id]['order_count'] += entry['order_count']
-        customer_dict[user_id]['last_activity'] = entry['last_order']
-
-    # Merge Booking Data
-    for entry in booking_data:
-        user_id = entry['customer__id']
-        customer_dict[user_id]['name'] = entry['customer__full_name']
-        customer_dict[user_id]['email'] = entry['customer__email']
-        customer_dict[user_id]['total_spent'] += entry['total_spent'] or 0
-        customer_dict[user_id]['booking_count'] += entry['booking_count']
-        current_last = customer_dict[user_id]['last_activity']
-        new_last = entry['last_booking']
-        customer_dict[user_id]['last_activity'] = max(current_last, new_last) if current_last else new_last
-
-    # Convert to sorted list by spend
-    customer_segments = sorted(customer_dict.values(), key=lambda x: x['total_spent'], reverse=True)
-    logger.debug(f"[get_customer_segments] Top 5 customers: {customer_segments[:5]}")
 
-    return customer_segments
+def get_stored_customer_clusters(start_date=None, end_date=None):
+    """
+    Reads the persisted segment assignments (see analytics.segmentation) for customers
+    whose activity overlaps the range. Returns None until a segmentation model has been fitted.
+    """
+    import pandas as pd
+
+    segments = CustomerSegment.objects.filter(cluster__isnull=False)
+    if not segments.exists():
+        return None
+    if start_date and end_date:
+        start_dt, end_dt = business_day_bounds(to_business_date(start_date), to_business_date(end_date))
+        segments = segments.filter(last_activity__gte=start_dt, user__metrics__first_activity__lt=end_dt)
+    elif start_date:
+        segments = segments.filter(last_activity__gte=start_date)
+
+    rows = segments.values_list(
+        'user_id', 'user__full_name', 'user__username', 'cluster', *CLUSTER_FEATURES, 'last_activity'
+    )
+    df = pd.DataFrame.from_records(
+        list(rows), columns=['user_id', 'full_name', 'username', 'cluster'] + CLUSTER_FEATURES + ['last_activity']
+    )
+    names = df['full_name'].fillna('').str.strip()
+    df.insert(1, 'name', names.where(names != '', df['username']))
+    return df.drop(columns=['full_name', 'username'])
 
 
 def get_customer_clusters(start_date=None, end_date=None):
     try:
-        if is_naive(start_date):
+        if start_date and is_naive(start_date):
             logger.warning(f"[function_name] start_date is naive: {start_date}")
             start_date = make_aware(start_date)
 
-        if is_naive(end_date):
+        if end_date and is_naive(end_date):
             logger.warning(f"[function_name] end_date is naive: {end_date}")
             end_date = make_aware(end_date)
 
-        users = User.objects.filter(role='customer')
-        data = []
-
-        if start_date and end_date:
-            from datetime import datetime
-            from django.utils import timezone
-
-            start_dt = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
-            end_dt = timezone.make_aware(datetime.combine(end_date, datetime.max.time()))
-        else:
-            start_dt = end_dt = None
-        logger.info(f"[get_customer_clusters] Clustering customers between {start_dt} and {end_dt}")
-
-        for user in users:
-            orders = Order.objects.filter(user=user)
-            bookings = Booking.objects.filter(customer=user)
-
-            if start_dt and end_dt:
-                orders = orders.filter(created_at__range=(start_dt, end_dt))
-                bookings = bookings.filter(created_at__range=(start_dt, end_dt))
-
-            for o in orders:
-                try:
-                    val = o.total_price
-                    logger.debug(f"[DEBUG] Order #{o.id} total_price = ₹{val}")
-                except Exception as e:
-                    logger.error(f"[DEBUG] Error accessing total_price for Order #{o.id}: {e}")
-
-            total_order_amount = sum(o.total_price for o in orders)
-            order_count = orders.count()
-            booking_count = bookings.count()
-            total_value = total_order_amount
-            total_visits = order_count + booking_count
-            avg_order_value = (total_order_amount / order_count) if order_count else 0
-
-            if total_visits == 0:
-                continue
-
-            data.append({
-                'user_id': user.id,
-                'name': user.get_full_name() or user.username,
-                'total_value': float(total_value),
-                'frequency': total_visits,
-                'avg_order_value': float(avg_order_value)
-            })
-        logger.debug(f"[get_customer_clusters] Prepared {len(data)} customer data points for clustering")
+        logger.info(f"[get_customer_clusters] Clustering customers between {start_date} and {end_date}")
 
-        if not data:
+        df = get_stored_customer_clusters(start_date, end_date)
+        if df is None:
+            # No persisted segmentation yet: cluster the range on the fly
+            df = _fit_customer_clusters(start_date, end_date)
+
+        if df.empty:
             return {
                 'df': None,
                 'labels': [],
@@ -285,9 +235,6 @@ def get_customer_clusters(start_date=None, end_date=None):
                 'visits': []
             }
 
-        df = pd.DataFrame(data)
-        kmeans = KMeans(n_clusters=3, random_state=42, n_init=10)
-        df['cluster'] = kmeans.fit_predict(df[['total_value', 'frequency', 'avg_order_value']])
         logger.debug(f"[get_customer_clusters] Cluster assignment result:\n{df[['name', 'cluster']]}")
 
         return {
@@ -301,6 +248,7 @@ def get_customer_clusters(start_date=None, end_date=None):
 
     except Exception as e:
         logger.error(f"[Customer Segmentation] Failed to cluster users: {e}")
+        note_fallback()
         return {
             'df': None,
             'labels': [],
@@ -311,7 +259,268 @@ def get_customer_clusters(start_date=None, end_date=None):
         }
 
 
+def _fit_customer_clusters(start_date=None, end_date=None):
+    import numpy as np
+    from sklearn.cluster import KMeans
+
+    df = get_customer_feature_frame(start_date, end_date)
+    logger.debug(f"[get_customer_clusters] Prepared {len(df)} customer data points for clustering")
+    if df.empty:
+        return df
+
+    # Fit on a bounded sample so the fit cost stays flat as the customer base grows
+    features = df[CLUSTER_FEATURES].to_numpy(dtype=float)
+    sample_size = getattr(settings, 'ANALYTICS_CLUSTER_SAMPLE_SIZE', 5000)
+    if len(features) > sample_size:
+        rng = np.random.default_rng(42)
+        fit_features = features[rng.choice(len(features), size=sample_size, replace=False)]
+    else:
+        fit_features = features
+
+    kmeans = KMeans(n_clusters=min(3, len(fit_features)), random_state=42, n_init=10)
+    kmeans.fit(fit_features)
+    df['cluster'] = kmeans.predict(features)
+    return df
+
+
+def _month_ordinal(day):
+    return day.year * 12 + day.month - 1
+
+
+def get_cohort_retention(start_date, end_date):
+    """
+    Customers grouped by the month of their first order or booking (cohorts starting in the
+    range's months), with the percentage active again in each later month up to the end month.
+    Returns {'cohorts': [{'month': 'YYYY-MM', 'size': n, 'retention': [100.0, pct, ...]}]}.
+    """
+    import pandas as pd
+
+    try:
+        if is_naive(start_date):
+            logger.warning(f"[get_cohort_retention] Naive start_date: {start_date}")
+            start_date = make_aware(start_date)
+        if is_naive(end_date):
+            logger.warning(f"[get_cohort_retention] Naive end_date: {end_date}")
+            end_date = make_aware(end_date)
+
+        first_day, last_day = month_bounds(to_business_date(start_date), to_business_date(end_date))
+        _, end = business_day_bounds(last_day)
+        logger.info(f"[get_cohort_retention] Cohorts from {first_day} to {last_day}")
+
+        # Full history up to the end month: a customer's cohort is their first month ever
+        orders = (
+            Order.objects
+            .filter(user__role='customer', created_at__lt=end)
+            .exclude(status='CANCELLED')
+            .annotate(day=TruncDate('created_at', tzinfo=get_business_timezone()))
+            .values_list('user_id', 'day')
+            .order_by()
+        )
+        bookings = (
+            Booking.objects
+            .filter(customer__role='customer', date__lte=last_day)
+            .exclude(status=BookingStatus.CANCELLED_SERVICE)
+            .values_list('customer_id', 'date')
+            .order_by()
+        )
+        # One two-column pull; UNION drops same-day repeats in the database
+        df = pd.DataFrame.from_records(list(orders.union(bookings)), columns=['customer_id', 'day'])
+        if df.empty:
+            return {'cohorts': []}
+
+        days = pd.to_datetime(df['day'])
+        df['month'] = days.dt.year * 12 + days.dt.month - 1
+        df['cohort'] = df.groupby('customer_id')['month'].transform('min')
+        df = df[df['cohort'] >= _month_ordinal(first_day)]
+        if df.empty:
+            return {'cohorts': []}
+
+        df = df.assign(offset=df['month'] - df['cohort']).drop_duplicates(['customer_id', 'offset'])
+        active = df.groupby(['cohort', 'offset']).size().unstack(fill_value=0)
+        sizes = active[0]
+        retention = active.div(sizes, axis=0).mul(100).round(1)
+
+        end_month = _month_ordinal(last_day)
+        cohorts = [
+            {
+                'month': f"{cohort // 12:04d}-{cohort % 12 + 1:02d}",
+                'size': int(sizes[cohort]),
+                # Only the months that have been observable for this cohort
+                'retention': retention.loc[cohort].reindex(range(end_month - cohort + 1), fill_value=0.0).tolist(),
+            }
+            for cohort in retention.index
+        ]
+        logger.debug(f"[get_cohort_retention] {len(cohorts)} cohorts, {int(sizes.sum())} customers")
+        return {'cohorts': cohorts}
+
+    except Exception as e:
+        logger.error(f"[Analytics] Cohort retention error: {e}")
+        note_fallback()
+        return {'cohorts': []}
+
+
+WEEKDAY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def _percent(booked, available):
+    import numpy as np
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(available > 0, booked * 100.0 / available, 0.0)
+    return np.round(share, 1)
+
+
+def get_booking_demand(start_date, end_date):
+    """
+    Non-cancelled bookings by weekday x time slot over the range's whole months: overall, per
+    service and per staff member, with utilization against the slots available (every active
+    staff member can take one booking per slot per day). Matrices are 7 weekday rows (Mon-Sun)
+    x one column per TIME_SLOT_CHOICES slot. Returns {'weekdays', 'slots', 'total',
+    'utilization', 'services': [{'name', 'bookings', 'matrix'}], 'staff': [{'name', 'bookings',
+    'available', 'utilization', 'matrix'}]}.
+    """
+    import numpy as np
+
+    slots = [slot for slot, _ in TIME_SLOT_CHOICES]
+    empty = {'weekdays': WEEKDAY_LABELS, 'slots': slots, 'total': [], 'utilization': [], 'services': [], 'staff': []}
+    try:
+        if is_naive(start_date):
+            logger.warning(f"[get_booking_demand] Naive start_date: {start_date}")
+            start_date = make_aware(start_date)
+        if is_naive(end_date):
+            logger.warning(f"[get_booking_demand] Naive end_date: {end_date}")
+            end_date = make_aware(end_date)
+
+        first_day, last_day = month_bounds(to_business_date(start_date), to_business_date(end_date))
+        logger.info(f"[get_booking_demand] Booking demand from {first_day} to {last_day}")
+
+        rows = list(
+            Booking.objects
+            .filter(date__range=(first_day, last_day))
+            .exclude(status=BookingStatus.CANCELLED_SERVICE)
+            .annotate(weekday=ExtractIsoWeekDay('date'))
+            .values_list('weekday', 'time_slot', 'service_id', 'staff_id')
+            .annotate(bookings=Count('id'))
+            .order_by()
+        )
+        if not rows:
+            return empty
+
+        weekdays, time_slots, services, staff_ids, counts = (np.array(column, dtype=object) for column in zip(*rows))
+        weekday_index = weekdays.astype(int) - 1
+        slot_index = np.searchsorted(slots, time_slots.astype(str))
+        counts = counts.astype(int)
+
+        def cube(keys):
+            # One weekday x slot matrix per distinct key, filled in a single scatter-add
+            labels, key_index = np.unique(keys, return_inverse=True)
+            matrices = np.zeros((len(labels), 7, len(slots)), dtype=int)
+            np.add.at(matrices, (key_index, weekday_index, slot_index), counts)
+            return labels, matrices
+
+        service_ids, service_matrices = cube(services.astype(int))
+        # Grouped by id (no join in the aggregate); titles are looked up for the few services found
+        service_titles = dict(Service.objects.filter(id__in=service_ids.tolist()).values_list('id', 'title'))
+        # Unassigned bookings (staff_id NULL) are grouped under 0, which no user has
+        staff_keys, staff_matrices = cube(np.array([staff_id or 0 for staff_id in staff_ids]))
+
+        staff_names = {
+            user_id: (full_name or username).strip()
+            for user_id, full_name, username in User.objects.filter(
+                Q(is_staff=True, is_active=True) | Q(id__in=[int(k) for k in staff_keys if k])
+            ).values_list('id', 'full_name', 'username')
+        }
+        staff_count = len(staff_names)
+
+        # Capacity: how often each weekday occurs in the range x slots per day
+        days = np.arange(first_day, last_day + timedelta(days=1), dtype='datetime64[D]')
+        weekday_counts = np.bincount((days.astype(int) + 3) % 7, minlength=7)  # 1970-01-01 was a Thursday
+        slot_capacity = np.repeat(weekday_counts[:, None], len(slots), axis=1)
+        total = service_matrices.sum(axis=0)
+
+        staff = []
+        available = int(slot_capacity.sum())
+        booked_by_staff = dict(zip(staff_keys.tolist(), staff_matrices))
+        for user_id, name in staff_names.items():
+            matrix = booked_by_staff.pop(user_id, np.zeros((7, len(slots)), dtype=int))
+            staff.append({
+                'name': name,
+                'bookings': int(matrix.sum()),
+                'available': available,
+                'utilization': float(_percent(matrix.sum(), available)),
+                'matrix': matrix.tolist(),
+            })
+        if 0 in booked_by_staff:
+            matrix = booked_by_staff.pop(0)
+            staff.append({'name': 'Unassigned', 'bookings': int(matrix.sum()), 'available': 0,
+                          'utilization': 0.0, 'matrix': matrix.tolist()})
+        staff.sort(key=lambda member: (-member['bookings'], member['name']))
+
+        services = sorted(
+            (
+                {'name': service_titles.get(service_id, ''), 'bookings': int(matrix.sum()), 'matrix': matrix.tolist()}
+                for service_id, matrix in zip(service_ids.tolist(), service_matrices)
+            ),
+            key=lambda service: (-service['bookings'], service['name']),
+        )
+        logger.debug(f"[get_booking_demand] {int(total.sum())} bookings, {len(services)} services, "
+                     f"{staff_count} staff")
+        return {
+            'weekdays': WEEKDAY_LABELS,
+            'slots': slots,
+            'total': total.tolist(),
+            'utilization': _percent(total, slot_capacity * staff_count).tolist(),
+            'services': services,
+            'staff': staff,
+        }
+    except Exception as e:
+        logger.error(f"[Analytics] Booking demand error: {e}")
+        note_fallback()
+        return empty
+
+
+TIME_SERIES_COLUMNS = ['date', 'count', 'kind', 'lower', 'upper']
+
+
+def _series_frame(series, start_day, end_day, today):
+    """
+    Actual daily counts for the range, followed by the forecast (with 95% bands)
+    when the range reaches the present.
+    """
+    import pandas as pd
+    from nail_ecommerce_project.apps.analytics import forecasting
+
+    actual_end = min(end_day, today)
+    frames = []
+    if start_day <= actual_end:
+        counts = forecasting.daily_counts(series, start_day, actual_end)
+        frames.append(pd.DataFrame({
+            'date': pd.date_range(start_day, actual_end, freq='D'),
+            'count': counts,
+            'kind': 'actual',
+        }))
+    if end_day >= today - timedelta(days=1):
+        days, mean, lower, upper = forecasting.forecast_series(series, as_of=today)
+        frames.append(pd.DataFrame({
+            'date': pd.to_datetime(days),
+            'count': mean,
+            'kind': 'forecast',
+            'lower': lower,
+            'upper': upper,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=TIME_SERIES_COLUMNS)
+    return pd.concat(frames, ignore_index=True).reindex(columns=TIME_SERIES_COLUMNS)
+
+
 def get_time_series_forecast(start_date, end_date):
+    """
+    Daily order and booking counts for the range plus a Holt-Winters forecast of the
+    next ANALYTICS_FORECAST_HORIZON days. Returns (order_df, booking_df) with
+    columns date, count, kind ('actual' | 'forecast'), lower, upper.
+    """
+    import pandas as pd
+
     try:
         if is_naive(start_date):
             logger.warning(f"[function_name] start_date is naive: {start_date}")
@@ -323,17 +532,11 @@ def get_time_series_forecast(start_date, end_date):
 
         logger.info(f"[get_time_series_forecast] Fetching time series data from {start_date} to {end_date}")
 
-        # Orders data
-        order_qs = Order.objects.filter(created_at__range=(start_date, end_date))
-        order_df = pd.DataFrame(list(order_qs.values('created_at', 'id')))
-        order_df['created_at'] = pd.to_datetime(order_df['created_at']).dt.date
-        order_df = order_df.groupby('created_at').size().reset_index(name='count')
+        start_day, end_day = to_business_date(start_date), to_business_date(end_date)
+        today = to_business_date(timezone.now())
 
-        # Bookings data
-        booking_qs = Booking.objects.filter(created_at__range=(start_date, end_date))
-        booking_df = pd.DataFrame(list(booking_qs.values('created_at', 'id')))
-        booking_df['created_at'] = pd.to_datetime(booking_df['created_at']).dt.date
-        booking_df = booking_df.groupby('created_at').size().reset_index(name='count')
+        order_df = _series_frame('orders', start_day, end_day, today)
+        booking_df = _series_frame('bookings', start_day, end_day, today)
 
         logger.debug(f"[get_time_series_forecast] Orders daily breakdown:\n{order_df}")
         logger.debug(f"[get_time_series_forecast] Bookings daily breakdown:\n{booking_df}")
@@ -342,7 +545,8 @@ def get_time_series_forecast(start_date, end_date):
 
     except Exception as e:
         logger.error(f"[Forecast] Error in get_time_series_forecast: {e}")
-        return pd.DataFrame(), pd.DataFrame()
+        note_fallback()
+        return pd.DataFrame(columns=TIME_SERIES_COLUMNS), pd.DataFrame(columns=TIME_SERIES_COLUMNS)
 
 
 def get_top_products_vs_services(start_date, end_date):
@@ -358,31 +562,12 @@ def get_top_products_vs_services(start_date, end_date):
         logger.info(
             f"[get_top_products_vs_services] Comparing top products and services from {start_date} to {end_date}")
 
-        # Product sales
-        revenue_expr = ExpressionWrapper(F('product_variant__price') * F('quantity'), output_field=DecimalField())
-        product_sales = (
-            OrderItem.objects
-            .filter(order__created_at__range=(start_date, end_date))
-            .values('product_variant__product__name')
-            .annotate(
-                revenue=Sum(revenue_expr),
-                quantity=Sum('quantity')
-            )
-            .order_by('-revenue')[:5]
-        )
+        start_day, end_day = to_business_date(start_date), to_business_date(end_date)
 
-        # Service bookings
-        service_sales = (
-            Booking.objects.filter(created_at__range=(start_date, end_date))
-            .values('service__title')
-            .annotate(
-                revenue=Sum('service__price'),
-                count=Count('id')
-            )
-            .order_by('-revenue')[:5]
-        )
+        product_sales = snapshot.product_sales(start_day, end_day)[:5]
+        service_sales = snapshot.service_sales(start_day, end_day)[:5]
 
-        product_names = [p['product_variant__product__name'] for p in product_sales]
+        product_names = [p['product__name'] for p in product_sales]
         product_revenues = [float(p['revenue']) for p in product_sales]
 
         service_names = [s['service__title'] for s in service_sales]
@@ -398,6 +583,7 @@ def get_top_products_vs_services(start_date, end_date):
 
     except Exception as e:
         logger.error(f"[Analytics] Product vs Service Comparison failed: {e}")
+        note_fallback()
         return {
             'product': {'labels': [], 'revenue': []},
             'service': {'labels': [], 'revenue': []}
@@ -425,10 +611,13 @@ def get_low_stock_products(threshold=5):
         return list(low_stock_items)
     except Exception as e:
         logger.error(f"[Analytics] Low stock check failed: {e}")
+        note_fallback()
         return []
 
 
 def get_forecast_data(start_date, end_date):
+    import pandas as pd
+
     try:
         if is_naive(start_date):
             logger.warning(f"[get_forecast_data] Naive start_date: {start_date}")
@@ -439,48 +628,20 @@ def get_forecast_data(start_date, end_date):
 
         logger.info(f"[get_forecast_data] Generating forecast chart data from {start_date} to {end_date}")
 
-        # --- Orders ---
-        order_qs = (
-            Order.objects.filter(created_at__range=(start_date, end_date))
-            .annotate(trunc_date=TruncDate('created_at'))
-            .values('trunc_date')
-            .annotate(
-                revenue=Sum('items__price_at_order'),
-                type=Value('Orders', output_field=CharField())
-            )
-            .order_by('trunc_date')
-        )
-
-        # --- Bookings ---
-        bookings = (
-            Booking.objects.filter(created_at__range=(start_date, end_date))
-            .annotate(trunc_date=TruncDate('created_at'))
-        )
-
-        # Calculate total revenue per trunc_date manually
-        booking_data = {}
-        for b in bookings:
-            key = b.trunc_date
-            revenue = b.get_final_price()
-            booking_data.setdefault(key, Decimal('0.00'))
-            booking_data[key] += revenue
-
-        logger.debug(f"[get_forecast_data] Aggregated booking revenue: {booking_data}")
-
-        # Convert to list of dicts
-        booking_qs = [
-            {'trunc_date': k, 'revenue': v, 'type': 'Bookings'}
-            for k, v in sorted(booking_data.items())
-        ]
+        start_day, end_day = to_business_date(start_date), to_business_date(end_date)
 
-        # --- Convert to DataFrame ---
-        df_orders = pd.DataFrame(order_qs)
-        df_bookings = pd.DataFrame(booking_qs)
+        columns = ['day', 'revenue']
+        df_orders = pd.DataFrame(snapshot.daily_revenue('order_lines', start_day, end_day), columns=columns)
+        df_orders['type'] = 'Orders'
+        df_bookings = pd.DataFrame(snapshot.daily_revenue('bookings', start_day, end_day), columns=columns)
+        df_bookings['type'] = 'Bookings'
 
         df = pd.concat([df_orders, df_bookings], ignore_index=True)
-        df.rename(columns={"trunc_date": "date"}, inplace=True)
+        if df.empty:
+            return df
+        df.rename(columns={"day": "date"}, inplace=True)
         df['date'] = pd.to_datetime(df['date'])
-        df['revenue'] = df['revenue'].fillna(0)
+        df['revenue'] = df['revenue'].fillna(0).astype(float)
 
         logger.debug(f"[get_forecast_data] Final DataFrame:\n{df}")
 
@@ -488,4 +649,5 @@ def get_forecast_data(start_date, end_date):
 
     except Exception as e:
         logger.error(f"[Analytics] Forecast data error: {e}")
+        note_fallback()
         return pd.DataFrame()
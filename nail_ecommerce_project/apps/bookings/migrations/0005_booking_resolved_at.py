@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_home_visit_fee'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='resolved_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the booking was completed or cancelled; empty while it is open', null=True),
+        ),
+    ]
@@ -2,7 +2,10 @@ from decimal import Decimal
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Round
 from django.conf import settings
+from django.utils import timezone
 from nail_ecommerce_project.apps.bookings.utils import auto_assign_staff
 from nail_ecommerce_project.apps.services.models import Service
 
@@ -30,6 +33,31 @@ class BookingStatus(models.TextChoices):
     CANCELLED_SERVICE = 'CANCELLED_SERVICE', 'Cancelled Service'
 
 
+class BookingQuerySet(models.QuerySet):
+    def with_final_price(self):
+        """
+        Annotates `final_price`, the database-side equivalent of Booking.get_final_price():
+        5% regular discount, 5% group discount for 2-5 customers, plus the home visit fee.
+        """
+        money = models.DecimalField(max_digits=12, decimal_places=2)
+        subtotal = models.ExpressionWrapper(
+            F('service__price') * Value(Decimal('0.95')) * F('number_of_customers'), output_field=money
+        )
+        after_group_discount = Case(
+            When(number_of_customers__range=(2, 5), then=subtotal * Value(Decimal('0.95'))),
+            default=subtotal,
+            output_field=money,
+        )
+        home_fee = Case(
+            When(is_home_service=True, then=F('home_visit_fee')),
+            default=Value(Decimal('0.00')),
+            output_field=money,
+        )
+        return self.annotate(
+            final_price=Round(models.ExpressionWrapper(after_group_discount + home_fee, output_field=money), 2)
+        )
+
+
 class Booking(models.Model):
     customer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -49,6 +77,10 @@ class Booking(models.Model):
     status = models.CharField(max_length=25, choices=BookingStatus.choices, default=BookingStatus.CONFIRMATION_PENDING)
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    resolved_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="When the booking was completed or cancelled; empty while it is open"
+    )
     number_of_customers = models.PositiveIntegerField(
         default=1,
         help_text="Number of people for the booking (max 5)"
@@ -67,6 +99,8 @@ class Booking(models.Model):
     razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
     razorpay_signature = models.CharField(max_length=255, blank=True, null=True)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         unique_together = ('date', 'time_slot', 'service', 'customer')
         ordering = ['-created_at']
@@ -94,6 +128,10 @@ class Booking(models.Model):
             raise ValidationError("Maximum 5 customers allowed per booking.")
         if not self.staff:
             self.staff = auto_assign_staff()
+        if self.status in (BookingStatus.COMPLETED_SERVICE, BookingStatus.CANCELLED_SERVICE):
+            self.resolved_at = self.resolved_at or timezone.now()
+        else:
+            self.resolved_at = None
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -3,7 +3,7 @@ from django.views.generic import View
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import F, Q
 from django.http import HttpResponseRedirect
 
 from .models import Booking, BookingStatus
@@ -22,8 +22,10 @@ class AdminBookingListView(LoginRequiredMixin, UserPassesTestMixin, View):
         status_filter = request.GET.get('status')
         search_query = request.GET.get('q', '')
         page_number = request.GET.get('page')
+        sort = request.GET.get('sort', '')
 
-        bookings = Booking.objects.select_related('customer', 'service')
+        # Risk scores are precomputed (analytics.cancellations); sorting is a plain join
+        bookings = Booking.objects.select_related('customer', 'service', 'risk')
 
         if status_filter:
             bookings = bookings.filter(status=status_filter)
@@ -34,6 +36,9 @@ class AdminBookingListView(LoginRequiredMixin, UserPassesTestMixin, View):
                 Q(customer__full_name__icontains=search_query)
             )
 
+        if sort == 'risk':
+            bookings = bookings.order_by(F('risk__probability').desc(nulls_last=True), 'date', 'time_slot')
+
         paginator = Paginator(bookings, 10)
         page_obj = paginator.get_page(page_number)
 
@@ -43,6 +48,7 @@ class AdminBookingListView(LoginRequiredMixin, UserPassesTestMixin, View):
             'status_choices': BookingStatus.choices,
             'current_filter': status_filter,
             'search_query': search_query,
+            'sort': sort,
             'terminal_statuses': ['COMPLETED_SERVICE', 'CANCELLED_SERVICE'],
         })
 
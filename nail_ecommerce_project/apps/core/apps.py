@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nail_ecommerce_project.apps.core'
+
+    def ready(self):
+        from nail_ecommerce_project.apps.core import signals  # noqa: F401
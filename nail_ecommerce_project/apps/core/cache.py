@@ -0,0 +1,17 @@
+from django.conf import settings
+
+# Backends that live inside one process: a version bump made by one worker never reaches the
+# others, so version keys there must expire after a short TTL instead of living forever
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache():
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def version_timeout(local_ttl):
+    """Timeout for a cache version key: never on a shared backend, `local_ttl` seconds otherwise."""
+    return None if is_shared_cache() else local_ttl
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def catalog_cache(request):
+    """Timeout for the catalog {% cache %} fragments, so templates don't hard-code it."""
+    return {'catalog_fragment_ttl': settings.CATALOG_FRAGMENT_TTL}
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from nail_ecommerce_project.apps.core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = ("Rebuilds the full-text search documents of every product and service. Saves keep "
+            "them current; run after bulk imports or raw SQL updates.")
+
+    def handle(self, *args, **options):
+        counts = rebuild_index()
+        summary = ', '.join(f"{count} {label}" for label, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt: {summary}."))
@@ -0,0 +1,103 @@
+from django.db import migrations
+
+# Database-specific full-text structures over core_searchdocument (see core.search). Other
+# databases get none and search falls back to icontains.
+
+POSTGRES_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE core_searchdocument ADD COLUMN vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX core_searchdocument_vector_idx ON core_searchdocument USING GIN (vector)",
+    "CREATE INDEX core_searchdocument_title_trgm_idx ON core_searchdocument USING GIN (title gin_trgm_ops)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS core_searchdocument_title_trgm_idx",
+    "DROP INDEX IF EXISTS core_searchdocument_vector_idx",
+    "ALTER TABLE core_searchdocument DROP COLUMN IF EXISTS vector",
+]
+
+# External-content FTS5 table: stores only the index, kept in step by triggers
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5(
+        title, body, content='core_searchdocument', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_searchdocument_fts_insert AFTER INSERT ON core_searchdocument BEGIN
+        INSERT INTO core_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchdocument_fts_delete AFTER DELETE ON core_searchdocument BEGIN
+        INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchdocument_fts_update AFTER UPDATE ON core_searchdocument BEGIN
+        INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO core_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_update",
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_delete",
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_insert",
+    "DROP TABLE IF EXISTS core_searchdocument_fts",
+]
+
+# app_label, model, title field, body field (mirrors core.search.SEARCHABLE at this point)
+INDEXED_MODELS = [
+    ('products', 'product', 'name', 'description'),
+    ('services', 'service', 'title', 'short_description'),
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def install_backend(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRES_INSTALL, 'sqlite': SQLITE_INSTALL})
+
+
+def uninstall_backend(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRES_UNINSTALL, 'sqlite': SQLITE_UNINSTALL})
+
+
+def index_existing(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    for app_label, model_name, title_field, body_field in INDEXED_MODELS:
+        content_type, _ = ContentType.objects.get_or_create(app_label=app_label, model=model_name)
+        model = apps.get_model(app_label, model_name)
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(content_type=content_type, object_id=pk, title=title or '', body=body or '')
+                for pk, title, body in model.objects.values_list('pk', title_field, body_field).iterator()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('products', '__first__'),
+        ('services', '__first__'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_backend, uninstall_backend),
+        migrations.RunPython(index_existing, migrations.RunPython.noop),
+    ]
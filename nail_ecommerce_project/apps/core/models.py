@@ -1,3 +1,23 @@
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
-# Create your models here.
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one catalog object, kept in sync on save (see core.search). The
+    database backend indexes it: a weighted tsvector + trigram GIN indexes on Postgres, an
+    FTS5 table on SQLite.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id'], name='search_document_object_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model} #{self.object_id}: {self.title}"
@@ -0,0 +1,175 @@
+import re
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from nail_ecommerce_project.apps.core.models import SearchDocument
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Catalog full-text search. Each searchable object has one SearchDocument (title + body),
+# refreshed on save by core.signals. Matching and ranking run in the database:
+#   Postgres - weighted tsvector (title A, body B) via websearch_to_tsquery, plus pg_trgm
+#              word similarity on the title so small typos still match
+#   SQLite   - FTS5 table with porter stemming and prefix terms, ranked by bm25
+#   other    - icontains on the documents, title matches first
+# The structures are created by core migration 0002_search_index.
+
+# model label -> (title field, body field)
+SEARCHABLE = {
+    'products.Product': ('name', 'description'),
+    'services.Service': ('title', 'short_description'),
+}
+
+# Ranked ids kept per search; results past this are dropped rather than paginated
+MAX_RESULTS = 500
+TITLE_WEIGHT = 10.0
+
+
+def _fields(model):
+    return SEARCHABLE.get(model._meta.label)
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+# ---------------------------------------------------------------------------
+
+def _document_values(instance, title_field, body_field):
+    return {
+        'title': (getattr(instance, title_field) or '')[:255],
+        'body': getattr(instance, body_field) or '',
+    }
+
+
+def index_object(instance):
+    """Creates or refreshes the search document of a searchable model instance."""
+    fields = _fields(type(instance))
+    if fields is None:
+        return
+    SearchDocument.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        defaults=_document_values(instance, *fields),
+    )
+
+
+def remove_object(instance):
+    fields = _fields(type(instance))
+    if fields is None:
+        return
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance), object_id=instance.pk
+    ).delete()
+
+
+def rebuild_index():
+    """Re-indexes every searchable object from scratch. Returns {model label: documents}."""
+    counts = {}
+    for label, (title_field, body_field) in SEARCHABLE.items():
+        model = apps.get_model(label)
+        content_type = ContentType.objects.get_for_model(model)
+        documents = [
+            SearchDocument(content_type=content_type, object_id=obj.pk,
+                           **_document_values(obj, title_field, body_field))
+            for obj in model.objects.only('pk', title_field, body_field).iterator()
+        ]
+        with transaction.atomic():
+            SearchDocument.objects.filter(content_type=content_type).delete()
+            SearchDocument.objects.bulk_create(documents, batch_size=1000)
+        counts[label] = len(documents)
+        logger.info(f"[rebuild_index] Indexed {len(documents)} {label} documents")
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+def _within_sql(column, within):
+    """`AND column IN (<pks of within>)` and its params, or nothing when within is None."""
+    if within is None:
+        return '', []
+    sql, params = within.order_by().values('pk').query.sql_with_params()
+    return f"AND {column} IN ({sql})", list(params)
+
+
+def _postgres_ids(content_type_id, query, within=None):
+    within_sql, within_params = _within_sql('object_id', within)
+    sql = f"""
+        SELECT object_id
+        FROM core_searchdocument, websearch_to_tsquery('english', %s) AS q
+        WHERE content_type_id = %s AND (vector @@ q OR %s <%% title) {within_sql}
+        ORDER BY ts_rank(vector, q) + word_similarity(%s, title) DESC, id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [query, content_type_id, query, *within_params, query, MAX_RESULTS])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _sqlite_ids(content_type_id, query, within=None):
+    # Every word as a quoted prefix term, so "pol" finds "polish" and FTS5 syntax can't leak in
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return []
+    match = ' '.join(f'"{term}"*' for term in terms)
+    within_sql, within_params = _within_sql('d.object_id', within)
+    sql = f"""
+        SELECT d.object_id
+        FROM core_searchdocument_fts f
+        JOIN core_searchdocument d ON d.id = f.rowid
+        WHERE core_searchdocument_fts MATCH %s AND d.content_type_id = %s {within_sql}
+        ORDER BY bm25(core_searchdocument_fts, %s, 1.0), d.id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, content_type_id, *within_params, TITLE_WEIGHT, MAX_RESULTS])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _fallback_ids(content_type_id, query, within=None):
+    documents = SearchDocument.objects.filter(content_type_id=content_type_id)
+    if within is not None:
+        documents = documents.filter(object_id__in=within.order_by().values('pk'))
+    return list(
+        documents
+        .filter(Q(title__icontains=query) | Q(body__icontains=query))
+        .annotate(title_match=Case(When(title__icontains=query, then=Value(0)), default=Value(1)))
+        .order_by('title_match', 'id')
+        .values_list('object_id', flat=True)[:MAX_RESULTS]
+    )
+
+
+SEARCH_BACKENDS = {
+    'postgresql': _postgres_ids,
+    'sqlite': _sqlite_ids,
+}
+
+
+def ranked_ids(model, query, within=None):
+    """
+    Primary keys of the model's objects matching the query, most relevant first. `within`
+    (a queryset of the model) limits the ranking to its objects, so filtered-out rows don't
+    use up the MAX_RESULTS slots.
+    """
+    query = (query or '').strip()
+    if not query or _fields(model) is None:
+        return []
+    backend = SEARCH_BACKENDS.get(connection.vendor, _fallback_ids)
+    return backend(ContentType.objects.get_for_model(model).pk, query, within)
+
+
+def search(queryset, query):
+    """
+    Narrows the queryset to objects matching the query, ordered by relevance (annotated as
+    `search_rank`, 0 = best). Further filters can still be chained on.
+    """
+    ids = ranked_ids(queryset.model, query, within=queryset)
+    if not ids:
+        return queryset.none()
+    rank = Case(*[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+                output_field=IntegerField())
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank).order_by('search_rank')
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from nail_ecommerce_project.apps.core.search import index_object, remove_object
+from nail_ecommerce_project.apps.products.models import Product
+from nail_ecommerce_project.apps.services.models import Service
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Service)
+def update_search_document(sender, instance, **kwargs):
+    index_object(instance)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Service)
+def delete_search_document(sender, instance, **kwargs):
+    remove_object(instance)
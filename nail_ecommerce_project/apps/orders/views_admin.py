@@ -12,6 +12,7 @@ from django.utils.decorators import method_decorator
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from ..products.models import ProductVariant
+from ..analytics.restock import restock_queue
 from django.core.paginator import Paginator
 from django.db.models import Q
 from logs.logger import get_logger
@@ -70,7 +71,7 @@ class AdminOrderListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         context['availability_filter'] = availability_filter
 
         # Inventory filtering
-        variant_queryset = ProductVariant.objects.select_related('product')
+        variant_queryset = ProductVariant.objects.select_related('product', 'restock')
         if search_query:
             variant_queryset = variant_queryset.filter(product__name__icontains=search_query)
         if availability_filter == 'available':
@@ -89,6 +90,9 @@ class AdminOrderListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         # Low stock alert
         context['low_stock_variants'] = ProductVariant.objects.select_related('product').filter(stock_quantity__lte=3)
 
+        # Variants due for a reorder, by days of cover (refreshed nightly)
+        context['restock_suggestions'] = restock_queue()[:5]
+
         # 🚨 Unified empty search logic for Orders tab
         context['invalid_order_search'] = False
         context['no_orders_found'] = False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nail_ecommerce_project.apps.products'
+
+    def ready(self):
+        from nail_ecommerce_project.apps.products import signals  # noqa: F401
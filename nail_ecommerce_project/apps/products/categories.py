@@ -0,0 +1,83 @@
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from nail_ecommerce_project.apps.core.cache import version_timeout
+from nail_ecommerce_project.apps.products.models import ProductCategory
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# The category tree, serialized once and cached under a version that category saves and deletes
+# bump. Pages (sidebar, facet counts) read it instead of querying ProductCategory on every
+# request. On a per-process cache the version lasts CATALOG_VERSION_TTL, which bounds how long
+# a worker that missed another worker's bump keeps serving the old tree.
+
+CATEGORY_VERSION_KEY = 'products:category_tree:version'
+CATEGORY_TREE_KEY = 'products:category_tree:{version}'
+
+
+def _serialize_tree():
+    """Categories in display order (each followed by its subcategories, siblings by name)."""
+    rows = list(ProductCategory.objects.values('id', 'name', 'slug', 'path', 'parent_category_id'))
+    children = defaultdict(list)
+    for row in rows:
+        children[row['parent_category_id']].append(row)
+
+    tree, stack = [], sorted(children[None], key=lambda row: row['name'].lower(), reverse=True)
+    while stack:
+        row = stack.pop()
+        tree.append({
+            'id': row['id'],
+            'name': row['name'],
+            'slug': row['slug'],
+            'path': row['path'],
+            'parent_id': row['parent_category_id'],
+            'depth': row['path'].count('/') - 2,
+        })
+        stack.extend(sorted(children[row['id']], key=lambda child: child['name'].lower(), reverse=True))
+    return tree
+
+
+def _tree_version():
+    version = cache.get(CATEGORY_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(CATEGORY_VERSION_KEY, version, timeout=version_timeout(settings.CATALOG_VERSION_TTL))
+    return version
+
+
+def get_category_tree():
+    """
+    [{'id', 'name', 'slug', 'path', 'parent_id', 'depth'}, ...] in display order. Cached for
+    CATALOG_FRAGMENT_TTL under the tree version, which category signals bump.
+    """
+    key = CATEGORY_TREE_KEY.format(version=_tree_version())
+    tree = cache.get(key)
+    if tree is None:
+        logger.debug("[get_category_tree] Cache miss, serializing category tree")
+        tree = _serialize_tree()
+        cache.set(key, tree, timeout=settings.CATALOG_FRAGMENT_TTL)
+    return tree
+
+
+def get_category(slug):
+    """The tree node with this slug, or None."""
+    return next((node for node in get_category_tree() if node['slug'] == slug), None)
+
+
+def ancestor_ids(path):
+    """Ids on a materialized path, root first: "/1/4/" -> [1, 4]."""
+    return [int(pk) for pk in path.strip('/').split('/') if pk]
+
+
+def invalidate_category_tree():
+    """Bumped now and again after commit, so a tree rebuilt from pre-commit data can't stick."""
+    def _bump():
+        cache.set(CATEGORY_VERSION_KEY, time.time_ns(), timeout=version_timeout(settings.CATALOG_VERSION_TTL))
+
+    _bump()
+    transaction.on_commit(_bump)
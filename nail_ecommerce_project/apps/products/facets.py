@@ -0,0 +1,232 @@
+import hashlib
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Case, CharField, Count, Exists, OuterRef, Q, Value, When
+
+from nail_ecommerce_project.apps.core.cache import version_timeout
+from nail_ecommerce_project.apps.products.categories import ancestor_ids, get_category, get_category_tree
+from nail_ecommerce_project.apps.products.models import Product, ProductVariant
+from logs.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Faceted catalog navigation. A product matches when it sits in the chosen category (or one of
+# its subcategories) and has at least one variant satisfying every variant-level filter (size,
+# colour, price band, in stock) at once.
+#
+# Counts come from one grouped aggregate over ProductVariant (one row per product / size /
+# colour / price band / stock combination) plus the product-category links; every facet is
+# then counted in Python against the other active filters, so picking a size still shows what
+# the other sizes would give. Results are cached per filter combination under the catalog
+# version, which any product, variant or category change bumps.
+
+PRICE_BANDS = [
+    # key, label, low (inclusive), high (exclusive) - on the variant's list price
+    ('under-250', 'Under ₹250', None, 250),
+    ('250-500', '₹250 – ₹500', 250, 500),
+    ('500-1000', '₹500 – ₹1000', 500, 1000),
+    ('1000-plus', '₹1000 & above', 1000, None),
+]
+PRICE_BAND_KEYS = [band[0] for band in PRICE_BANDS]
+VARIANT_FACETS = ('size', 'color', 'price', 'in_stock')
+
+CATALOG_VERSION_KEY = 'products:catalog:version'
+FACET_KEY = 'products:facets:{version}:{digest}'
+FACET_CACHE_TIMEOUT = 60 * 60
+
+
+# ---------------------------------------------------------------------------
+# Catalog version
+# ---------------------------------------------------------------------------
+
+def get_catalog_version():
+    """
+    Never expires on a shared cache. A per-process cache only sees its own bumps, so there the
+    version lasts CATALOG_VERSION_TTL and other workers' changes show up within that.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(CATALOG_VERSION_KEY, version, timeout=version_timeout(settings.CATALOG_VERSION_TTL))
+    return version
+
+
+def bump_catalog_version():
+    """
+    Invalidates cached facet counts. Bumped straight away and again after commit, so counts
+    cached from pre-commit data in between are dropped too.
+    """
+    def _bump():
+        cache.set(CATALOG_VERSION_KEY, time.time_ns(), timeout=version_timeout(settings.CATALOG_VERSION_TTL))
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+# ---------------------------------------------------------------------------
+# Filters
+# ---------------------------------------------------------------------------
+
+def parse_filters(params):
+    """Normalised facet filters from request GET params; unknown values are dropped."""
+    category = params.get('category') or ''
+    price = params.get('price') or ''
+    return {
+        'category': '' if category == 'None' else category,
+        'size': sorted({v for v in params.getlist('size') if v}),
+        'color': sorted({v for v in params.getlist('color') if v}),
+        'price': price if price in PRICE_BAND_KEYS else '',
+        'in_stock': params.get('in_stock') == '1',
+    }
+
+
+def _band_condition(key):
+    for band_key, _, low, high in PRICE_BANDS:
+        if band_key == key:
+            condition = Q()
+            if low is not None:
+                condition &= Q(price__gte=low)
+            if high is not None:
+                condition &= Q(price__lt=high)
+            return condition
+    return Q()
+
+
+def apply_filters(queryset, filters):
+    """Narrows a Product queryset to the products matching the facet filters."""
+    if filters['category']:
+        category = get_category(filters['category'])
+        if category is None:
+            return queryset.none()
+        queryset = queryset.in_category(category['path'])
+
+    variant_filter = Q()
+    if filters['size']:
+        variant_filter &= Q(size__in=filters['size'])
+    if filters['color']:
+        variant_filter &= Q(color__in=filters['color'])
+    if filters['price']:
+        variant_filter &= _band_condition(filters['price'])
+    if filters['in_stock']:
+        variant_filter &= Q(stock_quantity__gt=0)
+    if variant_filter:
+        queryset = queryset.filter(
+            Exists(ProductVariant.objects.filter(variant_filter, product_id=OuterRef('pk')))
+        )
+    return queryset
+
+
+# ---------------------------------------------------------------------------
+# Counts
+# ---------------------------------------------------------------------------
+
+def _variant_groups(products):
+    """(product id, size, colour, price band, in stock) combinations present in the catalog."""
+    band = Case(
+        *[When(_band_condition(key), then=Value(key)) for key, _, _, _ in PRICE_BANDS],
+        default=Value(''),
+        output_field=CharField(),
+    )
+    stocked = Case(When(stock_quantity__gt=0, then=Value(True)), default=Value(False), output_field=BooleanField())
+    return list(
+        ProductVariant.objects
+        .filter(product__in=products.values('pk'))
+        .annotate(price_band=band, stocked=stocked)
+        .values('product_id', 'size', 'color', 'price_band', 'stocked')
+        .annotate(variants=Count('id'))
+        .values_list('product_id', 'size', 'color', 'price_band', 'stocked')
+        .order_by()
+    )
+
+
+def _row_matches(row, filters, skip):
+    _, size, color, price, in_stock = row
+    return (
+        (skip == 'size' or not filters['size'] or size in filters['size'])
+        and (skip == 'color' or not filters['color'] or color in filters['color'])
+        and (skip == 'price' or not filters['price'] or price == filters['price'])
+        and (skip == 'in_stock' or not filters['in_stock'] or in_stock)
+    )
+
+
+def _labels(values):
+    return [(value, value) for value in sorted(values, key=str.lower)]
+
+
+def compute_facets(products, filters):
+    """
+    Facet values with product counts for a base Product queryset (before facet filters):
+    {'category' / 'size' / 'color' / 'price': [{'value', 'label', 'count', 'selected'}, ...],
+     'in_stock': count}. Categories come in tree order with their 'depth' and count the
+    products of their whole subtree.
+    Counts for one facet apply every other active filter but not its own.
+    """
+    rows = _variant_groups(products)
+    links = list(
+        Product.categories.through.objects
+        .filter(product__in=products.values('pk'))
+        .values_list('product_id', 'productcategory_id')
+    )
+    tree = get_category_tree()
+    paths = {node['id']: node['path'] for node in tree}
+
+    # Every category a product sits under: its own categories and all their ancestors
+    product_categories = defaultdict(set)
+    for product_id, category_id in links:
+        product_categories[product_id].update(ancestor_ids(paths.get(category_id, '')))
+
+    in_category = None
+    if filters['category']:
+        selected = get_category(filters['category'])
+        in_category = {pid for pid, ids in product_categories.items() if selected and selected['id'] in ids}
+
+    if any(filters[facet] for facet in VARIANT_FACETS):
+        category_base = {row[0] for row in rows if _row_matches(row, filters, None)}
+    else:
+        category_base = set(product_categories)
+
+    counted = {}
+    for facet, position in (('size', 1), ('color', 2), ('price', 3), ('in_stock', 4)):
+        values = defaultdict(set)
+        for row in rows:
+            if (in_category is None or row[0] in in_category) and _row_matches(row, filters, facet):
+                values[row[position]].add(row[0])
+        counted[facet] = values
+
+    under = Counter(pk for pid in category_base for pk in product_categories.get(pid, ()))
+    category_counts = [
+        {'value': node['slug'], 'label': node['name'], 'depth': node['depth'], 'count': under[node['id']],
+         'selected': node['slug'] == filters['category']}
+        for node in tree
+    ]
+
+    def value_counts(facet, labels):
+        chosen = filters[facet] if isinstance(filters[facet], list) else [filters[facet]]
+        return [
+            {'value': value, 'label': label, 'count': len(counted[facet].get(value, ())), 'selected': value in chosen}
+            for value, label in labels
+        ]
+
+    return {
+        'category': category_counts,
+        'size': value_counts('size', _labels({row[1] for row in rows} | set(filters['size']))),
+        'color': value_counts('color', _labels({row[2] for row in rows} | set(filters['color']))),
+        'price': value_counts('price', [(key, label) for key, label, _, _ in PRICE_BANDS]),
+        'in_stock': len(counted['in_stock'].get(True, ())),
+    }
+
+
+def get_facets(products, filters, query=''):
+    """compute_facets() cached per (search query, filters) under the current catalog version."""
+    signature = repr((query, sorted(filters.items())))
+    key = FACET_KEY.format(version=get_catalog_version(), digest=hashlib.md5(signature.encode()).hexdigest())
+    facets = cache.get(key)
+    if facets is None:
+        logger.debug(f"[get_facets] Cache miss for {signature}")
+        facets = compute_facets(products, filters)
+        cache.set(key, facets, timeout=FACET_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    ProductCategory = apps.get_model('products', 'ProductCategory')
+    categories = list(ProductCategory.objects.all())
+    parents = {category.pk: category.parent_category_id for category in categories}
+    paths = {}
+
+    def path_of(pk):
+        if pk not in paths:
+            parent_id = parents[pk]
+            paths[pk] = f"{path_of(parent_id) if parent_id else '/'}{pk}/"
+        return paths[pk]
+
+    for category in categories:
+        category.path = path_of(category.pk)
+    ProductCategory.objects.bulk_update(categories, ['path'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_remove_productvariant_reserved_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productcategory',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from decimal import Decimal, ROUND_HALF_UP
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Case, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Concat, Round, Substr
 from django.utils.text import slugify
 from django.utils import timezone
 from logs.logger import get_logger
@@ -13,19 +15,92 @@ class ProductCategory(models.Model):
     parent_category = models.ForeignKey(
         'self', null=True, blank=True, related_name='subcategories', on_delete=models.CASCADE
     )
+    # Materialized path of ids from the root, e.g. "/1/4/": a subtree is one indexed prefix match
+    path = models.CharField(max_length=255, blank=True, default='', editable=False, db_index=True)
 
     class Meta:
         verbose_name_plural = 'Product Categories'
 
+    @property
+    def depth(self):
+        return self.path.count('/') - 2
+
+    def get_descendants(self, include_self=True):
+        descendants = ProductCategory.objects.filter(path__startswith=self.path)
+        return descendants if include_self else descendants.exclude(pk=self.pk)
+
+    def clean(self):
+        if self.pk and self.parent_category_id:
+            parent_path = ProductCategory.objects.filter(pk=self.parent_category_id).values_list('path', flat=True).first()
+            if parent_path and f"/{self.pk}/" in parent_path:
+                logger.warning(f"[CLEAN] Category '{self.name}' cannot be moved under its own subtree")
+                raise ValidationError("A category cannot be placed under itself or one of its subcategories.")
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
+        self._update_path()
+
+    def _update_path(self):
+        """Recomputes this category's path and, if it moved, rewrites its whole subtree in one UPDATE."""
+        parent_path = '/'
+        if self.parent_category_id:
+            parent_path = ProductCategory.objects.filter(pk=self.parent_category_id).values_list('path', flat=True).first()
+        new_path = f"{parent_path}{self.pk}/"
+        old_path = ProductCategory.objects.filter(pk=self.pk).values_list('path', flat=True).first()
+
+        if old_path != new_path:
+            if old_path:
+                ProductCategory.objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value(new_path), Substr('path', len(old_path) + 1))
+                )
+                logger.info(f"[SAVE] Category '{self.name}' moved: {old_path} -> {new_path}")
+            else:
+                ProductCategory.objects.filter(pk=self.pk).update(path=new_path)
+        self.path = new_path
 
     def __str__(self):
         return self.name
 
 
+class ProductQuerySet(models.QuerySet):
+    def in_category(self, path):
+        """Products attached to the category with this materialized path or any category below it."""
+        return self.filter(Exists(
+            Product.categories.through.objects.filter(product_id=OuterRef('pk'), productcategory__path__startswith=path)
+        ))
+
+    def with_pricing(self):
+        """
+        Annotates, from the product's variants:
+          min_price        - lowest variant price (NULL without variants)
+          in_stock         - whether any variant has stock left
+          discount_applied - the % get_discounted_price() would take off right now
+          effective_price  - min_price after that discount, the database-side equivalent of
+                             get_discounted_price(min_price)
+        """
+        money = models.DecimalField(max_digits=10, decimal_places=2)
+        variants = ProductVariant.objects.filter(product=OuterRef('pk'))
+        now = timezone.now()
+
+        lto_active = Q(lto_discount_percent__gt=0, lto_start_date__lte=now, lto_end_date__gte=now)
+        discount = Case(
+            When(lto_active, then=F('lto_discount_percent')),
+            When(discount_percent__gt=0, then=F('discount_percent')),
+            default=Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        )
+        queryset = self.annotate(
+            min_price=Subquery(variants.order_by('price').values('price')[:1], output_field=money),
+            in_stock=Exists(variants.filter(stock_quantity__gt=0)),
+            discount_applied=discount,
+        )
+        return queryset.annotate(effective_price=Round(models.ExpressionWrapper(
+            F('min_price') - F('min_price') * F('discount_applied') / Value(Decimal('100')), output_field=money
+        ), 2))
+
+
 class Product(models.Model):
     name = models.CharField(max_length=255)
     slug = models.SlugField(unique=True, blank=True)
@@ -48,6 +123,8 @@ class Product(models.Model):
     lto_start_date = models.DateTimeField(null=True, blank=True)
     lto_end_date = models.DateTimeField(null=True, blank=True)
 
+    objects = ProductQuerySet.as_manager()
+
     def get_discounted_price(self, base_price):
         base_price = Decimal(base_price)
         final_price = base_price
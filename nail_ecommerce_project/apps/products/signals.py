@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.products.categories import invalidate_category_tree
+from nail_ecommerce_project.apps.products.facets import bump_catalog_version
+from nail_ecommerce_project.apps.products.models import Product, ProductCategory, ProductGalleryImage, ProductVariant
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductVariant)
+@receiver([post_save, post_delete], sender=ProductCategory)
+def refresh_catalog_facets(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def refresh_catalog_facets_on_categories(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_catalog_version()
+
+
+@receiver([post_save, post_delete], sender=ProductCategory)
+def refresh_category_tree(sender, instance, **kwargs):
+    invalidate_category_tree()
+
+
+@receiver([post_save, post_delete], sender=ProductVariant)
+@receiver([post_save, post_delete], sender=ProductGalleryImage)
+def touch_product(sender, instance, **kwargs):
+    # Cached product fragments are keyed on updated_at; an UPDATE skips the product's own signals
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
@@ -0,0 +1,111 @@
+import pytest
+import time
+from types import SimpleNamespace
+from django.core.cache import cache
+from django.core.cache.backends import locmem
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nail_ecommerce_project.apps.products.categories import get_category_tree
+from nail_ecommerce_project.apps.products.models import Product, ProductCategory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_category_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def tree():
+    """Nails > Extensions > Acrylic, Nails > Art, and a separate Care root."""
+    nails = ProductCategory.objects.create(name="Nails")
+    extensions = ProductCategory.objects.create(name="Extensions", parent_category=nails)
+    return {
+        'nails': nails,
+        'extensions': extensions,
+        'acrylic': ProductCategory.objects.create(name="Acrylic", parent_category=extensions),
+        'art': ProductCategory.objects.create(name="Art", parent_category=nails),
+        'care': ProductCategory.objects.create(name="Care"),
+    }
+
+
+def _path(*categories):
+    return "/" + "".join(f"{c.pk}/" for c in categories)
+
+
+def test_paths_follow_the_tree(tree):
+    assert tree['acrylic'].path == _path(tree['nails'], tree['extensions'], tree['acrylic'])
+    assert tree['acrylic'].depth == 2
+    assert set(tree['nails'].get_descendants(include_self=False)) == {tree['extensions'], tree['acrylic'], tree['art']}
+
+
+def test_moving_a_category_moves_its_subtree(tree):
+    extensions = tree['extensions']
+    extensions.parent_category = tree['care']
+    extensions.save()
+
+    tree['acrylic'].refresh_from_db()
+    assert tree['acrylic'].path == _path(tree['care'], extensions, tree['acrylic'])
+    assert set(tree['nails'].get_descendants()) == {tree['nails'], tree['art']}
+
+
+def test_category_cannot_move_under_its_own_subtree(tree):
+    nails = tree['nails']
+    nails.parent_category = tree['acrylic']
+
+    with pytest.raises(ValidationError):
+        nails.clean()
+
+
+def test_products_under_a_category_is_one_query(tree, django_assert_num_queries):
+    kit = Product.objects.create(name="Acrylic Kit")
+    kit.categories.add(tree['acrylic'], tree['extensions'])
+    Product.objects.create(name="Stencils").categories.add(tree['art'])
+    Product.objects.create(name="Hand Cream").categories.add(tree['care'])
+
+    with django_assert_num_queries(1):
+        names = sorted(Product.objects.in_category(tree['nails'].path).values_list('name', flat=True))
+
+    assert names == ["Acrylic Kit", "Stencils"]
+    assert list(Product.objects.in_category(tree['extensions'].path)) == [kit]
+
+
+def test_tree_is_cached_until_a_category_changes(tree, django_assert_num_queries):
+    assert [(node['name'], node['depth']) for node in get_category_tree()] == [
+        ("Care", 0), ("Nails", 0), ("Art", 1), ("Extensions", 1), ("Acrylic", 2),
+    ]
+    with django_assert_num_queries(0):
+        get_category_tree()
+
+    tree['art'].name = "Nail Art"
+    tree['art'].save()
+    assert "Nail Art" in [node['name'] for node in get_category_tree()]
+
+
+def test_per_process_cache_picks_up_other_workers_changes(tree, settings, monkeypatch):
+    get_category_tree()
+    # Renamed without this process seeing the bump
+    ProductCategory.objects.filter(pk=tree['art'].pk).update(name="Nail Art")
+    assert "Nail Art" not in [node['name'] for node in get_category_tree()]
+
+    later = time.time() + settings.CATALOG_VERSION_TTL + 1
+    monkeypatch.setattr(locmem, 'time', SimpleNamespace(time=lambda: later))
+    assert "Nail Art" in [node['name'] for node in get_category_tree()]
+
+
+def test_product_list_reads_categories_from_the_cached_tree(client, tree):
+    Product.objects.create(name="Acrylic Kit").categories.add(tree['acrylic'])
+    url = reverse('products:product_list')
+    client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {'category': 'nails'})
+
+    assert [p.name for p in response.context['products']] == ["Acrylic Kit"]
+    assert not any('"products_productcategory"."name"' in q['sql'] for q in queries.captured_queries)
+    assert "↳ Acrylic (1)" in response.content.decode()
@@ -0,0 +1,129 @@
+import pytest
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from django.core.cache import cache
+from django.core.cache.backends import locmem
+from django.http import QueryDict
+from django.urls import reverse
+from nail_ecommerce_project.apps.products.facets import apply_filters, compute_facets, get_catalog_version, get_facets, \
+    parse_filters
+from nail_ecommerce_project.apps.products.models import Product, ProductCategory, ProductVariant
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_facet_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def catalog():
+    """
+    Nails > Gel subcategory. Gel Red (Gel): 10ml Red ₹199 in stock, 20ml Red ₹349 sold out.
+    Gel Blue (Gel): 10ml Blue ₹299. Nail File (Nails): 10ml Red ₹99. Kit: no category, ₹1299.
+    """
+    nails = ProductCategory.objects.create(name="Nails")
+    gel = ProductCategory.objects.create(name="Gel", parent_category=nails)
+    products = {}
+    for name, category, variants in [
+        ("Gel Red", gel, [("10ml", "Red", "199.00", 5), ("20ml", "Red", "349.00", 0)]),
+        ("Gel Blue", gel, [("10ml", "Blue", "299.00", 3)]),
+        ("Nail File", nails, [("10ml", "Red", "99.00", 8)]),
+        ("Kit", None, [("Set", "Mixed", "1299.00", 2)]),
+    ]:
+        product = products[name] = Product.objects.create(name=name)
+        if category:
+            product.categories.add(category)
+        for size, color, price, stock in variants:
+            ProductVariant.objects.create(product=product, size=size, color=color, price=Decimal(price),
+                                          stock_quantity=stock)
+    return products
+
+
+def _filters(query=''):
+    return parse_filters(QueryDict(query))
+
+
+def _counts(facet):
+    return {value['value']: value['count'] for value in facet}
+
+
+def test_counts_without_filters(catalog):
+    facets = compute_facets(Product.objects.all(), _filters())
+
+    assert _counts(facets['category']) == {'gel': 2, 'nails': 3}
+    assert _counts(facets['size']) == {'10ml': 3, '20ml': 1, 'Set': 1}
+    assert _counts(facets['color']) == {'Blue': 1, 'Mixed': 1, 'Red': 2}
+    assert _counts(facets['price']) == {'under-250': 2, '250-500': 2, '500-1000': 0, '1000-plus': 1}
+    assert facets['in_stock'] == 4
+
+
+def test_each_facet_counts_against_the_other_filters(catalog):
+    filters = _filters('category=nails&color=Red&in_stock=1')
+
+    facets = compute_facets(Product.objects.all(), filters)
+
+    # Colour counts ignore the colour filter but keep the category and stock ones
+    assert _counts(facets['color']) == {'Blue': 1, 'Mixed': 0, 'Red': 2}
+    # The sold-out 20ml Red variant doesn't count
+    assert _counts(facets['size'])['20ml'] == 0
+    assert _counts(facets['price'])['250-500'] == 0
+    assert _counts(facets['category']) == {'gel': 1, 'nails': 2}
+    assert [c['value'] for c in facets['category'] if c['selected']] == ['nails']
+
+
+def test_apply_filters_needs_one_variant_matching_all_filters(catalog):
+    products = Product.objects.all()
+
+    assert set(apply_filters(products, _filters('category=nails')).values_list('name', flat=True)) == {
+        "Gel Red", "Gel Blue", "Nail File"
+    }
+    # Gel Red's only 250-500 variant is sold out
+    assert not apply_filters(products, _filters('category=gel&color=Red&price=250-500&in_stock=1')).exists()
+    assert list(apply_filters(products, _filters('size=20ml&size=Set')).order_by('name')
+                .values_list('name', flat=True)) == ["Gel Red", "Kit"]
+    # Unknown price bands are ignored
+    assert apply_filters(products, _filters('price=cheap')).count() == 4
+
+
+def test_cached_until_the_catalog_changes(catalog, django_assert_num_queries):
+    filters = _filters('color=Red')
+    get_facets(Product.objects.all(), filters)
+
+    with django_assert_num_queries(0):
+        get_facets(Product.objects.all(), filters)
+
+    ProductVariant.objects.create(
+        product=catalog["Kit"], size="Travel", color="Red", price=Decimal("450.00"), stock_quantity=1
+    )
+    assert _counts(get_facets(Product.objects.all(), filters)['size'])['Travel'] == 1
+
+
+def test_catalog_version_expires_only_in_a_per_process_cache(settings, monkeypatch):
+    version = get_catalog_version()
+    later = time.time() + settings.CATALOG_VERSION_TTL + 1
+    monkeypatch.setattr(locmem, 'time', SimpleNamespace(time=lambda: later))
+
+    # Another worker's bump can't reach this process: the version has to lapse
+    assert get_catalog_version() != version
+
+    monkeypatch.setattr('nail_ecommerce_project.apps.core.cache.is_shared_cache', lambda: True)
+    shared = get_catalog_version()
+    monkeypatch.setattr(locmem, 'time', SimpleNamespace(time=lambda: later + 10 ** 6))
+    assert get_catalog_version() == shared
+
+
+def test_product_list_filters_and_shows_counts(client, catalog):
+    url = reverse('products:product_list')
+
+    response = client.get(url, {'category': 'nails', 'color': 'Red', 'in_stock': '1'})
+
+    assert {p.name for p in response.context['products']} == {"Gel Red", "Nail File"}
+    content = response.content.decode()
+    assert "Blue (1)" in content
+    assert "2 products found" in content
+    assert response.context['filter_query'] == 'category=nails&color=Red&in_stock=1'
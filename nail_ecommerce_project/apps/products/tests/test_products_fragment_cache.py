@@ -0,0 +1,84 @@
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nail_ecommerce_project.apps.products.models import Product, ProductGalleryImage, ProductVariant
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_fragment_cache(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def product():
+    product = Product.objects.create(name="Ruby Gel", description="Deep red shade")
+    ProductVariant.objects.create(product=product, size="10ml", color="Red", price=Decimal("200.00"), stock_quantity=4)
+    return product
+
+
+def _gallery_queries(client, product):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('products:product_detail', args=[product.slug]))
+    assert response.status_code == 200
+    return response, [q for q in queries.captured_queries if 'products_productgalleryimage' in q['sql']]
+
+
+def test_child_saves_touch_the_product(product):
+    stamp = Product.objects.get(pk=product.pk).updated_at
+
+    ProductVariant.objects.create(product=product, size="20ml", color="Red", price=Decimal("350.00"))
+    touched = Product.objects.get(pk=product.pk).updated_at
+    assert touched > stamp
+
+    ProductGalleryImage.objects.create(product=product, image=SimpleUploadedFile("a.jpg", b"x"))
+    assert Product.objects.get(pk=product.pk).updated_at > touched
+
+
+def test_detail_gallery_served_from_cache_until_it_changes(client, product):
+    _, queries = _gallery_queries(client, product)
+    assert len(queries) == 1
+
+    _, queries = _gallery_queries(client, product)
+    assert queries == []
+
+    image = ProductGalleryImage.objects.create(product=product, image=SimpleUploadedFile("b.jpg", b"x"))
+    response, queries = _gallery_queries(client, product)
+    assert len(queries) == 1
+    assert image.image.url in response.content.decode()
+
+
+def test_variant_price_change_reaches_cached_card_and_body(client, product):
+    list_url = reverse('products:product_list')
+    client.get(list_url)
+    client.get(reverse('products:product_detail', args=[product.slug]))
+
+    variant = product.variants.get()
+    variant.price = Decimal("150.00")
+    variant.save()
+
+    assert "₹150.00" in client.get(list_url).content.decode()
+    assert "₹150.00" in client.get(reverse('products:product_detail', args=[product.slug])).content.decode()
+
+
+def test_per_user_bits_stay_outside_the_fragments(client, product):
+    url = reverse('products:product_detail', args=[product.slug])
+    client.get(url)
+
+    assert "Added to cart!" in client.get(url, {'added': '1'}).content.decode()
+
+    admin = get_user_model().objects.create_superuser(username="boss", email="boss@example.com", password="pass")
+    client.force_login(admin)
+    content = client.get(url).content.decode()
+    assert "Manage Variants" in content
+    assert "Manage Gallery" in content
+    assert "Manage Variants" in client.get(reverse('products:product_list')).content.decode()
@@ -0,0 +1,83 @@
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from nail_ecommerce_project.apps.products.models import Product, ProductVariant
+
+pytestmark = pytest.mark.django_db
+
+
+def _product(name, prices, stock=5, **discounts):
+    product = Product.objects.create(name=name, **discounts)
+    for i, price in enumerate(prices):
+        ProductVariant.objects.create(
+            product=product, size=f"{i + 1}0ml", color="Red", price=Decimal(price), stock_quantity=stock
+        )
+    return product
+
+
+def test_with_pricing_matches_get_discounted_price():
+    now = timezone.now()
+    products = [
+        _product("Plain", ["250.00", "199.99"]),
+        _product("Regular", ["199.99"], discount_percent=15),
+        _product("LTO", ["100.00", "120.00"], discount_percent=10, lto_discount_percent=30,
+                 lto_start_date=now - timezone.timedelta(days=1), lto_end_date=now + timezone.timedelta(days=1)),
+        _product("Expired LTO", ["100.00"], discount_percent=10, lto_discount_percent=30,
+                 lto_start_date=now - timezone.timedelta(days=10), lto_end_date=now - timezone.timedelta(days=5)),
+    ]
+
+    annotated = {p.name: p for p in Product.objects.with_pricing()}
+
+    for product in products:
+        min_price = min(v.price for v in product.variants.all())
+        row = annotated[product.name]
+        assert row.min_price == min_price
+        assert row.effective_price == product.get_discounted_price(min_price), product.name
+    assert annotated["LTO"].discount_applied == Decimal("30")
+
+
+def test_with_pricing_without_variants_or_stock():
+    _product("Empty", [])
+    _product("Sold Out", ["90.00"], stock=0)
+
+    annotated = {p.name: p for p in Product.objects.with_pricing()}
+
+    assert (annotated["Empty"].min_price, annotated["Empty"].effective_price, annotated["Empty"].in_stock) == (
+        None, None, False
+    )
+    assert (annotated["Sold Out"].min_price, annotated["Sold Out"].in_stock) == (Decimal("90.00"), False)
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries.captured_queries), response
+
+
+def test_product_list_queries_do_not_grow_with_page_size(client):
+    _product("First", ["100.00"], discount_percent=20)
+    few, response = _count_queries(client, reverse('products:product_list'))
+    assert "₹80.00" in response.content.decode()
+
+    for i in range(7):
+        _product(f"Polish {i}", ["150.00", "120.00", "130.00"])
+    many, response = _count_queries(client, reverse('products:product_list'))
+
+    assert len(response.context['products']) == 8
+    assert many == few
+
+
+def test_product_detail_queries_do_not_grow_with_variants(client):
+    small = _product("Small Range", ["100.00"])
+    large = _product("Large Range", ["100.00", "110.00", "120.00", "130.00", "140.00"], discount_percent=10)
+
+    few, _ = _count_queries(client, reverse('products:product_detail', args=[small.slug]))
+    many, response = _count_queries(client, reverse('products:product_detail', args=[large.slug]))
+
+    assert many == few
+    assert response.context['discounted_price'] == Decimal("90.00")
+    assert len(response.context['variants']) == 5
@@ -0,0 +1,86 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from nail_ecommerce_project.apps.core.models import SearchDocument
+from nail_ecommerce_project.apps.core.search import ranked_ids, search
+from nail_ecommerce_project.apps.products.models import Product, ProductCategory
+from nail_ecommerce_project.apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    return {
+        'mention': Product.objects.create(name="Top Coat", description="Seals any gel polish for a glossy finish"),
+        'title': Product.objects.create(name="Gel Polish Ruby", description="Long wear shade"),
+        'other': Product.objects.create(name="Cuticle Oil", description="Almond scented"),
+    }
+
+
+def _names(queryset):
+    return [obj.name for obj in queryset]
+
+
+def test_title_matches_rank_above_description_matches(catalog):
+    assert _names(search(Product.objects.all(), "gel polish")) == ["Gel Polish Ruby", "Top Coat"]
+
+
+def test_prefix_and_stemmed_matches(catalog):
+    assert _names(search(Product.objects.all(), "cutic")) == ["Cuticle Oil"]
+    assert _names(search(Product.objects.all(), "polishes")) == ["Gel Polish Ruby", "Top Coat"]
+    # FTS query syntax in the input is ignored
+    assert _names(search(Product.objects.all(), 'almond" (*')) == ["Cuticle Oil"]
+    assert ranked_ids(Product, "  ") == []
+
+
+def test_documents_follow_saves_and_deletes(catalog):
+    oil = catalog['other']
+    oil.name = "Cuticle Serum"
+    oil.save()
+    assert _names(search(Product.objects.all(), "serum")) == ["Cuticle Serum"]
+    assert not search(Product.objects.all(), "oil").exists()
+
+    oil.delete()
+    assert not search(Product.objects.all(), "serum").exists()
+    assert SearchDocument.objects.count() == 2
+
+
+def test_rebuild_index_command(catalog, capsys):
+    SearchDocument.objects.all().delete()
+    Service.objects.create(title="Gel Manicure", short_description="Polish that lasts", price=500)
+
+    call_command('rebuild_search_index')
+
+    assert "3 products.Product, 1 services.Service" in capsys.readouterr().out
+    assert _names(search(Product.objects.all(), "ruby")) == ["Gel Polish Ruby"]
+
+
+def test_product_list_search_keeps_category_filter(client, catalog):
+    category = ProductCategory.objects.create(name="Care")
+    catalog['mention'].categories.add(category)
+    url = reverse('products:product_list')
+
+    response = client.get(url, {'q': 'polish'})
+    assert _names(response.context['products']) == ["Gel Polish Ruby", "Top Coat"]
+
+    response = client.get(url, {'q': 'polish', 'category': category.slug})
+    assert _names(response.context['products']) == ["Top Coat"]
+
+
+def test_service_list_search_ranks_by_relevance(client):
+    Service.objects.create(title="Spa Pedicure", short_description="Includes gel polish", price=800)
+    Service.objects.create(title="Gel Manicure", short_description="Chip-free colour", price=500)
+
+    response = client.get(reverse('services:service_list'), {'q': 'gel'})
+
+    assert [s.title for s in response.context['services']] == ["Gel Manicure", "Spa Pedicure"]
+
+
+def test_ranking_only_spends_results_on_the_base_queryset(catalog, monkeypatch):
+    monkeypatch.setattr('nail_ecommerce_project.apps.core.search.MAX_RESULTS', 1)
+    catalog['title'].is_available = False
+    catalog['title'].save()
+
+    # The unavailable title match would otherwise take the only slot
+    assert _names(search(Product.objects.filter(is_available=True), "gel polish")) == ["Top Coat"]
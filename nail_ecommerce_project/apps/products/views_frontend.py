@@ -10,8 +10,10 @@ from django.views.decorators.http import require_POST
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy, reverse
 from .forms import ProductForm, ProductVariantFormSet
-from django.db.models import Q
-from .models import Product, ProductCategory, ProductGalleryImage
+from django.db.models import Prefetch
+from nail_ecommerce_project.apps.core.search import search
+from .facets import apply_filters, get_facets, parse_filters
+from .models import Product, ProductGalleryImage, ProductVariant
 from .forms import ProductGalleryImageForm
 from logs.logger import get_logger
 logger = get_logger(__name__)
@@ -54,38 +56,36 @@ class ProductListView(ListView):
     paginate_by = 8
 
     def get_queryset(self):
+        self.filters = parse_filters(self.request.GET)
         queryset = Product.objects.filter(is_available=True).order_by('-created_at')
         q = self.request.GET.get('q')
-        category_slug = self.request.GET.get('category')
 
         if q:
             logger.info(f"Product search query: '{q}'")
-            queryset = queryset.filter(
-                Q(name__icontains=q) | Q(description__icontains=q)
-            )
+            # Full-text match, most relevant first
+            queryset = search(queryset, q)
 
-        if category_slug and category_slug != "None":
-            logger.info(f"Filtering products by category: '{category_slug}'")
-            queryset = queryset.filter(categories__slug=category_slug)
+        # Facet counts are taken over the search results before the facet filters narrow them
+        self.facet_base = queryset
+        if any(self.filters.values()):
+            logger.info(f"Filtering products by facets: {self.filters}")
+            queryset = apply_filters(queryset, self.filters)
 
-        return queryset
+        # Prices are annotated in SQL: a page costs the same queries whatever its size
+        return queryset.with_pricing()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        products = context['products']
+        q = self.request.GET.get('q', '')
 
-        for product in products:
-            variants = product.variants.all()
-            if variants.exists():
-                # Use the lowest variant price as base price for discount calculation
-                base_price = variants.order_by('price').first().price
-                product.discounted_price = product.get_discounted_price(base_price)
-            else:
-                product.discounted_price = None  # No variants, no price
-
-        context['categories'] = ProductCategory.objects.all()
-        context['selected_category'] = self.request.GET.get('category')
-        context['q'] = self.request.GET.get('q', '')
+        context['facets'] = get_facets(self.facet_base, self.filters, q)
+        context['filters'] = self.filters
+        context['selected_category'] = self.filters['category']
+        context['q'] = q
+        # Current filters for the pagination links
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        context['filter_query'] = params.urlencode()
 
         return context
 
@@ -95,24 +95,32 @@ class ProductDetailView(DetailView):
     template_name = 'products/product_detail.html'
     context_object_name = 'product'
 
+    def get_queryset(self):
+        # Gallery images aren't prefetched: only the cached gallery fragment reads them, on a miss
+        return Product.objects.with_pricing().prefetch_related(
+            Prefetch('variants', queryset=ProductVariant.objects.order_by('id')),
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['added'] = self.request.GET.get('added', '')
         product = context['product']
-        variants = product.variants.all()
+        # Prefetched: the template's loops and the discount below don't query again
+        variants = list(product.variants.all())
         context['variants'] = variants
+        context['discounted_price'] = product.effective_price
 
-        if variants.exists():
-            # Calculate product discounted price based on lowest variant price
-            base_price = variants.order_by('price').first().price
-            context['discounted_price'] = product.get_discounted_price(base_price)
-        else:
-            context['discounted_price'] = None
-
-        # Assign discounted price to each variant using its own method
         for variant in variants:
             variant.discounted_price = variant.get_discounted_price()
 
+        # "Frequently bought together", precomputed by the analytics recommendations job
+        context['recommendations'] = [
+            rec.recommended for rec in product.recommendations
+            .filter(recommended__is_available=True)
+            .select_related('recommended')
+            .order_by('rank')
+        ]
+
         return context
 
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nail_ecommerce_project.apps.services'
+
+    def ready(self):
+        from nail_ecommerce_project.apps.services import signals  # noqa: F401
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from nail_ecommerce_project.apps.services.models import Service, ServiceGalleryImage
+
+
+@receiver([post_save, post_delete], sender=ServiceGalleryImage)
+def touch_service(sender, instance, **kwargs):
+    # Cached service fragments are keyed on updated_at; an UPDATE skips the service's own signals
+    Service.objects.filter(pk=instance.service_id).update(updated_at=timezone.now())
@@ -0,0 +1,48 @@
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from nail_ecommerce_project.apps.services.models import Service, ServiceGalleryImage
+
+
+@pytest.fixture(autouse=True)
+def clear_fragment_cache(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_service_card_follows_edits(client, service):
+    url = reverse("services:service_list")
+    assert "₹499" in client.get(url).content.decode()
+
+    service.price = 550
+    service.save()
+
+    assert "₹550" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_gallery_image_touches_service_and_refreshes_detail(client, service):
+    url = reverse("services:service_detail", args=[service.slug])
+    client.get(url)
+    stamp = Service.objects.get(pk=service.pk).updated_at
+
+    ServiceGalleryImage.objects.create(
+        service=service, image_file=SimpleUploadedFile("g.jpg", b"x"), caption="Spring set"
+    )
+
+    assert Service.objects.get(pk=service.pk).updated_at > stamp
+    assert "Spring set" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_admin_links_not_cached_for_visitors(client, superuser, service):
+    url = reverse("services:service_detail", args=[service.slug])
+    client.force_login(superuser)
+    assert "Manage Gallery" in client.get(url).content.decode()
+
+    client.logout()
+    assert "Manage Gallery" not in client.get(url).content.decode()
@@ -5,7 +5,7 @@ from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.db.models import Q
+from nail_ecommerce_project.apps.core.search import search
 from .form import ServiceForm, ServiceGalleryImageForm
 from .models import Service
 from logs.logger import get_logger
@@ -67,9 +67,8 @@ class ServiceListView(ListView):
 
         q = self.request.GET.get('q')
         if q:
-            queryset = queryset.filter(
-                Q(title__icontains=q) | Q(short_description__icontains=q)
-            )
+            # Full-text match, most relevant first
+            queryset = search(queryset, q)
             logger.info(f"Service search performed with query: '{q}'")
         return queryset
 